@@ -0,0 +1,102 @@
+"""
+Microbenchmark: ImagePreprocessor vs the temp-file decode path.
+
+Encodes synthetic photos as JPEG, then measures per-image cost of:
+- tempfile: what requests used to do (write upload to a temp file,
+  cv2.imread it back, resize, convert color, normalize, one image at a time)
+- process: ImagePreprocessor.process, one image per call
+- process_batch: ImagePreprocessor.process_batch over the whole batch
+  (thread-pool decode, letterbox into one preallocated array)
+
+Needs numpy and opencv (installed with ultralytics); no model or network.
+
+Usage (from backend/):
+    poetry run python -m benchmarks.image_preprocessing --images 64 --size 1280x960 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+import cv2
+import numpy as np
+
+from business_backend.ml.preprocessing.image_preprocessor import ImageConfig, ImagePreprocessor
+
+
+def make_jpegs(count: int, width: int, height: int) -> list[bytes]:
+    """Smooth gradients plus noise: compress like photos, not like pure noise."""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width]
+    blobs = []
+    for i in range(count):
+        base = np.stack([(x + i * 7) % 256, (y + i * 13) % 256, (x + y) % 256], axis=-1)
+        noise = rng.integers(0, 24, size=(height, width, 3))
+        image = np.clip(base + noise, 0, 255).astype(np.uint8)
+        ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        assert ok
+        blobs.append(encoded.tobytes())
+    return blobs
+
+
+def tempfile_path(blob: bytes, config: ImageConfig) -> np.ndarray:
+    """The old per-request path: temp file, decode from disk, resize, per-image arrays."""
+    with NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
+        tmp.write(blob)
+        path = tmp.name
+    try:
+        image = cv2.imread(path)
+        image = cv2.resize(image, config.target_size, interpolation=cv2.INTER_LINEAR)
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return image.astype(np.float32) / 255.0
+    finally:
+        Path(path).unlink(missing_ok=True)
+
+
+def report(name: str, seconds: float, count: int) -> None:
+    print(f"{name:<16}{seconds / count * 1000:>10.2f}ms/img{count / seconds:>12.1f} img/s")
+
+
+async def main(args: argparse.Namespace) -> None:
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    blobs = make_jpegs(args.images, width, height)
+    config = ImageConfig(target_size=(args.target, args.target))
+    preprocessor = ImagePreprocessor(config, workers=args.workers)
+
+    print(
+        f"{args.images} JPEGs {width}x{height} (avg {sum(map(len, blobs)) / len(blobs) / 1024:.0f} KiB) "
+        f"-> {args.target}x{args.target}, {args.workers} worker(s), {os.cpu_count()} CPUs\n"
+    )
+    await preprocessor.process_batch(blobs[:2])  # Warm up the pool
+
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        legacy = np.stack([tempfile_path(blob, config) for blob in blobs])
+        report("tempfile", time.perf_counter() - start, len(blobs))
+
+        start = time.perf_counter()
+        for blob in blobs:
+            await preprocessor.process(blob)
+        report("process", time.perf_counter() - start, len(blobs))
+
+        out = np.empty((len(blobs), *preprocessor.output_shape), dtype=preprocessor.output_dtype)
+        start = time.perf_counter()
+        await preprocessor.process_batch(blobs, out=out)
+        report("process_batch", time.perf_counter() - start, len(blobs))
+        print()
+
+    # Same size and normalization; letterboxing differs from the old stretch for non-square inputs
+    print(f"output {out.shape} {out.dtype}, contiguous={out.flags.c_contiguous}; old path {legacy.shape}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ImagePreprocessor microbenchmark")
+    _ = parser.add_argument("--images", type=int, default=64)
+    _ = parser.add_argument("--size", default="1280x960", help="Source image WIDTHxHEIGHT")
+    _ = parser.add_argument("--target", type=int, default=640, help="Square target size")
+    _ = parser.add_argument("--workers", type=int, default=4)
+    _ = parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,173 @@
+"""
+Benchmark: micro-batched vs per-call inference on CPU.
+
+Drives InferenceService with concurrent single-image predict calls at
+several concurrency levels, with micro-batching off and at several
+batch sizes, and reports throughput, latency percentiles and the
+average batch size actually formed.
+
+The default model is a synthetic CPU network (numpy MLP plus a fixed
+per-call overhead standing in for framework dispatch and pre/post
+processing), so the run needs no weights. ``--weights`` runs the real
+YOLO ImageClassifier on ``--image`` instead.
+
+Usage (from backend/):
+    poetry run python -m benchmarks.inference_batching --requests 512 --concurrency 1 8 32
+    poetry run python -m benchmarks.inference_batching --weights ml/weights/best.pt --image laptop.jpg
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from business_backend.ml.models.base import BaseModel
+from business_backend.ml.models.registry import ModelRegistry
+from business_backend.ml.serving.batching import BatchConfig
+from business_backend.ml.serving.executor import InferenceExecutor
+from business_backend.ml.serving.inference_service import InferenceService
+
+MODEL_NAME = "bench_model"
+
+
+class SyntheticModel(BaseModel):
+    """CPU stand-in for a vision model: a 3-layer MLP over a flat input vector."""
+
+    model_type: str = "image"
+
+    # Fixed cost per forward call (dispatch, pre/post processing), independent of batch size
+    call_overhead_s: float = 0.002
+    width: int = 1024
+
+    async def load(self, path: str | Path) -> None:
+        rng = np.random.default_rng(0)
+        self._model = [
+            rng.standard_normal((self.width, self.width), dtype=np.float32) / np.sqrt(self.width)
+            for _ in range(3)
+        ]
+        self._is_loaded = True
+
+    def _forward(self, batch: np.ndarray) -> np.ndarray:
+        time.sleep(self.call_overhead_s)
+        x = batch
+        for weights in self._model:
+            x = np.tanh(x @ weights)
+        return x
+
+    async def predict(self, data: Any) -> dict[str, Any]:
+        return (await self.predict_batch([data]))[0]
+
+    async def predict_batch(self, data_list: list[Any], batch_size: int | None = None) -> list[dict[str, Any]]:
+        out = await self.executor.run(self._forward, np.stack(data_list))
+        return [
+            {"prediction": int(row.argmax()), "confidence": float(row.max())}
+            for row in out
+        ]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def build_service(args: argparse.Namespace, batch_size: int | None) -> tuple[InferenceService, Any]:
+    """InferenceService over a fresh registry, batching ``batch_size`` inputs (None: off)."""
+    executor = InferenceExecutor(
+        workers=args.workers,
+        max_concurrency=args.workers,
+        torch_threads=args.torch_threads,
+    )
+    registry = ModelRegistry(executor=executor)
+
+    if args.weights:
+        from business_backend.ml.models.image_classifier import ImageClassifier
+
+        registry.register(MODEL_NAME, ImageClassifier, args.weights)
+        sample: Any = args.image
+    else:
+        SyntheticModel.call_overhead_s = args.overhead_ms / 1000
+        registry.register(MODEL_NAME, SyntheticModel, "synthetic")
+        sample = np.random.default_rng(1).standard_normal(SyntheticModel.width, dtype=np.float32)
+
+    batching = None
+    if batch_size is not None:
+        batching = {MODEL_NAME: BatchConfig(max_batch_size=batch_size, max_wait_ms=args.max_wait_ms)}
+    # No coalescing: every request carries the same input and must run
+    service = InferenceService(registry, coalesce=False, batching=batching)
+    await registry.load(MODEL_NAME)
+    return service, sample
+
+
+async def run_config(
+    args: argparse.Namespace,
+    batch_size: int | None,
+    concurrency: int,
+) -> dict[str, Any]:
+    """Closed loop: ``concurrency`` clients send requests back to back."""
+    service, sample = await build_service(args, batch_size)
+
+    # Warm up pool threads and caches
+    await asyncio.gather(*(service.predict(MODEL_NAME, sample, preprocess=False) for _ in range(concurrency)))
+
+    latencies: list[float] = []
+    remaining = args.requests
+
+    async def client() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            await service.predict(MODEL_NAME, sample, preprocess=False)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    batching = (service.get_stats()["batching"] or {}).get(MODEL_NAME)
+    service.registry.executor.shutdown()
+    return {
+        "throughput": len(latencies) / wall,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "avg_batch": batching["avg_batch_size"] if batching else 1.0,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    model = f"YOLO {args.weights}" if args.weights else f"synthetic MLP, {args.overhead_ms:g}ms/call overhead"
+    print(f"Model: {model}; {args.workers} worker(s); max wait {args.max_wait_ms:g}ms\n")
+    print(f"{'conc':>5}{'batch':>7}{'items/s':>10}{'p50':>10}{'p95':>10}{'avg batch':>11}")
+
+    for concurrency in args.concurrency:
+        for batch_size in [None, *args.batch_sizes]:
+            result = await run_config(args, batch_size, concurrency)
+            label = "off" if batch_size is None else str(batch_size)
+            print(
+                f"{concurrency:>5}{label:>7}{result['throughput']:>10.1f}"
+                f"{result['p50'] * 1000:>8.1f}ms{result['p95'] * 1000:>8.1f}ms{result['avg_batch']:>11.2f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-batching throughput vs latency benchmark")
+    _ = parser.add_argument("--requests", type=int, default=512)
+    _ = parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    _ = parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 8, 16])
+    _ = parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    _ = parser.add_argument("--workers", type=int, default=1)
+    _ = parser.add_argument("--torch-threads", type=int, default=None)
+    _ = parser.add_argument("--overhead-ms", type=float, default=2.0,
+                            help="Synthetic model: fixed cost per forward call")
+    _ = parser.add_argument("--weights", default=None, help="YOLO weights (default: synthetic model)")
+    _ = parser.add_argument("--image", default=None, help="Image for --weights")
+    args = parser.parse_args()
+    if args.weights and not args.image:
+        parser.error("--weights needs --image")
+    asyncio.run(main(args))
@@ -0,0 +1,394 @@
+"""
+OpenAI-compatible LLM stand-in server.
+
+Serves /v1/chat/completions locally so SearchService and AgentService can
+be load-tested without API quota or network access:
+- Configurable latency distribution (fixed, uniform, lognormal) and per-token delay
+- Scripted tool calls: by default the first offered tool (product_search) is
+  called with the longest word of the user message, then a text answer is
+  built from the tool results; rules from --script override this
+- Record/replay cassettes: --record forwards to a real provider and stores
+  responses, --replay serves them back (falling back to the script on a miss)
+- Streaming (SSE) when the request sets ``stream: true``
+- GET /stats and POST /stats/reset for LLM time (simulated or upstream) and token counters
+
+Usage (from backend/):
+    poetry run python -m benchmarks.llm_stub_server --port 8001 --latency lognormal --p50-ms 400
+    # Backend against the stub (leave GROQ_API_KEY/OPENAI_API_KEY unset):
+    LOCAL_LLM_BASE_URL=http://localhost:8001/v1 poetry run python -m business_backend.main
+
+Script file (JSON list, first matching rule wins, ``match`` is a regex on the last user message):
+    [{"match": "laptop", "tool_calls": [{"name": "product_search", "arguments": {"search_term": "laptop"}}]},
+     {"match": "hola", "content": "¡Hola! ¿Qué producto buscas?"}]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class LatencyModel:
+    """Time to first token, sampled per request."""
+
+    kind: str = "lognormal"  # fixed | uniform | lognormal
+    p50_ms: float = 400.0
+    sigma: float = 0.5  # lognormal spread
+    min_ms: float = 100.0  # uniform bounds
+    max_ms: float = 1000.0
+    per_token_ms: float = 0.0  # Extra delay per completion token
+
+    def sample(self) -> float:
+        """Seconds before the first token."""
+        if self.kind == "fixed":
+            ms = self.p50_ms
+        elif self.kind == "uniform":
+            ms = random.uniform(self.min_ms, self.max_ms)
+        else:
+            ms = self.p50_ms * math.exp(self.sigma * random.gauss(0.0, 1.0))
+        return ms / 1000
+
+
+@dataclass
+class StubStats:
+    """Counters served at /stats."""
+
+    requests: int = 0
+    streamed: int = 0
+    tool_call_responses: int = 0
+    replay_hits: int = 0
+    replay_misses: int = 0
+    recorded: int = 0
+    llm_latency_s: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _cassette_key(body: dict[str, Any]) -> str:
+    """Request identity for record/replay (random tool call ids are ignored)."""
+
+    def scrub(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {k: scrub(v) for k, v in value.items() if k not in ("id", "tool_call_id")}
+        if isinstance(value, list):
+            return [scrub(v) for v in value]
+        return value
+
+    material = {
+        "messages": scrub(body.get("messages", [])),
+        "tools": [t.get("function", {}).get("name") for t in body.get("tools") or []],
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+class Cassette:
+    """JSONL store of recorded chat completion responses."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {}
+        if path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                if line.strip():
+                    record = json.loads(line)
+                    self.entries[record["key"]] = record["response"]
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        return self.entries.get(key)
+
+    def put(self, key: str, response: dict[str, Any]) -> None:
+        self.entries[key] = response
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "response": response}, ensure_ascii=False) + "\n")
+
+
+@dataclass
+class StubConfig:
+    """Server behaviour."""
+
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    rules: list[dict[str, Any]] = field(default_factory=list)
+    cassette: Cassette | None = None
+    record: bool = False
+    upstream_url: str | None = None
+    upstream_key: str | None = None
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def _scripted_message(body: dict[str, Any], rules: list[dict[str, Any]]) -> dict[str, Any]:
+    """Assistant message for the request: a tool call or a text answer."""
+    messages = body.get("messages", [])
+    tools = body.get("tools") or []
+    last_user = next((_text(m.get("content")) for m in reversed(messages) if m.get("role") == "user"), "")
+    answered = bool(messages) and messages[-1].get("role") == "tool"
+
+    for rule in rules:
+        if not re.search(rule.get("match", ""), last_user, re.IGNORECASE):
+            continue
+        if "tool_calls" in rule and tools and not answered:
+            return _tool_call_message(rule["tool_calls"])
+        if "content" in rule:
+            return {"role": "assistant", "content": rule["content"]}
+
+    if tools and not answered:
+        tool = next(
+            (t for t in tools if t.get("function", {}).get("name") == "product_search"), tools[0]
+        )["function"]
+        properties = tool.get("parameters", {}).get("properties", {})
+        words = re.findall(r"\w+", last_user) or ["producto"]
+        argument = next(iter(properties), "search_term")
+        return _tool_call_message([{"name": tool["name"], "arguments": {argument: max(words, key=len)}}])
+
+    if answered:
+        results = " ".join(_text(m.get("content")) for m in messages if m.get("role") == "tool")
+        return {"role": "assistant", "content": f"Según el inventario: {results[:300]}"}
+    return {"role": "assistant", "content": f"Respuesta simulada para: {last_user[:200]}"}
+
+
+def _tool_call_message(calls: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [
+            {
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {"name": c["name"], "arguments": json.dumps(c.get("arguments", {}))},
+            }
+            for c in calls
+        ],
+    }
+
+
+def _completion(body: dict[str, Any], message: dict[str, Any]) -> dict[str, Any]:
+    prompt = json.dumps(body.get("messages", []), ensure_ascii=False)
+    completion = _text(message.get("content")) + json.dumps(message.get("tool_calls", []))
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:16]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [
+            {
+                "index": 0,
+                "message": message,
+                "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": _estimate_tokens(prompt),
+            "completion_tokens": _estimate_tokens(completion),
+            "total_tokens": _estimate_tokens(prompt) + _estimate_tokens(completion),
+        },
+    }
+
+
+def create_stub_app(config: StubConfig) -> FastAPI:
+    """
+    Build the stub server.
+
+    Args:
+        config: Latency, script and cassette configuration
+
+    Returns:
+        FastAPI application
+    """
+    app = FastAPI(title="LLM stub")
+    stats = StubStats()
+
+    async def upstream(body: dict[str, Any]) -> dict[str, Any]:
+        assert config.upstream_url is not None
+        payload = {**body, "stream": False}
+        async with httpx.AsyncClient(timeout=120) as client:
+            response = await client.post(
+                f"{config.upstream_url.rstrip('/')}/chat/completions",
+                json=payload,
+                headers={"Authorization": f"Bearer {config.upstream_key or ''}"},
+            )
+            response.raise_for_status()
+            return response.json()
+
+    async def respond(body: dict[str, Any]) -> tuple[dict[str, Any], float]:
+        """Completion for the request and the delay to simulate before it."""
+        key = _cassette_key(body)
+        if config.cassette is not None and config.record:
+            start = time.monotonic()
+            completion = await upstream(body)
+            config.cassette.put(key, completion)
+            stats.recorded += 1
+            # Real upstream latency was already paid: count it, don't simulate more
+            stats.llm_latency_s += time.monotonic() - start
+            return completion, 0.0
+
+        if config.cassette is not None:
+            recorded = config.cassette.get(key)
+            if recorded is not None:
+                stats.replay_hits += 1
+                return {**recorded, "id": f"chatcmpl-{uuid.uuid4().hex[:16]}"}, config.latency.sample()
+            stats.replay_misses += 1
+
+        completion = _completion(body, _scripted_message(body, config.rules))
+        return completion, config.latency.sample()
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request) -> Any:
+        body = await request.json()
+        stats.requests += 1
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+
+        try:
+            completion, ttft = await respond(body)
+        except Exception:
+            stats.in_flight -= 1
+            raise
+
+        message = completion["choices"][0]["message"]
+        usage = completion.get("usage", {})
+        stats.prompt_tokens += usage.get("prompt_tokens", 0)
+        stats.completion_tokens += usage.get("completion_tokens", 0)
+        if message.get("tool_calls"):
+            stats.tool_call_responses += 1
+
+        tokens = usage.get("completion_tokens", 0)
+        total_delay = ttft + tokens * config.latency.per_token_ms / 1000
+        stats.llm_latency_s += total_delay
+
+        if body.get("stream"):
+            stats.streamed += 1
+            return StreamingResponse(
+                _sse(completion, ttft, config.latency.per_token_ms / 1000, stats),
+                media_type="text/event-stream",
+            )
+
+        try:
+            await asyncio.sleep(total_delay)
+        finally:
+            stats.in_flight -= 1
+        return JSONResponse(completion)
+
+    @app.get("/v1/models")
+    async def models() -> dict[str, Any]:
+        return {"object": "list", "data": [{"id": "stub", "object": "model", "owned_by": "stub"}]}
+
+    @app.get("/stats")
+    async def get_stats() -> dict[str, Any]:
+        return stats.__dict__
+
+    @app.post("/stats/reset")
+    async def reset_stats() -> dict[str, Any]:
+        in_flight = stats.in_flight
+        stats.__init__()  # type: ignore[misc]
+        stats.in_flight = in_flight
+        return stats.__dict__
+
+    return app
+
+
+async def _sse(
+    completion: dict[str, Any],
+    ttft: float,
+    per_token: float,
+    stats: StubStats,
+) -> AsyncIterator[str]:
+    """Stream a completion as chat.completion.chunk events."""
+    base = {
+        "id": completion["id"],
+        "object": "chat.completion.chunk",
+        "created": completion["created"],
+        "model": completion["model"],
+    }
+    choice = completion["choices"][0]
+    message = choice["message"]
+
+    def chunk(delta: dict[str, Any], finish_reason: str | None = None) -> str:
+        event = {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+        return f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    try:
+        await asyncio.sleep(ttft)
+        yield chunk({"role": "assistant", "content": ""})
+
+        if message.get("tool_calls"):
+            yield chunk(
+                {"tool_calls": [{"index": i, **call} for i, call in enumerate(message["tool_calls"])]}
+            )
+        else:
+            for word in re.findall(r"\S+\s*", message.get("content") or ""):
+                if per_token:
+                    await asyncio.sleep(per_token * _estimate_tokens(word))
+                yield chunk({"content": word})
+
+        yield chunk({}, finish_reason=choice["finish_reason"])
+        yield "data: [DONE]\n\n"
+    finally:
+        stats.in_flight -= 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI-compatible LLM stub server")
+    _ = parser.add_argument("--host", default="127.0.0.1")
+    _ = parser.add_argument("--port", type=int, default=8001)
+    _ = parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    _ = parser.add_argument("--p50-ms", type=float, default=400.0)
+    _ = parser.add_argument("--sigma", type=float, default=0.5)
+    _ = parser.add_argument("--min-ms", type=float, default=100.0)
+    _ = parser.add_argument("--max-ms", type=float, default=1000.0)
+    _ = parser.add_argument("--per-token-ms", type=float, default=0.0)
+    _ = parser.add_argument("--seed", type=int, default=None)
+    _ = parser.add_argument("--script", type=Path, help="JSON list of scripted rules")
+    _ = parser.add_argument("--replay", type=Path, help="Cassette to serve responses from")
+    _ = parser.add_argument("--record", type=Path, help="Cassette to record upstream responses into")
+    _ = parser.add_argument("--upstream-url", help="Real provider base URL for --record")
+    _ = parser.add_argument("--upstream-key", help="API key for --upstream-url")
+    args = parser.parse_args()
+
+    if args.record and not args.upstream_url:
+        parser.error("--record needs --upstream-url")
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    stub_config = StubConfig(
+        latency=LatencyModel(
+            kind=args.latency,
+            p50_ms=args.p50_ms,
+            sigma=args.sigma,
+            min_ms=args.min_ms,
+            max_ms=args.max_ms,
+            per_token_ms=args.per_token_ms,
+        ),
+        rules=json.loads(args.script.read_text(encoding="utf-8")) if args.script else [],
+        cassette=Cassette(args.record or args.replay) if (args.record or args.replay) else None,
+        record=bool(args.record),
+        upstream_url=args.upstream_url,
+        upstream_key=args.upstream_key,
+    )
+    uvicorn.run(create_stub_app(stub_config), host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,208 @@
+"""
+Load harness for semanticSearch, /api/chat and /api/chat/stream.
+
+Drives a running backend at a fixed concurrency and reports latency
+percentiles, time to first byte (first token for the streaming chat),
+throughput and backend-only overhead. Point the backend at
+``benchmarks.llm_stub_server`` so the LLM side is local, deterministic
+and free; overhead is end-to-end latency minus the LLM time the stub
+reports per request.
+
+Usage (from backend/):
+    poetry run python -m benchmarks.llm_stub_server --port 8001 --latency fixed --p50-ms 300
+    LOCAL_LLM_BASE_URL=http://localhost:8001/v1 poetry run python -m business_backend.main --port 9000
+    poetry run python -m benchmarks.load_harness --target both --requests 500 --concurrency 50
+    poetry run python -m benchmarks.load_harness --target chat-vs-stream --requests 200
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import httpx
+
+DEFAULT_QUERIES = [
+    "¿Tienen laptops gaming?",
+    "Busco un monitor de 27 pulgadas",
+    "¿Hay teclados mecánicos en stock?",
+    "Quiero una laptop Lenovo",
+    "¿Cuánto cuesta el mouse inalámbrico?",
+    "Necesito un disco SSD de 1TB",
+]
+
+SEARCH_QUERY = """
+query Search($query: String!, $mode: SearchMode) {
+  semanticSearch(query: $query, mode: $mode) {
+    answer
+    productsFound { productName }
+  }
+}
+"""
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_load(
+    call: Callable[[int], Awaitable[float | None]],
+    total: int,
+    concurrency: int,
+) -> tuple[list[float], list[float], int, float]:
+    """
+    Run ``total`` calls with at most ``concurrency`` in flight.
+
+    A call returns its time to first byte, or None when the whole
+    response arrives at once (TTFB is then the full latency).
+
+    Returns:
+        (successful latencies in seconds, their TTFBs, error count, wall time)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    ttfbs: list[float] = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                first_byte = await call(i)
+            except Exception:
+                errors += 1
+                return
+            latency = time.perf_counter() - start
+            latencies.append(latency)
+            ttfbs.append(first_byte if first_byte is not None else latency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return latencies, ttfbs, errors, time.perf_counter() - start
+
+
+async def stub_stats(client: httpx.AsyncClient, stub_url: str, reset: bool = False) -> dict[str, Any]:
+    """Fetch (or reset) the stub's counters."""
+    if reset:
+        response = await client.post(f"{stub_url}/stats/reset")
+    else:
+        response = await client.get(f"{stub_url}/stats")
+    response.raise_for_status()
+    return response.json()
+
+
+def make_call(
+    client: httpx.AsyncClient,
+    backend_url: str,
+    target: str,
+    queries: list[str],
+    mode: str | None,
+    unique: bool,
+) -> Callable[[int], Awaitable[float | None]]:
+    """Build the request function for a target."""
+
+    def query_for(i: int) -> str:
+        query = queries[i % len(queries)]
+        # A distinct number per request defeats the answer cache and coalescing
+        return f"{query} {i}" if unique else query
+
+    async def search(i: int) -> None:
+        response = await client.post(
+            f"{backend_url}/graphql",
+            json={"query": SEARCH_QUERY, "variables": {"query": query_for(i), "mode": mode}},
+        )
+        response.raise_for_status()
+        if response.json().get("errors"):
+            raise RuntimeError(response.json()["errors"])
+
+    async def chat(i: int) -> None:
+        response = await client.post(
+            f"{backend_url}/api/chat",
+            json={"messages": [{"role": "user", "text": query_for(i), "type": "user"}]},
+        )
+        response.raise_for_status()
+
+    async def chat_stream(i: int) -> float | None:
+        start = time.perf_counter()
+        first_token = None
+        async with client.stream(
+            "POST",
+            f"{backend_url}/api/chat/stream",
+            json={"messages": [{"role": "user", "text": query_for(i), "type": "user"}]},
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line == "event: token" and first_token is None:
+                    first_token = time.perf_counter() - start
+                elif line == "event: error":
+                    raise RuntimeError("stream failed")
+        return first_token
+
+    return {"search": search, "chat": chat, "chat-stream": chat_stream}[target]
+
+
+async def main(args: argparse.Namespace) -> None:
+    targets = {
+        "both": ["search", "chat"],
+        "chat-vs-stream": ["chat", "chat-stream"],
+    }.get(args.target, [args.target])
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        print(f"{'target':<12}{'reqs':>6}{'err':>5}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}"
+              f"{'ttfb p50':>10}{'llm/req':>9}{'llm calls':>10}{'overhead':>10}")
+
+        for target in targets:
+            call = make_call(client, args.backend_url, target, DEFAULT_QUERIES, args.mode, args.unique)
+            # Warm connections, caches of static data and model pools
+            await run_load(call, args.warmup, min(args.warmup, args.concurrency) or 1)
+
+            if args.stub_url:
+                await stub_stats(client, args.stub_url, reset=True)
+            latencies, ttfbs, errors, wall = await run_load(call, args.requests, args.concurrency)
+            stats = await stub_stats(client, args.stub_url) if args.stub_url else None
+
+            if not latencies:
+                print(f"{target:<12}{args.requests:>6}{errors:>5}  all requests failed")
+                continue
+
+            ok = len(latencies)
+            mean = sum(latencies) / ok
+            row = (
+                f"{target:<12}{ok + errors:>6}{errors:>5}{ok / wall:>8.1f}"
+                f"{percentile(latencies, 50) * 1000:>7.0f}ms{percentile(latencies, 95) * 1000:>7.0f}ms"
+                f"{percentile(latencies, 99) * 1000:>7.0f}ms{percentile(ttfbs, 50) * 1000:>8.0f}ms"
+            )
+            if stats is not None:
+                # LLM time the stub spent per request (hedged/coalesced calls included)
+                llm_per_request = stats["llm_latency_s"] / ok
+                row += (
+                    f"{llm_per_request * 1000:>7.0f}ms{stats['requests'] / ok:>10.2f}"
+                    f"{(mean - llm_per_request) * 1000:>8.0f}ms"
+                )
+            print(row)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="semanticSearch and /api/chat load harness")
+    _ = parser.add_argument("--backend-url", default="http://localhost:9000")
+    _ = parser.add_argument("--stub-url", default="http://localhost:8001",
+                            help="LLM stub server (empty to skip overhead accounting)")
+    _ = parser.add_argument(
+        "--target",
+        choices=["search", "chat", "chat-stream", "both", "chat-vs-stream"],
+        default="both",
+    )
+    _ = parser.add_argument("--requests", type=int, default=200)
+    _ = parser.add_argument("--concurrency", type=int, default=20)
+    _ = parser.add_argument("--warmup", type=int, default=5)
+    _ = parser.add_argument("--mode", choices=["TOOL_CALLING", "PREFETCH"], default=None)
+    _ = parser.add_argument("--unique", action="store_true",
+                            help="Make every query distinct (bypass answer cache and coalescing)")
+    _ = parser.add_argument("--timeout", type=float, default=60.0)
+    asyncio.run(main(parser.parse_args()))
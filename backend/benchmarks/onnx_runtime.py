@@ -0,0 +1,104 @@
+"""
+Benchmark: YOLO on PyTorch eager vs ONNX Runtime (CPU).
+
+Loads the same detector twice through ImageClassifier's loader (``.pt``
+on PyTorch, its ``.onnx`` export on ONNX Runtime), runs both on the
+same images single-image and batched, and reports latency percentiles
+plus how often the two runtimes agree on the top detection.
+
+Export the model first:
+    poetry run python -m business_backend.ml.training.export ml/weights/best.pt
+
+Usage (from backend/):
+    poetry run python -m benchmarks.onnx_runtime --pt ml/weights/best.pt --onnx ml/weights/best.onnx \\
+        --images photos/ --threads 4
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any
+
+import cv2
+import numpy as np
+
+from business_backend.ml.models.image_classifier import _load_model, _yolo_predict, _yolo_predict_batch
+
+
+def load_images(source: str | None, count: int) -> list[np.ndarray]:
+    """Images from a directory (decoded once), or synthetic frames if none is given."""
+    if source:
+        paths = sorted(p for p in Path(source).iterdir() if p.suffix.lower() in {".jpg", ".jpeg", ".png"})
+        images = [cv2.imread(str(p)) for p in paths[:count]]
+        return [image for image in images if image is not None]
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run(model: Any, images: list[np.ndarray], batch_size: int, repeat: int) -> dict[str, Any]:
+    """Single-image latencies and batched throughput of one runtime."""
+    _yolo_predict(model, images[0])  # Warm up (lazy predictor setup, ORT allocations)
+
+    latencies = []
+    for _ in range(repeat):
+        for image in images:
+            start = time.perf_counter()
+            _yolo_predict(model, image)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        _yolo_predict_batch(model, images, batch_size)
+    batched = (time.perf_counter() - start) / (repeat * len(images))
+
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "batched": batched,
+        "predictions": [_yolo_predict(model, image) for image in images],
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    if args.threads:
+        import torch
+
+        torch.set_num_threads(args.threads)
+    images = load_images(args.images, args.count)
+    pytorch = _load_model(args.pt)
+    onnx = _load_model(args.onnx, intra_op_threads=args.threads)
+
+    print(f"{len(images)} image(s), batch {args.batch_size}, threads {args.threads or 'default'}\n")
+    print(f"{'runtime':<14}{'p50':>10}{'p95':>10}{'batched/img':>14}")
+    results = {}
+    for name, model in (("pytorch", pytorch), ("onnxruntime", onnx)):
+        results[name] = result = run(model, images, args.batch_size, args.repeat)
+        print(
+            f"{name:<14}{result['p50'] * 1000:>8.1f}ms{result['p95'] * 1000:>8.1f}ms"
+            f"{result['batched'] * 1000:>12.1f}ms"
+        )
+
+    pairs = list(zip(results["pytorch"]["predictions"], results["onnxruntime"]["predictions"]))
+    same = sum(a["prediction"] == b["prediction"] for a, b in pairs)
+    conf_diff = max(abs(a["confidence"] - b["confidence"]) for a, b in pairs)
+    print(f"\nTop detection agrees on {same}/{len(pairs)} image(s); max confidence difference {conf_diff:.4f}")
+    print(f"Speedup p50: {results['pytorch']['p50'] / results['onnxruntime']['p50']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PyTorch vs ONNX Runtime YOLO latency")
+    _ = parser.add_argument("--pt", required=True, help="YOLO .pt weights")
+    _ = parser.add_argument("--onnx", required=True, help="ONNX export of the same weights")
+    _ = parser.add_argument("--images", default=None, help="Directory of test images (default: synthetic)")
+    _ = parser.add_argument("--count", type=int, default=32)
+    _ = parser.add_argument("--batch-size", type=int, default=8)
+    _ = parser.add_argument("--threads", type=int, default=None, help="torch / ORT intra-op threads")
+    _ = parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,109 @@
+"""
+Concurrency stress check for SearchService result isolation.
+
+Fires many concurrent semantic searches through a single SearchService
+(as the DI singleton is used in production) with a scripted LLM and an
+in-memory product service, then verifies every response only contains
+the products of its own query. Needs no database or network.
+
+Usage (from backend/):
+    poetry run python -m benchmarks.search_concurrency --requests 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+from business_backend.llm.provider import LLMProvider
+from business_backend.services.search_service import SearchService
+
+
+class ScriptedModel:
+    """Chat model stand-in: asks for product_search, then answers."""
+
+    def bind_tools(self, tools: list, **kwargs: Any) -> "ScriptedModel":
+        return self
+
+    async def ainvoke(self, messages: list[Any]) -> AIMessage:
+        await asyncio.sleep(random.uniform(0.001, 0.02))
+        if isinstance(messages[-1], ToolMessage):
+            return AIMessage(content="done")
+
+        term = messages[-1]["content"]
+        return AIMessage(
+            content="",
+            tool_calls=[
+                {
+                    "name": "product_search",
+                    "args": {"search_term": term},
+                    "id": f"call_{uuid.uuid4().hex[:8]}",
+                }
+            ],
+        )
+
+
+class InMemoryProductService:
+    """Returns rows named after the search term, with random DB latency."""
+
+    async def get_inventory_version(self) -> str:
+        return "stress"
+
+    async def search_by_name(self, name: str, limit: int = 20, active_only: bool = True) -> list:
+        await asyncio.sleep(random.uniform(0.001, 0.02))
+        return [
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                product_name=f"{name} unit {i}",
+                product_sku=None,
+                quantity_available=i,
+                stock_status=1,
+                unit_cost=Decimal("10.00"),
+                supplier_name="Stress",
+                warehouse_location="MAIN",
+            )
+            for i in range(3)
+        ]
+
+
+async def main(total: int, concurrency: int) -> None:
+    service = SearchService(
+        llm_provider=LLMProvider(ScriptedModel()),  # type: ignore[arg-type]
+        product_service=InMemoryProductService(),  # type: ignore[arg-type]
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    leaks = 0
+
+    async def one(i: int) -> None:
+        nonlocal leaks
+        term = f"sku-{i:06d}"
+        async with semaphore:
+            result = await service.semantic_search(term)
+        if not result.products_found or any(
+            not p.product_name.startswith(term) for p in result.products_found
+        ):
+            leaks += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+
+    print(f"requests={total} concurrency={concurrency} "
+          f"elapsed={elapsed:.2f}s throughput={total / elapsed:.0f} req/s")
+    print(f"cross-request leaks: {leaks}")
+    if leaks:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SearchService isolation stress test")
+    _ = parser.add_argument("--requests", type=int, default=2000)
+    _ = parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
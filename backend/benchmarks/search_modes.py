@@ -0,0 +1,112 @@
+"""
+Benchmark: tool-calling vs prefetch semantic search.
+
+Runs the same queries through both SearchService pipelines against the
+configured LLM provider and database, and reports latency, LLM calls and
+token usage per mode.
+
+Usage (from backend/):
+    poetry run python -m benchmarks.search_modes --repeat 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from business_backend.container import create_business_container
+from business_backend.services.search_service import SearchMode, SearchService
+
+DEFAULT_QUERIES = [
+    "¿Tienen MacBook en stock?",
+    "Busco una laptop Lenovo ThinkPad",
+    "¿Qué laptops gamer Asus hay disponibles?",
+    "Do you have any Dell Latitude?",
+    "precio de la macbook pro m1",
+]
+
+
+class UsageCounter(AsyncCallbackHandler):
+    """Counts LLM calls and token usage reported by the provider."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    async def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        self.calls += 1
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        self.prompt_tokens += usage.get("prompt_tokens", 0)
+        self.completion_tokens += usage.get("completion_tokens", 0)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_mode(
+    service: SearchService,
+    counter: UsageCounter,
+    mode: SearchMode,
+    queries: list[str],
+    repeat: int,
+) -> dict[str, float]:
+    """Run all queries in one mode and collect stats."""
+    counter.calls = counter.prompt_tokens = counter.completion_tokens = 0
+    latencies: list[float] = []
+
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            await service.semantic_search(query, mode=mode)
+            latencies.append(time.perf_counter() - start)
+
+    n = len(latencies)
+    return {
+        "requests": n,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "llm_calls_per_req": counter.calls / n,
+        "prompt_tokens_per_req": counter.prompt_tokens / n,
+        "completion_tokens_per_req": counter.completion_tokens / n,
+    }
+
+
+async def main(repeat: int) -> None:
+    container = create_business_container()
+    async with container.context() as ctx:
+        service = await ctx.resolve(SearchService)
+
+    if service.llm_provider is None:
+        raise SystemExit("LLM is not configured; nothing to compare.")
+
+    counter = UsageCounter()
+    for model in service.llm_provider.get_models():
+        model.callbacks = [*(model.callbacks or []), counter]
+
+    print(f"{'mode':<14}{'reqs':>6}{'mean':>10}{'p50':>10}{'p95':>10}"
+          f"{'calls':>8}{'prompt':>9}{'compl':>8}")
+    for mode in SearchMode:
+        stats = await run_mode(service, counter, mode, DEFAULT_QUERIES, repeat)
+        print(
+            f"{mode.value:<14}{stats['requests']:>6}"
+            f"{stats['mean_ms']:>8.0f}ms{stats['p50_ms']:>8.0f}ms{stats['p95_ms']:>8.0f}ms"
+            f"{stats['llm_calls_per_req']:>8.2f}{stats['prompt_tokens_per_req']:>9.0f}"
+            f"{stats['completion_tokens_per_req']:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare semantic search modes")
+    _ = parser.add_argument("--repeat", type=int, default=3, help="Runs per query")
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat))
@@ -17,6 +17,7 @@ from business_backend.api.graphql.types import (
     Document,
     ProductStockType,
     ProductSummaryType,
+    SearchModeType,
     SemanticSearchResponse,
 )
 from business_backend.services.product_service import ProductService
@@ -345,16 +346,19 @@ class BusinessQuery:
         self,
         search_service: Annotated[SearchService, Inject],
         query: str,
+        mode: SearchModeType | None = None,
     ) -> SemanticSearchResponse:
         """
         Semantic search using LLM with product database.
 
         The LLM interprets the query and uses tools to search products,
-        then generates a natural language response.
+        then generates a natural language response. With mode PREFETCH,
+        candidate products are retrieved first and the answer comes from
+        a single LLM call.
 
         Example query:
             query {
-              semanticSearch(query: "¿Tienen leche en stock?") {
+              semanticSearch(query: "¿Tienen leche en stock?", mode: PREFETCH) {
                 answer
                 productsFound {
                   productName
@@ -364,9 +368,9 @@ class BusinessQuery:
               }
             }
         """
-        logger.info(f"🤖 GraphQL: semanticSearch(query={query})")
+        logger.info(f"🤖 GraphQL: semanticSearch(query={query}, mode={mode})")
 
-        response = await search_service.semantic_search(query)
+        response = await search_service.semantic_search(query, mode=mode)
 
         products_found = [
             ProductSummaryType(
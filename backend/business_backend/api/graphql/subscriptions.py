@@ -0,0 +1,78 @@
+"""GraphQL subscriptions for Business Backend.
+
+Incremental delivery of semantic search over WebSocket
+(graphql-transport-ws / graphql-ws).
+"""
+
+from collections.abc import AsyncGenerator
+
+import strawberry
+from loguru import logger
+
+from business_backend.api.graphql.types import (
+    ProductSummaryType,
+    SearchModeType,
+    SemanticSearchEvent,
+)
+from business_backend.container import create_business_container
+from business_backend.database.models import ProductStock
+from business_backend.services.search_service import SearchService
+
+
+def _product_summary(p: ProductStock) -> ProductSummaryType:
+    return ProductSummaryType(
+        id=p.id,
+        product_name=p.product_name,
+        product_sku=p.product_sku,
+        supplier_name=p.supplier_name,
+        quantity_available=p.quantity_available,
+        stock_status=p.stock_status,
+        unit_cost=p.unit_cost,
+        warehouse_location=p.warehouse_location,
+        is_active=p.is_active,
+    )
+
+
+@strawberry.type
+class BusinessSubscription:
+    """Business backend subscriptions."""
+
+    @strawberry.subscription
+    async def semantic_search_stream(
+        self,
+        query: str,
+        mode: SearchModeType | None = None,
+    ) -> AsyncGenerator[SemanticSearchEvent, None]:
+        """
+        Semantic search with products first and the answer streamed after.
+
+        The first event carries productsFound as soon as the product search
+        returns (sent again, complete, if a later search finds more); the
+        following ones carry answerDelta pieces; the last one carries the
+        full answer.
+
+        Example subscription:
+            subscription {
+              semanticSearchStream(query: "¿Tienen laptops Lenovo?") {
+                productsFound { productName quantityAvailable }
+                answerDelta
+                answer
+              }
+            }
+        """
+        logger.info(f"🤖 GraphQL: semanticSearchStream(query={query}, mode={mode})")
+
+        # Subscriptions don't run the DI extension: resolve the singleton directly
+        async with create_business_container().context() as ctx:
+            search_service = await ctx.resolve(SearchService)
+
+        async for event in search_service.semantic_search_stream(query, mode=mode):
+            products = event.products_found
+            yield SemanticSearchEvent(
+                query=query,
+                products_found=(
+                    [_product_summary(p) for p in products] if products is not None else None
+                ),
+                answer_delta=event.answer_delta,
+                answer=event.answer,
+            )
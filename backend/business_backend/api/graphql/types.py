@@ -6,6 +6,8 @@ from uuid import UUID
 
 import strawberry
 
+from business_backend.services.search_service import SearchMode
+
 
 @strawberry.type
 class FAQ:
@@ -99,3 +101,19 @@ class SemanticSearchResponse:
     answer: str
     products_found: list[ProductSummaryType]
     query: str
+
+
+@strawberry.type
+class SemanticSearchEvent:
+    """Incremental semantic search output (semanticSearchStream subscription)."""
+
+    query: str
+    # Sent first, as soon as the product search returns (full list again if a later search adds more)
+    products_found: list[ProductSummaryType] | None = None
+    # Next piece of the answer
+    answer_delta: str = ""
+    # Full answer, on the last event
+    answer: str | None = None
+
+
+SearchModeType = strawberry.enum(SearchMode, name="SearchMode")
@@ -4,13 +4,19 @@ Chat Endpoints for Business Backend.
 Exposes Agent 2 capabilities (LangChain + Open Source LLM).
 """
 
-from typing import List, Optional, Annotated
+import asyncio
+import json
+from contextlib import suppress
+from typing import Any, AsyncGenerator, AsyncIterator, List, Optional, Annotated
 
 from aioinject import Inject
 from aioinject.ext.fastapi import inject
-from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi import APIRouter, WebSocket
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from pydantic import BaseModel, ValidationError
 
+from business_backend.container import create_business_container
 from business_backend.services.agent_service import AgentService
 
 router = APIRouter()
@@ -22,11 +28,14 @@ class ChatMessage(BaseModel):
     type: Optional[str] = None # 'user', 'bot', 'image'
 
 class ChatRequest(BaseModel):
+    # With conversationId: only the new turn(s). Without: full history (starts a conversation)
     messages: List[ChatMessage]
     contextData: Optional[str] = ""
+    conversationId: Optional[str] = None
 
 class ChatResponse(BaseModel):
     reply: str
+    conversationId: str # Send back on the next turn to reuse server-side history
 
 
 @router.post("/chat", response_model=ChatResponse)
@@ -37,22 +46,131 @@ async def chat_endpoint(
 ):
     """
     Chat endpoint for Agent 2.
-    Receives full history + context, returns refined request.
+    Receives the new turn (or full history on the first call) + context,
+    returns refined request and the conversation ID holding the history.
     """
     # 1. Convert Pydantic models to dicts for Service
-    # Frontend sends [{type: 'user', text: '...'}, {type: 'bot', text: '...'}]
-    # Service expects [{'role': 'user', 'content': '...'}, ...]
-    
-    formatted_messages = []
-    for msg in request.messages:
-        role = "user" if msg.type == "user" else "assistant"
-        content = msg.text
-        formatted_messages.append({"role": role, "content": content})
-        
-    # 2. Call Service
-    reply = await agent_service.generate_refined_request(
+    formatted_messages = _format_messages(request)
+
+    # 2. Call Service (history is kept server-side per conversation)
+    turn = await agent_service.chat(
+        conversation_id=request.conversationId,
         messages=formatted_messages,
-        context_data=request.contextData
+        context_data=request.contextData or "",
     )
-    
-    return ChatResponse(reply=reply)
+
+    return ChatResponse(reply=turn.reply, conversationId=turn.conversation_id)
+
+
+@router.post("/chat/stream")
+@inject
+async def chat_stream_endpoint(
+    request: ChatRequest,
+    agent_service: Annotated[AgentService, Inject],
+):
+    """
+    Streaming variant of /chat over Server-Sent Events.
+
+    Emits `start` (conversationId), `token` (content) for each piece of
+    the reply as the LLM generates it, then `done` (reply, conversationId).
+    If the client disconnects, the upstream LLM call is aborted.
+    """
+    events = agent_service.chat_stream(
+        conversation_id=request.conversationId,
+        messages=_format_messages(request),
+        context_data=request.contextData or "",
+    )
+    return StreamingResponse(
+        _sse_stream(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/chat/ws")
+async def chat_websocket(websocket: WebSocket):
+    """
+    Streaming chat over WebSocket.
+
+    Each text frame is a ChatRequest; the server answers with the same
+    events as /chat/stream (`start`, `token`..., `done`) as JSON frames.
+    A frame received mid-turn (e.g. {"type": "cancel"}) or a disconnect
+    aborts the running turn and its upstream LLM call.
+    """
+    await websocket.accept()
+    # WebSocket routes bypass the DI middleware: resolve the singleton directly
+    async with create_business_container().context() as ctx:
+        agent_service = await ctx.resolve(AgentService)
+
+    receive = asyncio.create_task(websocket.receive())
+    turn: asyncio.Task | None = None
+    try:
+        while True:
+            message = await receive
+            if message["type"] == "websocket.disconnect":
+                return
+
+            receive = asyncio.create_task(websocket.receive())
+            try:
+                data = json.loads(message.get("text") or "{}")
+                if data.get("type") == "cancel":
+                    continue
+                request = ChatRequest.model_validate(data)
+            except (json.JSONDecodeError, ValidationError) as e:
+                await websocket.send_json({"type": "error", "message": f"Invalid request: {e}"})
+                continue
+
+            events = agent_service.chat_stream(
+                conversation_id=request.conversationId,
+                messages=_format_messages(request),
+                context_data=request.contextData or "",
+            )
+            turn = asyncio.create_task(_send_events(websocket, events))
+            await asyncio.wait({turn, receive}, return_when=asyncio.FIRST_COMPLETED)
+            if not turn.done():
+                # The client spoke or left mid-turn: abort the turn
+                turn.cancel()
+            with suppress(asyncio.CancelledError):
+                await turn
+    finally:
+        receive.cancel()
+        if turn is not None:
+            turn.cancel()
+
+
+def _format_messages(request: ChatRequest) -> list[dict]:
+    """
+    Frontend messages as service messages.
+
+    Frontend sends [{type: 'user', text: '...'}, {type: 'bot', text: '...'}];
+    the service expects [{'role': 'user', 'content': '...'}, ...].
+    """
+    return [
+        {"role": "user" if msg.type == "user" else "assistant", "content": msg.text}
+        for msg in request.messages
+    ]
+
+
+async def _sse_stream(events: AsyncGenerator[dict[str, Any], None]) -> AsyncIterator[str]:
+    """Format chat events as SSE; errors after the headers were sent become an `error` event."""
+    try:
+        async for event in events:
+            yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+    except Exception as e:
+        logger.error(f"Chat stream failed: {e}")
+        yield f"event: error\ndata: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+    finally:
+        await events.aclose()
+
+
+async def _send_events(websocket: WebSocket, events: AsyncGenerator[dict[str, Any], None]) -> None:
+    """Send chat events as JSON frames; errors become an `error` frame."""
+    try:
+        async for event in events:
+            await websocket.send_json(event)
+    except Exception as e:
+        logger.error(f"Chat stream failed: {e}")
+        with suppress(Exception):
+            await websocket.send_json({"type": "error", "message": str(e)})
+    finally:
+        await events.aclose()
@@ -2,21 +2,105 @@
 REST Endpoints for Business Backend.
 """
 
-import shutil
+import asyncio
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Annotated
+from typing import Annotated, Any
 
 from aioinject import Inject
 from aioinject.ext.fastapi import inject
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from loguru import logger
 
+from business_backend.config import get_business_settings
+from business_backend.ml.preprocessing.image_preprocessor import decode_image_bytes
 from business_backend.ml.serving.inference_service import InferenceService
 
 router = APIRouter()
 
 
+# Uploads are read in chunks so an oversized one is refused without buffering it whole
+UPLOAD_CHUNK_BYTES = 1 << 20
+
+
+async def _read_upload(file: UploadFile, max_bytes: int) -> bytes:
+    """
+    Read an upload into memory.
+
+    Args:
+        file: Uploaded file
+        max_bytes: Largest accepted size
+
+    Returns:
+        File content
+
+    Raises:
+        HTTPException: 413 if the file is larger than ``max_bytes``, 400 if empty
+    """
+    too_large = HTTPException(status_code=413, detail=f"File larger than {max_bytes} bytes.")
+    if file.size is not None and file.size > max_bytes:
+        raise too_large
+
+    chunks: list[bytes] = []
+    total = 0
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        total += len(chunk)
+        if total > max_bytes:
+            raise too_large
+        chunks.append(chunk)
+
+    if not total:
+        raise HTTPException(status_code=400, detail="Empty file.")
+    return b"".join(chunks)
+
+
+def _extract_middle_frame(video_path: str) -> Any:
+    """
+    Read the middle frame of a video (first frame as fallback).
+
+    Blocking: call it from a worker thread.
+
+    Args:
+        video_path: Video file
+
+    Returns:
+        BGR frame, or None if no frame could be read
+
+    Raises:
+        HTTPException: 400 if the video can't be opened
+    """
+    import cv2
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+         raise HTTPException(status_code=400, detail="Could not open video file.")
+
+    # Get total frame count to pick the middle one
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if frame_count > 0:
+        middle_frame_index = max(0, frame_count // 2)
+        cap.set(cv2.CAP_PROP_POS_FRAMES, middle_frame_index)
+
+    ret, frame = cap.read()
+    cap.release()
+
+    # Fallback: if middle frame failed, try first frame
+    if not ret:
+         logger.warning("Could not read middle frame, trying start of video...")
+         cap = cv2.VideoCapture(video_path)
+         ret, frame = cap.read()
+         cap.release()
+
+    return frame if ret else None
+
+
+def _write_temp_file(data: bytes, suffix: str) -> str:
+    """Write bytes to a new temp file and return its path (blocking)."""
+    with NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        tmp_file.write(data)
+        return tmp_file.name
+
+
 @router.post("/detect")
 @inject
 async def detect_product(
@@ -26,30 +110,29 @@ async def detect_product(
     """
     Detect product in uploaded image.
     
-    Uploads an image file and accepts it for processing by the ML Inference Service.
+    The upload is decoded in memory (no temp file) and the image array
+    is handed to the ML Inference Service.
     """
     logger.info(f"📸 Received file for detection: {file.filename}")
     
     try:
-        # Save uploaded file temporarily (to simulate real file processing)
-        # In production, this might stream directly or save to S3
-        suffix = Path(file.filename).suffix if file.filename else ".tmp"
-        with NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-            shutil.copyfileobj(file.file, tmp_file)
-            tmp_path = tmp_file.name
-            
-        logger.debug(f"Saved temp file to: {tmp_path}")
+        data = await _read_upload(file, get_business_settings().detect_max_image_bytes)
+
+        # Decoding is CPU-bound: keep it off the event loop
+        try:
+            image = await asyncio.to_thread(decode_image_bytes, data)
+        except ImportError:
+            raise HTTPException(status_code=500, detail="OpenCV (cv2) not installed on server.")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Could not decode image.")
         
         # Run inference
         result = await inference_service.predict(
             model_name="product_classifier",
-            data=tmp_path,  # Passing file path
-            preprocess=False # Our mock handles paths directly
+            data=image,  # Decoded BGR array, as YOLO reads files
+            preprocess=False
         )
         
-        # Cleanup
-        Path(tmp_path).unlink(missing_ok=True)
-        
         return {
             "status": "success",
             "filename": file.filename,
@@ -58,6 +141,8 @@ async def detect_product(
             "metadata": result.metadata
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Error in detection: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -77,57 +162,29 @@ async def detect_video_product(
     logger.info(f"🎥 Received video for detection: {file.filename}")
     
     video_path = None
-    image_path = None
     
     try:
-        # 1. Save video to temp file
-        suffix = Path(file.filename).suffix if file.filename else ".mp4"
-        with NamedTemporaryFile(delete=False, suffix=suffix) as tmp_video:
-            shutil.copyfileobj(file.file, tmp_video)
-            video_path = tmp_video.name
-            
-        logger.debug(f"Saved temp video to: {video_path}")
-        
-        # 2. Extract frame using OpenCV
+        data = await _read_upload(file, get_business_settings().detect_max_video_bytes)
+
         try:
-            import cv2
+            import cv2  # noqa: F401
         except ImportError:
             raise HTTPException(status_code=500, detail="OpenCV (cv2) not installed on server.")
 
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-             raise HTTPException(status_code=400, detail="Could not open video file.")
-             
-        # Get total frame count to pick the middle one
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        if frame_count > 0:
-            middle_frame_index = max(0, frame_count // 2)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, middle_frame_index)
-        
-        ret, frame = cap.read()
-        cap.release()
-        
-        # Fallback: if middle frame failed, try first frame
-        if not ret:
-             logger.warning("Could not read middle frame, trying start of video...")
-             cap = cv2.VideoCapture(video_path)
-             ret, frame = cap.read()
-             cap.release()
+        # 1. OpenCV only reads videos from files: write the temp file off the event loop
+        suffix = Path(file.filename).suffix if file.filename else ".mp4"
+        video_path = await asyncio.to_thread(_write_temp_file, data, suffix)
+        logger.debug(f"Saved temp video to: {video_path}")
         
-        if not ret or frame is None:
+        # 2. Extract frame using OpenCV (seeking and decoding block)
+        frame = await asyncio.to_thread(_extract_middle_frame, video_path)
+        if frame is None:
              raise HTTPException(status_code=400, detail="Could not extract any frame from video.")
 
-        # 3. Save frame as temp image
-        with NamedTemporaryFile(delete=False, suffix=".jpg") as tmp_image:
-            image_path = tmp_image.name
-            
-        cv2.imwrite(image_path, frame)
-        logger.debug(f"Extracted frame saved to: {image_path}")
-        
-        # 4. Run inference on the image
+        # 3. Run inference on the frame array (no image round trip through disk)
         result = await inference_service.predict(
             model_name="product_classifier",
-            data=image_path,
+            data=frame,
             preprocess=False
         )
         
@@ -149,5 +206,3 @@ async def detect_video_product(
         # Cleanup
         if video_path:
             Path(video_path).unlink(missing_ok=True)
-        if image_path:
-            Path(image_path).unlink(missing_ok=True)
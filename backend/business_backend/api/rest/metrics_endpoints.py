@@ -0,0 +1,40 @@
+"""
+Metrics Endpoints for Business Backend.
+
+Exposes in-process performance counters as JSON.
+"""
+
+from typing import Annotated
+
+from aioinject import Inject
+from aioinject.ext.fastapi import inject
+from fastapi import APIRouter
+
+from business_backend.ml.serving.inference_service import InferenceService
+from business_backend.services.agent_service import AgentService
+from business_backend.services.product_service import ProductService
+from business_backend.services.search_service import SearchService
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+@inject
+async def get_metrics(
+    search_service: Annotated[SearchService, Inject],
+    agent_service: Annotated[AgentService, Inject],
+    product_service: Annotated[ProductService, Inject],
+    inference_service: Annotated[InferenceService, Inject],
+) -> dict:
+    """
+    Performance counters of the running process.
+
+    Counters are per worker and reset on restart.
+    """
+    return {
+        "search": search_service.get_stats(),
+        "chat": agent_service.get_stats(),
+        "llm": search_service.llm_provider.get_stats() if search_service.llm_provider else None,
+        "products": product_service.get_stats(),
+        "inference": inference_service.get_stats(),
+    }
@@ -6,6 +6,7 @@ Uses the same database as agent/ but with its own configuration.
 """
 
 import functools
+from pathlib import Path
 
 import dotenv
 from pydantic import PostgresDsn
@@ -36,6 +37,115 @@ class BusinessSettings(BaseSettings):
     # Feature flags for modularity
     llm_enabled: bool = True
 
+    # Semantic search pipeline: "tool_calling" (2 LLM calls) or "prefetch" (1 LLM call)
+    search_mode: str = "tool_calling"
+    search_prefetch_limit: int = 8
+    # Run product_search on query keywords while the first LLM call is in flight
+    search_speculative: bool = False
+    search_speculative_limit: int = 50
+    # Answer cache in front of semantic search
+    search_cache_enabled: bool = True
+    search_cache_max_entries: int = 1024
+    search_cache_ttl_seconds: float = 600.0
+    search_cache_similarity_threshold: float = 0.85
+    # Seconds the inventory fingerprint (cache invalidation key) is reused
+    inventory_version_ttl_seconds: float = 5.0
+
+    # Chat prompts carry only the top-k products relevant to the conversation,
+    # from an in-memory catalog rebuilt when the inventory version changes
+    inventory_context_top_k: int = 8
+    inventory_context_max_products: int = 5000
+    # With tools available, chat prompts carry only the brand overview and the
+    # agent looks products up on demand (false: top-k products in every prompt)
+    chat_inventory_on_demand: bool = True
+
+    # Server-side chat sessions for /api/chat: "memory" (per worker) or "redis" (shared)
+    conversation_store_backend: str = "memory"
+    redis_url: str | None = None
+    conversation_max_entries: int = 10000
+    conversation_ttl_seconds: float = 3600.0
+    # Older turns beyond this budget are folded into an extractive summary
+    conversation_max_history_tokens: int = 1500
+    conversation_keep_recent_messages: int = 6
+
+    # Share one in-flight computation among identical concurrent requests
+    # (semantic searches, chat turns, product reads, inference on same image)
+    request_coalescing_enabled: bool = True
+
+    # LLM tool execution (shared by search and chat); concurrency is per LLM response
+    tool_max_concurrency: int = 4
+    tool_timeout_seconds: float = 15.0
+    # Agent loop: tool rounds per request and token budget before the answer is forced
+    agent_max_steps: int = 3
+    agent_token_budget: int = 8000
+
+    # Model inference runs off the event loop: "thread" pool (shares the loaded
+    # model, one forward pass at a time) or "process" pool (one model copy per
+    # worker, forward passes in parallel)
+    inference_executor: str = "thread"
+    inference_workers: int = 1
+    inference_max_concurrency: int = 2  # In-flight inferences; the rest queue
+    inference_torch_threads: int | None = None  # torch / ONNX Runtime intra-op threads per worker
+    # Largest uploads accepted by /api/detect and /api/detect_video (413 beyond)
+    detect_max_image_bytes: int = 10 * 1024 * 1024
+    detect_max_video_bytes: int = 100 * 1024 * 1024
+    # Micro-batching: concurrent predict calls on these models share one forward
+    # pass of up to max_size inputs, waiting at most max_wait_ms for the batch to fill
+    inference_batching_models: list[str] = []  # e.g. ["product_classifier"]
+    inference_batch_max_size: int = 8
+    inference_batch_max_wait_ms: float = 5.0
+    # Prediction cache keyed by input sha256 + model version (cleared on model reload);
+    # perceptual_max_distance > 0 also matches near-duplicate images by dHash
+    inference_cache_enabled: bool = True
+    inference_cache_max_entries: int = 2048
+    inference_cache_max_mb: float = 16.0
+    inference_cache_ttl_seconds: float = 3600.0
+    inference_cache_perceptual_max_distance: int = 0  # 0 disables; ~4 of 64 bits for re-encoded uploads
+
+    # Weights of the product_classifier model (.pt, or .onnx for ONNX Runtime)
+    product_classifier_path: str = str(Path(__file__).resolve().parents[1] / "ml" / "weights" / "best.pt")
+    # Startup: load production models and run warmup passes on synthetic images at
+    # these WIDTHxHEIGHT resolutions; /ready answers 503 until they are warm
+    model_warmup_enabled: bool = True
+    model_warmup_resolutions: list[str] = ["640x480", "480x640", "1280x720"]
+    model_warmup_runs: int = 1
+    # Memory budget for loaded models: least recently used non-production models are
+    # evicted to stay within it (production models stay loaded). None: unlimited
+    model_memory_budget_mb: float | None = None
+
+    # Local OpenAI-compatible server (vLLM, llama.cpp, Ollama), e.g. http://localhost:8001/v1
+    local_llm_base_url: str | None = None
+    local_llm_model: str = "llama3"
+    local_llm_api_key: str = "not-needed"
+
+    # LLM backend pool: "least_latency" or "weighted" routing across configured backends
+    llm_routing: str = "least_latency"
+    llm_backend_weights: dict[str, float] = {}  # e.g. {"groq": 3, "openai": 1}
+    llm_backend_failure_threshold: int = 2
+    llm_backend_cooldown_seconds: float = 30.0
+    llm_rate_limit_cooldown_seconds: float = 60.0
+    # Keep-alive HTTP client shared by all LLM backends
+    llm_http_max_connections: int = 100
+    llm_http_max_keepalive_connections: int = 20
+    llm_http_keepalive_expiry_seconds: float = 30.0
+    llm_http_timeout_seconds: float = 30.0
+
+    # LLM resilience: per-call deadline, hedging to another backend
+    # (when more than one is configured), circuit breaker, concurrency cap
+    llm_deadline_seconds: float = 20.0
+    llm_hedge_enabled: bool = True
+    llm_hedge_percentile: float = 95.0
+    llm_hedge_min_delay_seconds: float = 0.5
+    llm_max_concurrency: int = 16
+    llm_queue_timeout_seconds: float = 5.0
+    llm_breaker_failure_threshold: int = 5
+    llm_breaker_reset_seconds: float = 30.0
+
+    # Token prices (USD per million) for cost estimates in /api/metrics; 0 disables
+    llm_price_prompt_per_mtok: float = 0.0
+    llm_price_cached_per_mtok: float = 0.0
+    llm_price_completion_per_mtok: float = 0.0
+
     # Logging
     log_level: str = "INFO"
 
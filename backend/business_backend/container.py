@@ -20,16 +20,32 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from business_backend.config import get_business_settings
 from business_backend.database.session import get_session_factory
+from business_backend.llm.agent_executor import AgentExecutor
 from business_backend.llm.provider import LLMProvider, create_llm_provider
+from business_backend.llm.tools.executor import ToolExecutor
+from business_backend.llm.tools.image_recognition_tool import create_image_recognition_tool
+from business_backend.llm.tools.product_search_tool import create_product_search_tool
 from business_backend.services.computer_service import ComputerService
+from business_backend.services.conversation_store import (
+    ConversationBackend,
+    ConversationStore,
+    InMemoryConversationBackend,
+    RedisConversationBackend,
+)
+from business_backend.services.inventory_context import InventoryContext
 from business_backend.services.product_service import ProductService
-from business_backend.services.search_service import SearchService
+from business_backend.services.search_cache import SemanticSearchCache
+from business_backend.services.search_service import SearchMode, SearchService
 from business_backend.services.agent_service import AgentService
 from business_backend.services.tenant_data_service import TenantDataService
 
 
 from business_backend.ml.models.registry import ModelRegistry
+from business_backend.ml.serving.batching import BatchConfig
+from business_backend.ml.serving.executor import ExecutorKind, InferenceExecutor
+from business_backend.ml.serving.inference_cache import InferenceCache
 from business_backend.ml.serving.inference_service import InferenceService
+from business_backend.ml.serving.warmup import ModelWarmup, parse_resolution
 
 
 async def create_tenant_data_service() -> TenantDataService:
@@ -66,7 +82,12 @@ async def create_product_service(
     Returns:
         ProductService instance
     """
-    return ProductService(session_factory)
+    settings = get_business_settings()
+    return ProductService(
+        session_factory,
+        inventory_version_ttl=settings.inventory_version_ttl_seconds,
+        coalesce=settings.request_coalescing_enabled,
+    )
 
 
 async def create_computer_service(
@@ -101,7 +122,18 @@ async def create_model_registry() -> ModelRegistry:
     Returns:
         ModelRegistry instance
     """
-    registry = ModelRegistry()
+    settings = get_business_settings()
+    executor = InferenceExecutor(
+        kind=ExecutorKind(settings.inference_executor),
+        workers=settings.inference_workers,
+        max_concurrency=settings.inference_max_concurrency,
+        torch_threads=settings.inference_torch_threads,
+    )
+    budget_mb = settings.model_memory_budget_mb
+    registry = ModelRegistry(
+        executor=executor,
+        memory_budget_bytes=int(budget_mb * 1024 * 1024) if budget_mb is not None else None,
+    )
     # Pre-register default model for convenience
     from business_backend.ml.models.image_classifier import ImageClassifier
     from business_backend.ml.models.registry import ModelStage
@@ -109,7 +141,7 @@ async def create_model_registry() -> ModelRegistry:
     registry.register(
         name="product_classifier",
         model_class=ImageClassifier,
-        model_path="/home/mkt/Projects/Aprendizaje/ProyectoFinalAprendizaje/business_backend/ml/weights/best.pt",
+        model_path=settings.product_classifier_path,
         stage=ModelStage.PRODUCTION
     )
     return registry
@@ -127,21 +159,163 @@ async def create_inference_service(
     Returns:
         InferenceService instance
     """
-    return InferenceService(model_registry=registry)
+    settings = get_business_settings()
+    batch_config = BatchConfig(
+        max_batch_size=settings.inference_batch_max_size,
+        max_wait_ms=settings.inference_batch_max_wait_ms,
+    )
+    cache = None
+    if settings.inference_cache_enabled:
+        cache = InferenceCache(
+            max_entries=settings.inference_cache_max_entries,
+            max_bytes=int(settings.inference_cache_max_mb * 1024 * 1024),
+            ttl_seconds=settings.inference_cache_ttl_seconds,
+            perceptual_max_distance=settings.inference_cache_perceptual_max_distance or None,
+        )
+    return InferenceService(
+        model_registry=registry,
+        coalesce=settings.request_coalescing_enabled,
+        batching={name: batch_config for name in settings.inference_batching_models},
+        cache=cache,
+    )
+
+
+async def create_model_warmup(
+    registry: ModelRegistry,
+) -> ModelWarmup:
+    """
+    Factory function for ModelWarmup (started by the app lifespan).
+
+    Args:
+        registry: ModelRegistry instance
+
+    Returns:
+        ModelWarmup for the production models
+    """
+    settings = get_business_settings()
+    return ModelWarmup(
+        registry,
+        resolutions=[parse_resolution(r) for r in settings.model_warmup_resolutions],
+        runs=settings.model_warmup_runs,
+        enabled=settings.model_warmup_enabled,
+    )
+
+
+async def create_tool_executor(
+    product_service: ProductService,
+    inference_service: InferenceService,
+) -> ToolExecutor:
+    """
+    Factory function for the shared LLM ToolExecutor.
+
+    Args:
+        product_service: ProductService for the product search tool
+        inference_service: InferenceService for the image recognition tool
+
+    Returns:
+        ToolExecutor with all LLM tools
+    """
+    settings = get_business_settings()
+    return ToolExecutor(
+        tools=[
+            create_product_search_tool(product_service),
+            create_image_recognition_tool(inference_service),
+        ],
+        max_concurrency=settings.tool_max_concurrency,
+        timeout=settings.tool_timeout_seconds,
+    )
+
+
+async def create_inventory_context(product_service: ProductService) -> InventoryContext:
+    """
+    Factory function for InventoryContext singleton.
+
+    Args:
+        product_service: ProductService dependency
+
+    Returns:
+        InventoryContext instance
+    """
+    settings = get_business_settings()
+    return InventoryContext(
+        product_service,
+        top_k=settings.inventory_context_top_k,
+        max_products=settings.inventory_context_max_products,
+    )
+
+
+async def create_conversation_store() -> ConversationStore:
+    """
+    Factory function for ConversationStore singleton.
+
+    Uses Redis when CONVERSATION_STORE_BACKEND=redis (shared by all
+    workers), otherwise a per-process in-memory LRU/TTL store.
+
+    Returns:
+        ConversationStore instance
+    """
+    settings = get_business_settings()
+    backend: ConversationBackend
+    if settings.conversation_store_backend == "redis":
+        if not settings.redis_url:
+            raise ValueError("CONVERSATION_STORE_BACKEND=redis requires REDIS_URL")
+        backend = RedisConversationBackend(
+            settings.redis_url, ttl_seconds=settings.conversation_ttl_seconds
+        )
+    else:
+        backend = InMemoryConversationBackend(
+            max_entries=settings.conversation_max_entries,
+            ttl_seconds=settings.conversation_ttl_seconds,
+        )
+    return ConversationStore(
+        backend,
+        max_history_tokens=settings.conversation_max_history_tokens,
+        keep_recent_messages=settings.conversation_keep_recent_messages,
+    )
+
+
+def _agent_executor(
+    llm_provider: LLMProvider | None,
+    tool_executor: ToolExecutor,
+) -> AgentExecutor | None:
+    """Agent tool loop with step and token limits from settings (None without an LLM)."""
+    if llm_provider is None:
+        return None
+    settings = get_business_settings()
+    return AgentExecutor(
+        llm_provider,
+        tool_executor,
+        max_steps=settings.agent_max_steps,
+        token_budget=settings.agent_token_budget,
+    )
 
 
 async def create_agent_service(
     llm_provider: LLMProvider | None,
     product_service: ProductService,
+    tool_executor: ToolExecutor,
+    inventory_context: InventoryContext,
+    conversation_store: ConversationStore,
 ) -> AgentService:
     """Factory function for AgentService."""
-    return AgentService(llm_provider, product_service)
+    settings = get_business_settings()
+    return AgentService(
+        llm_provider,
+        product_service,
+        tool_executor,
+        coalesce=settings.request_coalescing_enabled,
+        inventory_context=inventory_context,
+        conversation_store=conversation_store,
+        agent_executor=_agent_executor(llm_provider, tool_executor),
+        inventory_on_demand=settings.chat_inventory_on_demand,
+    )
 
 
 async def create_search_service(
     llm_provider: LLMProvider | None,
     product_service: ProductService,
     inference_service: InferenceService,
+    tool_executor: ToolExecutor,
 ) -> SearchService:
     """
     Factory function for SearchService.
@@ -150,11 +324,33 @@ async def create_search_service(
         llm_provider: LLM provider (can be None)
         product_service: ProductService for database queries
         inference_service: InferenceService for image tools
+        tool_executor: Shared ToolExecutor
 
     Returns:
         SearchService instance
     """
-    return SearchService(llm_provider, product_service, inference_service)
+    settings = get_business_settings()
+    cache = None
+    if settings.search_cache_enabled:
+        cache = SemanticSearchCache(
+            max_entries=settings.search_cache_max_entries,
+            ttl_seconds=settings.search_cache_ttl_seconds,
+            similarity_threshold=settings.search_cache_similarity_threshold,
+        )
+
+    return SearchService(
+        llm_provider,
+        product_service,
+        inference_service,
+        tool_executor=tool_executor,
+        default_mode=SearchMode(settings.search_mode),
+        prefetch_limit=settings.search_prefetch_limit,
+        speculative=settings.search_speculative,
+        speculative_limit=settings.search_speculative_limit,
+        cache=cache,
+        coalesce=settings.request_coalescing_enabled,
+        agent_executor=_agent_executor(llm_provider, tool_executor),
+    )
 
 
 def providers() -> Iterable[aioinject.Provider[Any]]:
@@ -167,6 +363,10 @@ def providers() -> Iterable[aioinject.Provider[Any]]:
     - LLMProvider: OpenAI via LangChain (optional)
     - ModelRegistry: ML Model management
     - InferenceService: ML Inference
+    - ModelWarmup: Eager model load and warmup at startup
+    - ToolExecutor: LLM tools shared by search and chat
+    - InventoryContext: Cached catalog for chat prompts
+    - ConversationStore: Server-side chat history
     - SearchService: Semantic search with LLM
     """
     providers_list: list[aioinject.Provider[Any]] = []
@@ -182,9 +382,13 @@ def providers() -> Iterable[aioinject.Provider[Any]]:
     # ML Services
     providers_list.append(aioinject.Singleton(create_model_registry))
     providers_list.append(aioinject.Singleton(create_inference_service))
+    providers_list.append(aioinject.Singleton(create_model_warmup))
 
     # LLM & Search
     providers_list.append(aioinject.Singleton(create_llm_provider_instance))
+    providers_list.append(aioinject.Singleton(create_tool_executor))
+    providers_list.append(aioinject.Singleton(create_inventory_context))
+    providers_list.append(aioinject.Singleton(create_conversation_store))
     providers_list.append(aioinject.Singleton(create_agent_service))
     providers_list.append(aioinject.Singleton(create_search_service))
 
@@ -4,6 +4,21 @@ This module can be removed if LLM functionality is not needed.
 Set LLM_ENABLED=false in environment to disable.
 """
 
-from business_backend.llm.provider import LLMProvider, create_llm_provider
+from business_backend.llm.pool import BackendPool, LLMBackend, RoutingStrategy
+from business_backend.llm.provider import LLMProvider, chunk_to_message, create_llm_provider
+from business_backend.llm.resilience import LLMUnavailableError, ResilienceConfig, ResilientInvoker
+from business_backend.llm.usage import LLMUsageTracker, TokenPrices
 
-__all__ = ["LLMProvider", "create_llm_provider"]
+__all__ = [
+    "BackendPool",
+    "LLMBackend",
+    "LLMProvider",
+    "LLMUnavailableError",
+    "LLMUsageTracker",
+    "ResilienceConfig",
+    "ResilientInvoker",
+    "RoutingStrategy",
+    "TokenPrices",
+    "chunk_to_message",
+    "create_llm_provider",
+]
@@ -0,0 +1,258 @@
+"""
+Agent Executor for LangChain tool calling.
+
+Runs the model/tool loop shared by SearchService and AgentService:
+- Several tool rounds, bounded by a step count and a token budget
+- The tool calls of a round run concurrently (ToolExecutor)
+- Stops early when the model answers, or repeats a tool call it already made
+- Out of steps or budget, a last call with tool use disabled forces an answer
+- Streamed runs emit only the answer's text, never that of tool rounds
+"""
+
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from langchain_core.messages import BaseMessage, ToolMessage
+from loguru import logger
+
+from business_backend.llm.provider import LLMProvider, chunk_to_message
+from business_backend.llm.tools.executor import ToolCallResolver, ToolExecutor
+
+
+class StopReason(str, Enum):
+    """Why the agent loop ended."""
+
+    ANSWER = "answer"  # Model answered without requesting tools
+    MAX_STEPS = "max_steps"  # Tool rounds exhausted, answer forced
+    TOKEN_BUDGET = "token_budget"  # Budget spent, answer forced
+    REPEATED_CALL = "repeated_call"  # Model repeated a tool call, answer forced
+
+
+@dataclass
+class AgentRun:
+    """Outcome of one agent loop."""
+
+    response: BaseMessage  # Final model message
+    messages: list[Any]  # Prompt of the final call (input plus tool rounds)
+    tool_calls: list[dict[str, Any]]  # Every tool call executed
+    steps: int  # LLM calls made
+    tokens: int  # Tokens used (reported by the provider, estimated otherwise)
+    stop_reason: StopReason
+
+
+@dataclass
+class AgentStreamEvent:
+    """
+    Streamed agent output.
+
+    Exactly one field is set: a piece of the answer, the results of a
+    tool round, or (last event) the completed run.
+    """
+
+    text: str = ""
+    tool_messages: list[ToolMessage] | None = None
+    run: AgentRun | None = None
+
+
+def _estimate_tokens(messages: list[Any]) -> int:
+    """Rough token count of messages (~4 characters per token)."""
+    total = 0
+    for message in messages:
+        content = message["content"] if isinstance(message, dict) else message.content
+        total += len(str(content)) // 4 + 1
+    return total
+
+
+def _response_tokens(response: BaseMessage, prompt: list[Any]) -> int:
+    """Tokens of one call: provider-reported when available, estimated otherwise."""
+    usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+    if usage.get("total_tokens"):
+        return usage["total_tokens"]
+    usage_metadata = getattr(response, "usage_metadata", None) or {}
+    if usage_metadata.get("total_tokens"):
+        return usage_metadata["total_tokens"]
+    return _estimate_tokens(prompt) + _estimate_tokens([response])
+
+
+def _call_key(tool_call: dict[str, Any]) -> str:
+    return f"{tool_call['name']}:{json.dumps(tool_call['args'], sort_keys=True, default=str)}"
+
+
+class AgentExecutor:
+    """
+    Bounded multi-step tool-calling loop.
+
+    Each step is one LLM call with the tools bound; the tool calls it
+    requests run concurrently and their results are appended for the
+    next step. At most ``max_steps`` tool rounds run; when they are
+    exhausted, ``token_budget`` is spent or the model repeats a call,
+    one last call with the tools still bound but ``tool_choice="none"``
+    (the history holds tool calls and results) makes the model answer
+    with what it has.
+    """
+
+    def __init__(
+        self,
+        llm_provider: LLMProvider,
+        tool_executor: ToolExecutor,
+        max_steps: int = 3,
+        token_budget: int = 8000,
+    ) -> None:
+        """
+        Initialize AgentExecutor.
+
+        Args:
+            llm_provider: Provider used for every LLM call
+            tool_executor: Executor holding the tools
+            max_steps: Maximum tool rounds per run
+            token_budget: Tokens (prompt + completion, all calls) after which
+                no further tool round starts
+        """
+        self.llm_provider = llm_provider
+        self.tool_executor = tool_executor
+        self.max_steps = max_steps
+        self.token_budget = token_budget
+
+        self._runs = 0
+        self._llm_calls = 0
+        self._tool_calls = 0
+        self._tokens = 0
+        self._stop_reasons: dict[str, int] = {reason.value: 0 for reason in StopReason}
+
+    async def run(
+        self,
+        messages: list[Any],
+        resolver: ToolCallResolver | None = None,
+    ) -> AgentRun:
+        """
+        Run the loop until the model answers.
+
+        Args:
+            messages: Prompt messages (dicts or LangChain messages)
+            resolver: Optional hook that may answer a tool call without running the tool
+
+        Returns:
+            AgentRun with the final response
+        """
+        async for event in self._loop(messages, resolver, stream=False):
+            if event.run is not None:
+                return event.run
+        raise RuntimeError("Agent loop ended without a result")
+
+    def astream(
+        self,
+        messages: list[Any],
+        resolver: ToolCallResolver | None = None,
+    ) -> AsyncIterator[AgentStreamEvent]:
+        """
+        Run the loop with every LLM call streamed.
+
+        Text is yielded token by token as the model writes it, until a
+        call starts requesting tools; the rest of that call's text is
+        dropped.
+
+        Args:
+            messages: Prompt messages (dicts or LangChain messages)
+            resolver: Optional hook that may answer a tool call without running the tool
+
+        Returns:
+            Async iterator of answer pieces, tool round results and, last, the run
+        """
+        return self._loop(messages, resolver, stream=True)
+
+    async def _loop(
+        self,
+        messages: list[Any],
+        resolver: ToolCallResolver | None,
+        stream: bool,
+    ) -> AsyncIterator[AgentStreamEvent]:
+        """The agent loop; yields text only when ``stream`` is set."""
+        tools = self.tool_executor.tools
+        messages = list(messages)
+        executed: list[dict[str, Any]] = []
+        seen: set[str] = set()
+        tokens = 0
+        steps = 0
+        stop: StopReason | None = None
+
+        while True:
+            # Forced final answer: tools stay bound (the history references them) but can't be called
+            final = stop is not None
+            tool_choice = "none" if final else None
+
+            steps += 1
+            if stream:
+                merged = None
+                answering = True
+                async for chunk in self.llm_provider.astream(messages, tools=tools, tool_choice=tool_choice):
+                    merged = chunk if merged is None else merged + chunk
+                    if getattr(chunk, "tool_call_chunks", None):
+                        # A tool round: whatever text follows is not the answer
+                        answering = False
+                    if answering and chunk.content:
+                        yield AgentStreamEvent(text=str(chunk.content))
+                response: BaseMessage = chunk_to_message(merged)
+            else:
+                response = await self.llm_provider.ainvoke(messages, tools=tools, tool_choice=tool_choice)
+            tokens += _response_tokens(response, messages)
+
+            tool_calls = getattr(response, "tool_calls", None) or []
+            if final or not tool_calls:
+                run = AgentRun(
+                    response=response,
+                    messages=messages,
+                    tool_calls=executed,
+                    steps=steps,
+                    tokens=tokens,
+                    stop_reason=stop or StopReason.ANSWER,
+                )
+                self._record(run)
+                yield AgentStreamEvent(run=run)
+                return
+
+            keys = [_call_key(call) for call in tool_calls]
+            if all(key in seen for key in keys):
+                stop = StopReason.REPEATED_CALL
+            elif tokens >= self.token_budget:
+                stop = StopReason.TOKEN_BUDGET
+            if stop is not None:
+                # Drop this request and make the model answer from what it has
+                logger.debug(f"Agent stopping after {steps} step(s): {stop.value}")
+                continue
+
+            tool_messages = await self.tool_executor.execute(tool_calls, resolver=resolver)
+            executed.extend(tool_calls)
+            seen.update(keys)
+            messages = [*messages, response, *tool_messages]
+            yield AgentStreamEvent(tool_messages=tool_messages)
+
+            if steps >= self.max_steps:
+                stop = StopReason.MAX_STEPS
+
+    def _record(self, run: AgentRun) -> None:
+        self._runs += 1
+        self._llm_calls += run.steps
+        self._tool_calls += len(run.tool_calls)
+        self._tokens += run.tokens
+        self._stop_reasons[run.stop_reason.value] += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get loop counters.
+
+        Returns:
+            Dict with runs, LLM/tool calls and tokens per run, and stop reasons
+        """
+        runs = self._runs
+        return {
+            "runs": runs,
+            "max_steps": self.max_steps,
+            "token_budget": self.token_budget,
+            "llm_calls_per_run": self._llm_calls / runs if runs else 0.0,
+            "tool_calls_per_run": self._tool_calls / runs if runs else 0.0,
+            "tokens_per_run": self._tokens / runs if runs else 0.0,
+            "stop_reasons": dict(self._stop_reasons),
+        }
@@ -0,0 +1,332 @@
+"""
+LLM Backend Pool.
+
+Routes chat completions across several OpenAI-compatible backends
+(Groq, OpenAI, a local server) with health tracking:
+- Weighted or least-latency routing
+- Backends that are rate-limited (429) or keep failing are put in cooldown
+- A failed call fails over to the next healthy backend
+"""
+
+import random
+import time
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+import openai
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, BaseMessageChunk
+from langchain_core.runnables import Runnable
+from loguru import logger
+
+
+def bind_tools(model: BaseChatModel, tools: list, tool_choice: str | None = None) -> Runnable:
+    """``model.bind_tools``, passing ``tool_choice`` only when one is set."""
+    if tool_choice is None:
+        return model.bind_tools(tools)
+    return model.bind_tools(tools, tool_choice=tool_choice)
+
+
+class RoutingStrategy(str, Enum):
+    """How the pool picks a backend."""
+
+    WEIGHTED = "weighted"  # Random, proportional to weight
+    LEAST_LATENCY = "least_latency"  # Lowest EWMA latency (untried backends first)
+
+
+@dataclass
+class LLMBackend:
+    """One chat model endpoint and its health."""
+
+    name: str
+    model: BaseChatModel
+    weight: float = 1.0
+
+    ewma_latency: float | None = None
+    cooldown_until: float = 0.0
+    consecutive_failures: int = 0
+    successes: int = 0
+    failures: int = 0
+    rate_limited: int = 0
+    _bound: dict[tuple[Any, ...], Runnable] = field(default_factory=dict, repr=False)
+
+    def is_healthy(self, now: float) -> bool:
+        """Backend is in rotation (not cooling down)."""
+        return now >= self.cooldown_until
+
+    def bind(self, tools: list | None, tool_choice: str | None = None) -> Runnable:
+        """Model with ``tools`` bound (memoized per tool list and tool choice)."""
+        if not tools:
+            return self.model
+        key = (*(id(tool) for tool in tools), tool_choice)
+        bound = self._bound.get(key)
+        if bound is None:
+            bound = self._bound[key] = bind_tools(self.model, tools, tool_choice)
+        return bound
+
+
+def _retry_after(error: Exception) -> float | None:
+    """Seconds from a 429 response's Retry-After header, if present."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class BackendPool:
+    """
+    Pool of chat model backends with routing, health tracking and failover.
+
+    A backend answering 429 is removed from rotation for its Retry-After
+    (at least ``rate_limit_cooldown``); one failing ``failure_threshold``
+    times in a row is removed for ``error_cooldown``. When every backend
+    is cooling down, the one that recovers first is still tried.
+    """
+
+    def __init__(
+        self,
+        backends: Iterable[LLMBackend],
+        strategy: RoutingStrategy = RoutingStrategy.LEAST_LATENCY,
+        failure_threshold: int = 2,
+        error_cooldown: float = 30.0,
+        rate_limit_cooldown: float = 60.0,
+        latency_alpha: float = 0.2,
+    ) -> None:
+        """
+        Initialize pool.
+
+        Args:
+            backends: Backends in priority order (first is the default route)
+            strategy: Routing strategy
+            failure_threshold: Consecutive errors before a backend cools down
+            error_cooldown: Seconds an erroring backend stays out of rotation
+            rate_limit_cooldown: Minimum seconds a rate-limited backend stays out
+            latency_alpha: EWMA smoothing factor for backend latency
+        """
+        self.backends = list(backends)
+        if not self.backends:
+            raise ValueError("BackendPool needs at least one backend")
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.error_cooldown = error_cooldown
+        self.rate_limit_cooldown = rate_limit_cooldown
+        self.latency_alpha = latency_alpha
+        self._failovers = 0
+
+    def __len__(self) -> int:
+        return len(self.backends)
+
+    def choose(self, exclude: set[str] | None = None) -> LLMBackend | None:
+        """
+        Pick a backend for the next call.
+
+        Args:
+            exclude: Backend names not to pick (already tried for this call)
+
+        Returns:
+            Selected backend, or None if every backend is excluded
+        """
+        candidates = [b for b in self.backends if not exclude or b.name not in exclude]
+        if not candidates:
+            return None
+
+        now = time.monotonic()
+        healthy = [b for b in candidates if b.is_healthy(now)]
+        if not healthy:
+            # Everything is cooling down: try the one that recovers first
+            return min(candidates, key=lambda b: b.cooldown_until)
+
+        if self.strategy == RoutingStrategy.WEIGHTED:
+            return random.choices(healthy, weights=[max(b.weight, 0.0) or 1e-9 for b in healthy])[0]
+
+        untried = [b for b in healthy if b.ewma_latency is None]
+        if untried:
+            return untried[0]
+        return min(healthy, key=lambda b: b.ewma_latency or 0.0)
+
+    async def ainvoke(
+        self,
+        messages: list[Any],
+        tools: list | None = None,
+        exclude: set[str] | None = None,
+        tool_choice: str | None = None,
+    ) -> BaseMessage:
+        """
+        Call a backend, failing over to the others on error.
+
+        Args:
+            messages: Chat messages
+            tools: Tools to bind for function calling
+            exclude: Backend names this call must not use; names tried here are added
+            tool_choice: OpenAI ``tool_choice`` for the bound tools (None: model decides)
+
+        Returns:
+            Model response message
+
+        Raises:
+            Exception: Last backend error when every backend failed
+        """
+        tried = exclude if exclude is not None else set()
+        error: Exception | None = None
+
+        while (backend := self.choose(tried)) is not None:
+            tried.add(backend.name)
+            if error is not None:
+                self._failovers += 1
+                logger.warning(f"LLM failover to '{backend.name}' after: {error!r}")
+
+            start = time.monotonic()
+            try:
+                response = await backend.bind(tools, tool_choice).ainvoke(messages)
+            except Exception as e:
+                self._record_failure(backend, e)
+                error = e
+                continue
+
+            self._record_success(backend, time.monotonic() - start)
+            return response
+
+        if error is None:
+            raise RuntimeError("No LLM backend left to try")
+        raise error
+
+    async def astream(
+        self,
+        messages: list[Any],
+        tools: list | None = None,
+        tool_choice: str | None = None,
+    ) -> AsyncIterator[BaseMessageChunk]:
+        """
+        Stream from a backend, failing over to the others until the first chunk arrives.
+
+        Args:
+            messages: Chat messages
+            tools: Tools to bind for function calling
+            tool_choice: OpenAI ``tool_choice`` for the bound tools (None: model decides)
+
+        Yields:
+            Message chunks
+
+        Raises:
+            Exception: Last backend error when every backend failed before streaming
+        """
+        tried: set[str] = set()
+        error: Exception | None = None
+
+        while (backend := self.choose(tried)) is not None:
+            tried.add(backend.name)
+            if error is not None:
+                self._failovers += 1
+                logger.warning(f"LLM failover to '{backend.name}' after: {error!r}")
+
+            start = time.monotonic()
+            stream = backend.bind(tools, tool_choice).astream(messages)
+            try:
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                self._record_success(backend, time.monotonic() - start)
+                return
+            except Exception as e:
+                self._record_failure(backend, e)
+                error = e
+                await stream.aclose()
+                continue
+
+            try:
+                yield first
+                async for chunk in stream:
+                    yield chunk
+            except Exception as e:
+                # Mid-stream failure: tokens were already sent, can't fail over
+                self._record_failure(backend, e)
+                raise
+            finally:
+                await stream.aclose()
+            self._record_success(backend, time.monotonic() - start)
+            return
+
+        if error is None:
+            raise RuntimeError("No LLM backend left to try")
+        raise error
+
+    def _record_success(self, backend: LLMBackend, latency: float) -> None:
+        backend.successes += 1
+        backend.consecutive_failures = 0
+        backend.cooldown_until = 0.0
+        if backend.ewma_latency is None:
+            backend.ewma_latency = latency
+        else:
+            a = self.latency_alpha
+            backend.ewma_latency = a * latency + (1 - a) * backend.ewma_latency
+
+    def _record_failure(self, backend: LLMBackend, error: Exception) -> None:
+        backend.failures += 1
+        backend.consecutive_failures += 1
+        now = time.monotonic()
+
+        if isinstance(error, openai.RateLimitError):
+            backend.rate_limited += 1
+            cooldown = max(self.rate_limit_cooldown, _retry_after(error) or 0.0)
+            backend.cooldown_until = now + cooldown
+            logger.warning(f"LLM backend '{backend.name}' rate limited, cooling down {cooldown:g}s")
+        elif backend.consecutive_failures >= self.failure_threshold:
+            backend.cooldown_until = now + self.error_cooldown
+            logger.warning(
+                f"LLM backend '{backend.name}' failed {backend.consecutive_failures} times, "
+                f"cooling down {self.error_cooldown:g}s"
+            )
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get routing and per-backend health counters.
+
+        Returns:
+            Dict with strategy, failovers and one entry per backend
+        """
+        now = time.monotonic()
+        return {
+            "strategy": self.strategy.value,
+            "failovers": self._failovers,
+            "backends": {
+                b.name: {
+                    "healthy": b.is_healthy(now),
+                    "cooldown_remaining_s": max(0.0, b.cooldown_until - now),
+                    "weight": b.weight,
+                    "latency_ewma_ms": b.ewma_latency * 1000 if b.ewma_latency is not None else None,
+                    "successes": b.successes,
+                    "failures": b.failures,
+                    "rate_limited": b.rate_limited,
+                }
+                for b in self.backends
+            },
+        }
+
+
+class PooledRoute:
+    """
+    Runnable-like view of the pool for one logical call.
+
+    The primary and the hedged request of the same call share ``tried``
+    so the hedge goes to a different backend than the primary.
+    """
+
+    def __init__(
+        self,
+        pool: BackendPool,
+        tools: list | None,
+        tried: set[str],
+        tool_choice: str | None = None,
+    ) -> None:
+        self.pool = pool
+        self.tools = tools
+        self.tried = tried
+        self.tool_choice = tool_choice
+
+    async def ainvoke(self, messages: list[Any]) -> BaseMessage:
+        return await self.pool.ainvoke(
+            messages, tools=self.tools, exclude=self.tried, tool_choice=self.tool_choice
+        )
@@ -0,0 +1,120 @@
+"""
+Prompt templates for Business Backend LLM calls.
+
+Every prompt is laid out as a static prefix (tool definitions, system
+instructions, and for chat the conversation history, which only grows
+at the end) followed by the variable sections of the current turn
+(retrieved inventory, vision data, candidate tables). Nothing request
+specific is interpolated into a system prompt, so provider-side prompt
+caching can reuse the prefix across requests and turns.
+"""
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+SEARCH_SYSTEM_PROMPT = """You are a helpful inventory assistant. You help users find products and check stock availability.
+
+When a user asks about products or stock, use the product_search tool to find information in the database.
+
+Always provide clear, concise answers about:
+- Whether the product exists
+- How many units are available
+- The product's stock status (In Stock, Low Stock, Out of Stock)
+- Price and supplier information when relevant
+
+If no products are found, let the user know politely and suggest they try a different search term.
+
+Respond in the same language as the user's query."""
+
+PREFETCH_SYSTEM_PROMPT = """You are a helpful inventory assistant. You help users find products and check stock availability.
+
+The user's message includes a table of CANDIDATE PRODUCTS retrieved from the inventory database for their query.
+Answer ONLY from that table. Never invent products that are not listed.
+
+Always provide clear, concise answers about:
+- Whether the product exists
+- How many units are available
+- The product's stock status (In Stock, Low Stock, Out of Stock)
+- Price and supplier information when relevant
+
+If the table is empty or nothing in it matches, let the user know politely and suggest they try a different search term.
+
+Respond in the same language as the user's query."""
+
+SALES_AGENT_SYSTEM_PROMPT = """Eres 'TecnoBot', asesor de ventas de TecnoCuenca.
+
+SITUACIÓN:
+- Somos una tienda pequeña y exclusiva con stock limitado.
+- SOLO vendemos los productos listados en la sección [INVENTARIO REAL] que acompaña el último mensaje del usuario.
+
+REGLAS DE ORO (Si las rompes, fallas tu misión):
+1. SOLO menciona productos del INVENTARIO REAL (No alucines otros modelos). Si el usuario pide algo que no está (ej: HP, Dell), di "Lo siento, solo manejamos [Marcas disponibles]".
+2. SÉ BREVE: Máximo 10 oraciones. Respuestas cortas y directas.
+3. NO hagas listas largas. Di: "Tenemos la [Marca Modelo] a $[Precio]..."
+4. Si te preguntan "qué tienes", resume: "Actualmente contamos con opciones de [Marca 1] y [Marca 2]..." (Solo lo real).
+
+ESTILO:
+- Amigable, corto y útil."""
+
+SALES_AGENT_TOOLS_SYSTEM_PROMPT = """Eres 'TecnoBot', asesor de ventas de TecnoCuenca.
+
+SITUACIÓN:
+- Somos una tienda pequeña y exclusiva con stock limitado.
+- La sección [CATÁLOGO] que acompaña el último mensaje del usuario lista las marcas que manejamos (sin precios ni stock).
+- Para modelos, precios o stock, consulta el inventario con la herramienta product_search ANTES de responder. Si el usuario comparte una imagen, usa image_recognition.
+
+REGLAS DE ORO (Si las rompes, fallas tu misión):
+1. SOLO menciona productos devueltos por product_search (No alucines otros modelos). Si el usuario pide algo que no está (ej: HP, Dell), di "Lo siento, solo manejamos [Marcas disponibles]".
+2. SÉ BREVE: Máximo 10 oraciones. Respuestas cortas y directas.
+3. NO hagas listas largas. Di: "Tenemos la [Marca Modelo] a $[Precio]..."
+4. Si te preguntan "qué tienes", resume: "Actualmente contamos con opciones de [Marca 1] y [Marca 2]..." (Solo lo real).
+
+ESTILO:
+- Amigable, corto y útil."""
+
+
+def context_section(title: str, body: str) -> str:
+    """Render a variable prompt section as ``[TITLE]`` followed by its body."""
+    return f"[{title}]\n{body}"
+
+
+def build_chat_messages(
+    system_prompt: str,
+    history: list[dict],
+    sections: list[str],
+    summary: str = "",
+) -> list[BaseMessage]:
+    """
+    Assemble chat messages as static prefix + variable tail.
+
+    The history is kept verbatim (so earlier turns form a stable prefix
+    across turns); the variable sections are appended to the latest
+    user turn only. A summary of older, truncated turns goes right
+    after the system prompt (it only changes when history is compacted).
+
+    Args:
+        system_prompt: Static system instructions
+        history: Messages as {'role': 'user'|'assistant', 'content': '...'}
+        sections: Variable sections for this turn (see ``context_section``)
+        summary: Summary of earlier turns no longer in ``history``
+
+    Returns:
+        LangChain messages
+    """
+    messages: list[BaseMessage] = [SystemMessage(content=system_prompt)]
+    if summary:
+        messages.append(SystemMessage(content=context_section("RESUMEN DE LA CONVERSACIÓN", summary)))
+    for msg in history:
+        if msg["role"] == "user":
+            messages.append(HumanMessage(content=msg["content"]))
+        else:
+            messages.append(AIMessage(content=msg["content"]))
+
+    tail = "\n\n".join(section for section in sections if section)
+    if not tail:
+        return messages
+
+    if history and history[-1]["role"] == "user":
+        messages[-1] = HumanMessage(content=f"{history[-1]['content']}\n\n{tail}")
+    else:
+        messages.append(HumanMessage(content=tail))
+    return messages
@@ -1,31 +1,63 @@
 """
 LLM Provider for Business Backend.
 
-Simple OpenAI provider using LangChain for tool calling.
+OpenAI-compatible chat backends (Groq, OpenAI, local server) using
+LangChain for tool calling, pooled behind shared keep-alive HTTP clients.
 """
 
+from collections.abc import AsyncIterator
+from contextlib import AbstractContextManager, nullcontext
+from functools import partial
+from typing import Any
+
+import httpx
+import openai
 from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, BaseMessageChunk
+from langchain_core.runnables import Runnable
 from langchain_openai import ChatOpenAI
 
 from business_backend.config import get_business_settings
+from business_backend.llm.pool import BackendPool, LLMBackend, PooledRoute, RoutingStrategy, bind_tools
+from business_backend.llm.resilience import ResilienceConfig, ResilientInvoker
+from business_backend.llm.usage import LLMUsageTracker, TokenPrices, TokenUsage
 
 
 class LLMProvider:
     """Provider for LLM interactions using LangChain."""
 
-    def __init__(self, model: BaseChatModel) -> None:
+    def __init__(
+        self,
+        model: BaseChatModel,
+        invoker: ResilientInvoker | None = None,
+        pool: BackendPool | None = None,
+        usage: LLMUsageTracker | None = None,
+    ) -> None:
         """
         Initialize LLM Provider.
 
         Args:
-            model: LangChain chat model instance
+            model: LangChain chat model instance (the pool's default backend, if pooled)
+            invoker: Resilience layer (deadline, hedging, circuit breaker); None calls directly
+            pool: Backend pool with routing and failover; None uses ``model`` only
+            usage: Token/prompt-cache tracker attached to the models' callbacks
         """
         self.model = model
+        self.invoker = invoker
+        self.pool = pool
+        self.usage = usage
+        self._bound: dict[tuple[Any, ...], Runnable] = {}
 
     def get_model(self) -> BaseChatModel:
         """Get the underlying LangChain model."""
         return self.model
 
+    def get_models(self) -> list[BaseChatModel]:
+        """Get every backend model (just ``model`` when not pooled)."""
+        if self.pool is None:
+            return [self.model]
+        return [backend.model for backend in self.pool.backends]
+
     def bind_tools(self, tools: list) -> BaseChatModel:
         """
         Bind tools to the model for function calling.
@@ -38,6 +70,175 @@ class LLMProvider:
         """
         return self.model.bind_tools(tools)
 
+    def is_available(self) -> bool:
+        """False while the resilience layer short-circuits calls (provider degraded)."""
+        return self.invoker is None or self.invoker.is_available()
+
+    async def ainvoke(
+        self,
+        messages: list[Any],
+        tools: list | None = None,
+        tool_choice: str | None = None,
+    ) -> BaseMessage:
+        """
+        Invoke the model through the backend pool and the resilience layer.
+
+        Args:
+            messages: Chat messages
+            tools: Tools to bind for function calling
+            tool_choice: OpenAI ``tool_choice`` for the bound tools ("none" forbids calls)
+
+        Returns:
+            Model response message
+
+        Raises:
+            LLMUnavailableError: Provider degraded or call exceeded its budget
+        """
+        primary, secondary = self._routes_for(tools, tool_choice)
+        if self.invoker is None:
+            return await primary.ainvoke(messages)
+        return await self.invoker.invoke(primary, messages, secondary)
+
+    def astream(
+        self,
+        messages: list[Any],
+        tools: list | None = None,
+        tool_choice: str | None = None,
+    ) -> AsyncIterator[BaseMessageChunk]:
+        """
+        Stream the model's reply through the backend pool and the resilience layer.
+
+        Failover happens only before the first chunk; the deadline bounds
+        the time to the first chunk. Closing the iterator aborts the
+        upstream HTTP request.
+
+        Args:
+            messages: Chat messages
+            tools: Tools to bind for function calling
+            tool_choice: OpenAI ``tool_choice`` for the bound tools ("none" forbids calls)
+
+        Returns:
+            Async iterator of message chunks
+
+        Raises:
+            LLMUnavailableError: Provider degraded or no first chunk within the deadline
+        """
+        if self.pool is not None:
+            open_stream = partial(self.pool.astream, messages, tools=tools, tool_choice=tool_choice)
+        else:
+            route, _ = self._routes_for(tools, tool_choice)
+            open_stream = partial(route.astream, messages)
+
+        if self.invoker is None:
+            return open_stream()
+        return self.invoker.stream(open_stream)
+
+    def track_request(self) -> AbstractContextManager[TokenUsage | None]:
+        """
+        Attribute the LLM calls made inside the block to one request.
+
+        Returns:
+            Context manager yielding the request's token usage (None without a tracker)
+        """
+        return self.usage.request_scope() if self.usage else nullcontext()
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get resilience, backend routing and token usage counters.
+
+        Returns:
+            Dict with resilience, pool and usage stats (None where not configured)
+        """
+        return {
+            "resilience": self.invoker.get_stats() if self.invoker else None,
+            "pool": self.pool.get_stats() if self.pool else None,
+            "usage": self.usage.get_stats() if self.usage else None,
+        }
+
+    def _routes_for(self, tools: list | None, tool_choice: str | None = None) -> tuple[Any, Any]:
+        """Primary route and hedge route (None without a second backend) for one call."""
+        if self.pool is not None:
+            # Shared per call: the hedge never lands on the backend the primary is using
+            tried: set[str] = set()
+            secondary = PooledRoute(self.pool, tools, tried, tool_choice) if len(self.pool) > 1 else None
+            return PooledRoute(self.pool, tools, tried, tool_choice), secondary
+
+        if not tools:
+            return self.model, None
+        key = (*(id(tool) for tool in tools), tool_choice)
+        bound = self._bound.get(key)
+        if bound is None:
+            bound = self._bound[key] = bind_tools(self.model, tools, tool_choice)
+        return bound, None
+
+
+def chunk_to_message(chunk: BaseMessageChunk | None) -> AIMessage:
+    """
+    Turn the sum of a stream's chunks into a complete assistant message.
+
+    Keeps the raw ``tool_calls`` in ``additional_kwargs`` (needed to send
+    the message back with the tool results) and the parsed ``tool_calls``.
+
+    Args:
+        chunk: Chunks merged with ``+`` (None for an empty stream)
+
+    Returns:
+        AIMessage with content and tool calls
+    """
+    if chunk is None:
+        return AIMessage(content="")
+    tool_calls = getattr(chunk, "tool_calls", None) or []
+    if tool_calls:
+        return AIMessage(
+            content=chunk.content, additional_kwargs=chunk.additional_kwargs, tool_calls=tool_calls
+        )
+    # Parses additional_kwargs['tool_calls'] into tool_calls, if any
+    return AIMessage(content=chunk.content, additional_kwargs=chunk.additional_kwargs)
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create the keep-alive HTTP client shared by all LLM backends.
+
+    Returns:
+        httpx.AsyncClient with pool limits and timeouts from settings
+    """
+    settings = get_business_settings()
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.llm_http_max_connections,
+            max_keepalive_connections=settings.llm_http_max_keepalive_connections,
+            keepalive_expiry=settings.llm_http_keepalive_expiry_seconds,
+        ),
+        timeout=httpx.Timeout(settings.llm_http_timeout_seconds, connect=5.0),
+    )
+
+
+def _chat_model(
+    http_client: httpx.AsyncClient,
+    usage: LLMUsageTracker,
+    api_key: str,
+    model: str,
+    base_url: str | None = None,
+    **kwargs: Any,
+) -> ChatOpenAI:
+    """ChatOpenAI on the shared HTTP client with usage tracking; SDK retries off (the pool fails over)."""
+    async_client = openai.AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        max_retries=0,
+        http_client=http_client,
+    ).chat.completions
+    return ChatOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        model=model,
+        max_retries=0,
+        async_client=async_client,
+        callbacks=[usage],
+        **kwargs,
+    )
+
 
 def create_llm_provider() -> LLMProvider | None:
     """
@@ -51,26 +252,76 @@ def create_llm_provider() -> LLMProvider | None:
     if not settings.llm_enabled:
         return None
 
-    # Priority: GROQ (Open Source models) > OpenAI
+    http_client = create_http_client()
+    usage = LLMUsageTracker(
+        TokenPrices(
+            prompt=settings.llm_price_prompt_per_mtok,
+            cached=settings.llm_price_cached_per_mtok,
+            completion=settings.llm_price_completion_per_mtok,
+        )
+    )
+    weights = settings.llm_backend_weights
+    backends: list[LLMBackend] = []
+
+    # Priority: GROQ (Open Source models) > OpenAI > local server
     if settings.groq_api_key:
         # Using LangChain with Groq via OpenAI compatibility layer
         # This satisfies the requirement of using Open Source models (Llama/Mistral)
-        model = ChatOpenAI(
+        model = _chat_model(
+            http_client,
+            usage,
             api_key=settings.groq_api_key,
             base_url="https://api.groq.com/openai/v1",
             model=settings.groq_model,
             temperature=0.6,
             max_tokens=settings.openai_max_tokens,
         )
-        return LLMProvider(model)
+        backends.append(LLMBackend("groq", model, weight=weights.get("groq", 1.0)))
 
     if settings.openai_api_key:
-        model = ChatOpenAI(
+        model = _chat_model(
+            http_client,
+            usage,
             api_key=settings.openai_api_key,
             model=settings.openai_model,
             max_tokens=settings.openai_max_tokens,
             temperature=0,
         )
-        return LLMProvider(model)
+        backends.append(LLMBackend("openai", model, weight=weights.get("openai", 1.0)))
 
-    return None
+    if settings.local_llm_base_url:
+        # Any OpenAI-compatible server (vLLM, llama.cpp, Ollama)
+        model = _chat_model(
+            http_client,
+            usage,
+            api_key=settings.local_llm_api_key,
+            base_url=settings.local_llm_base_url,
+            model=settings.local_llm_model,
+            max_tokens=settings.openai_max_tokens,
+            temperature=0,
+        )
+        backends.append(LLMBackend("local", model, weight=weights.get("local", 1.0)))
+
+    if not backends:
+        return None
+
+    pool = BackendPool(
+        backends,
+        strategy=RoutingStrategy(settings.llm_routing),
+        failure_threshold=settings.llm_backend_failure_threshold,
+        error_cooldown=settings.llm_backend_cooldown_seconds,
+        rate_limit_cooldown=settings.llm_rate_limit_cooldown_seconds,
+    )
+    invoker = ResilientInvoker(
+        ResilienceConfig(
+            deadline_seconds=settings.llm_deadline_seconds,
+            hedge_enabled=settings.llm_hedge_enabled,
+            hedge_percentile=settings.llm_hedge_percentile,
+            hedge_min_delay_seconds=settings.llm_hedge_min_delay_seconds,
+            max_concurrency=settings.llm_max_concurrency,
+            queue_timeout_seconds=settings.llm_queue_timeout_seconds,
+            breaker_failure_threshold=settings.llm_breaker_failure_threshold,
+            breaker_reset_seconds=settings.llm_breaker_reset_seconds,
+        )
+    )
+    return LLMProvider(backends[0].model, invoker=invoker, pool=pool, usage=usage)
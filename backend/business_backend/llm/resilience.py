@@ -0,0 +1,382 @@
+"""
+LLM Resilience Layer.
+
+Bounds tail latency of LLM calls:
+- Per-call deadline
+- Optional hedged request to a secondary model after a p95-based delay
+- Circuit breaker that short-circuits calls while the provider is degraded
+- Concurrency cap with bounded queueing
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, TypeVar
+
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable
+from loguru import logger
+
+from business_backend.shared.latency import LatencyWindow
+
+T = TypeVar("T")
+
+class LLMUnavailableError(RuntimeError):
+    """LLM can't answer within budget (circuit open, deadline exceeded or queue full)."""
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"  # Normal operation
+    OPEN = "open"  # Failing: calls short-circuit
+    HALF_OPEN = "half_open"  # Probing: one call allowed through
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after ``failure_threshold`` consecutive failures; after
+    ``reset_timeout`` seconds one probe call is let through and its
+    outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """
+        Initialize breaker (closed).
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to wait before probing again
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state."""
+        return self._state
+
+    def ready_for_probe(self) -> bool:
+        """Whether an open circuit has waited ``reset_timeout`` and would let a probe through."""
+        return self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now."""
+        if self._state == CircuitState.CLOSED:
+            return True
+        if self._state == CircuitState.OPEN:
+            if not self.ready_for_probe():
+                return False
+            self._state = CircuitState.HALF_OPEN
+            self.release_probe()
+        # Half-open: a single probe at a time
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def release_probe(self) -> None:
+        """Give back the probe slot of a call that ended without an outcome (rejected or cancelled)."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        if self._state != CircuitState.CLOSED:
+            logger.info("LLM circuit closed")
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure; open the circuit at the threshold or on a failed probe."""
+        self._failures += 1
+        self._probe_in_flight = False
+        if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != CircuitState.OPEN:
+                logger.warning(f"LLM circuit opened after {self._failures} failure(s)")
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+
+@dataclass
+class ResilienceConfig:
+    """Tunables for ResilientInvoker."""
+
+    deadline_seconds: float = 20.0
+    hedge_enabled: bool = True
+    hedge_percentile: float = 95.0
+    hedge_min_delay_seconds: float = 0.5
+    hedge_min_samples: int = 20  # Below this, hedge after hedge_initial_delay_seconds
+    hedge_initial_delay_seconds: float = 3.0
+    max_concurrency: int = 16
+    queue_timeout_seconds: float = 5.0
+    breaker_failure_threshold: int = 5
+    breaker_reset_seconds: float = 30.0
+
+
+class ResilientInvoker:
+    """
+    Runs LLM calls with deadline, hedging, circuit breaking and a concurrency cap.
+
+    Raises LLMUnavailableError when the call can't be served in budget,
+    so callers can switch to a local fallback right away.
+    """
+
+    def __init__(self, config: ResilienceConfig | None = None) -> None:
+        """
+        Initialize invoker.
+
+        Args:
+            config: Resilience tunables
+        """
+        self.config = config or ResilienceConfig()
+        self.breaker = CircuitBreaker(
+            failure_threshold=self.config.breaker_failure_threshold,
+            reset_timeout=self.config.breaker_reset_seconds,
+        )
+        self.latencies = LatencyWindow()
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        self._waiting = 0
+
+        self._calls = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._deadline_exceeded = 0
+        self._short_circuited = 0
+        self._rejected = 0
+        self._failures = 0
+
+    def is_available(self) -> bool:
+        """False while the circuit is open (calls would short-circuit)."""
+        return self.breaker.state != CircuitState.OPEN or self.breaker.ready_for_probe()
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait on the primary before sending the hedged request."""
+        if len(self.latencies) < self.config.hedge_min_samples:
+            return self.config.hedge_initial_delay_seconds
+        p = self.latencies.percentile(self.config.hedge_percentile) or 0.0
+        return max(self.config.hedge_min_delay_seconds, p)
+
+    async def invoke(
+        self,
+        primary: Runnable,
+        messages: list[Any],
+        secondary: Runnable | None = None,
+    ) -> BaseMessage:
+        """
+        Invoke ``primary`` (hedged with ``secondary``) within the deadline.
+
+        Args:
+            primary: Model (optionally with tools bound) to call
+            messages: Chat messages
+            secondary: Optional model on another provider for hedging
+
+        Returns:
+            Model response message
+
+        Raises:
+            LLMUnavailableError: Circuit open, queue wait exhausted or deadline exceeded
+        """
+        if not self.breaker.allow():
+            self._short_circuited += 1
+            raise LLMUnavailableError("LLM circuit open")
+
+        start = time.monotonic()
+        deadline = start + self.config.deadline_seconds
+
+        # Concurrency cap: wait in queue, but never past the deadline
+        queue_budget = min(self.config.queue_timeout_seconds, deadline - time.monotonic())
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=queue_budget)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            self.breaker.release_probe()
+            raise LLMUnavailableError("LLM concurrency limit reached") from None
+        except asyncio.CancelledError:
+            self.breaker.release_probe()
+            raise
+        finally:
+            self._waiting -= 1
+
+        self._calls += 1
+        try:
+            response = await asyncio.wait_for(
+                self._hedged(primary, messages, secondary),
+                timeout=max(0.0, deadline - time.monotonic()),
+            )
+        except asyncio.TimeoutError:
+            self._deadline_exceeded += 1
+            self.breaker.record_failure()
+            raise LLMUnavailableError(
+                f"LLM deadline of {self.config.deadline_seconds:g}s exceeded"
+            ) from None
+        except asyncio.CancelledError:
+            self.breaker.release_probe()
+            raise
+        except Exception:
+            self._failures += 1
+            self.breaker.record_failure()
+            raise
+        finally:
+            self._semaphore.release()
+
+        self.breaker.record_success()
+        self.latencies.record(time.monotonic() - start)
+        return response
+
+    async def stream(self, open_stream: Callable[[], AsyncIterator[T]]) -> AsyncIterator[T]:
+        """
+        Stream a call with circuit breaking, the concurrency cap and a first-chunk deadline.
+
+        Streams are not hedged, and only the time to the first chunk is
+        bounded by the deadline; once tokens flow they are passed through.
+        Closing the returned iterator (client gone) closes the upstream stream.
+
+        Args:
+            open_stream: Zero-argument factory of the upstream chunk iterator
+
+        Yields:
+            Upstream chunks
+
+        Raises:
+            LLMUnavailableError: Circuit open, queue wait exhausted or no first chunk in time
+        """
+        if not self.breaker.allow():
+            self._short_circuited += 1
+            raise LLMUnavailableError("LLM circuit open")
+
+        deadline = time.monotonic() + self.config.deadline_seconds
+        queue_budget = min(self.config.queue_timeout_seconds, deadline - time.monotonic())
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=queue_budget)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            self.breaker.release_probe()
+            raise LLMUnavailableError("LLM concurrency limit reached") from None
+        except asyncio.CancelledError:
+            self.breaker.release_probe()
+            raise
+        finally:
+            self._waiting -= 1
+
+        self._calls += 1
+        iterator = open_stream()
+        recorded = False
+        try:
+            try:
+                first = await asyncio.wait_for(
+                    iterator.__anext__(), timeout=max(0.0, deadline - time.monotonic())
+                )
+            except StopAsyncIteration:
+                recorded = True
+                self.breaker.record_success()
+                return
+            except asyncio.TimeoutError:
+                recorded = True
+                self._deadline_exceeded += 1
+                self.breaker.record_failure()
+                raise LLMUnavailableError(
+                    f"LLM gave no first token within {self.config.deadline_seconds:g}s"
+                ) from None
+            except Exception:
+                recorded = True
+                self._failures += 1
+                self.breaker.record_failure()
+                raise
+
+            yield first
+            while True:
+                # Upstream errors only: exceptions at ``yield`` come from the consumer
+                try:
+                    chunk = await iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+                except Exception:
+                    recorded = True
+                    self._failures += 1
+                    self.breaker.record_failure()
+                    raise
+                yield chunk
+            recorded = True
+            self.breaker.record_success()
+        finally:
+            if not recorded:
+                # Cancelled or closed by the consumer (client gone): no outcome, free the probe slot
+                self.breaker.release_probe()
+            self._semaphore.release()
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def _hedged(
+        self,
+        primary: Runnable,
+        messages: list[Any],
+        secondary: Runnable | None,
+    ) -> BaseMessage:
+        """Call primary; if slow (or failed), race secondary and keep the first success."""
+        primary_task = asyncio.ensure_future(primary.ainvoke(messages))
+        if secondary is None or not self.config.hedge_enabled:
+            return await primary_task
+
+        pending = {primary_task}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_delay())
+            if done and primary_task.exception() is None:
+                return primary_task.result()
+
+            self._hedges += 1
+            if done:
+                logger.debug(f"LLM hedge: primary failed ({primary_task.exception()!r})")
+            else:
+                logger.debug(f"LLM hedge: primary slower than {self.hedge_delay():.2f}s")
+            secondary_task = asyncio.ensure_future(secondary.ainvoke(messages))
+            pending.add(secondary_task)
+
+            error: BaseException | None = primary_task.exception() if done else None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is secondary_task:
+                            self._hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get resilience counters.
+
+        Returns:
+            Dict with call outcomes, hedging, breaker state and latency percentiles
+        """
+        p50 = self.latencies.percentile(50)
+        p95 = self.latencies.percentile(95)
+        return {
+            "calls": self._calls,
+            "failures": self._failures,
+            "deadline_exceeded": self._deadline_exceeded,
+            "short_circuited": self._short_circuited,
+            "rejected": self._rejected,
+            "hedges": self._hedges,
+            "hedge_wins": self._hedge_wins,
+            "circuit_state": self.breaker.state.value,
+            "queue_waiting": self._waiting,
+            "latency_p50_ms": p50 * 1000 if p50 is not None else None,
+            "latency_p95_ms": p95 * 1000 if p95 is not None else None,
+        }
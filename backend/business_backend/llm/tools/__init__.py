@@ -1,8 +1,15 @@
 """LangChain Tools for Business Backend."""
 
+from business_backend.llm.tools.executor import ToolExecutor
 from business_backend.llm.tools.product_search_tool import (
     ProductSearchTool,
+    collect_search_results,
     create_product_search_tool,
 )
 
-__all__ = ["ProductSearchTool", "create_product_search_tool"]
+__all__ = [
+    "ProductSearchTool",
+    "ToolExecutor",
+    "collect_search_results",
+    "create_product_search_tool",
+]
@@ -0,0 +1,153 @@
+"""
+Tool Executor for LangChain tool calls.
+
+Runs the tool calls requested by an LLM response concurrently,
+with a concurrency limit and a per-call timeout. Results are
+returned as ToolMessages in the same order as the tool calls.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool
+from loguru import logger
+
+# Optional hook: return a result string to short-circuit a tool call, or None to run it
+ToolCallResolver = Callable[[dict[str, Any]], Awaitable[str | None]]
+
+
+class ToolExecutor:
+    """
+    Concurrent executor for LLM tool calls.
+
+    Shared by SearchService and AgentService so both get the same
+    concurrency limit, timeout and error handling. The concurrency
+    limit applies per ``execute()`` call (one LLM response), not
+    across requests.
+    """
+
+    def __init__(
+        self,
+        tools: list[BaseTool],
+        max_concurrency: int = 4,
+        timeout: float = 15.0,
+    ) -> None:
+        """
+        Initialize ToolExecutor.
+
+        Args:
+            tools: Tools that can be executed (looked up by name)
+            max_concurrency: Max tool calls of one response running at the same time
+            timeout: Seconds before a single tool call is abandoned (waiting included)
+        """
+        self._tools: dict[str, BaseTool] = {tool.name: tool for tool in tools}
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+        self._calls = 0
+        self._timeouts = 0
+        self._errors = 0
+
+    @property
+    def tools(self) -> list[BaseTool]:
+        """Tools available for binding to a model."""
+        return list(self._tools.values())
+
+    def get_tool(self, name: str) -> BaseTool | None:
+        """Get a tool by name."""
+        return self._tools.get(name)
+
+    async def execute(
+        self,
+        tool_calls: list[dict[str, Any]],
+        resolver: ToolCallResolver | None = None,
+    ) -> list[ToolMessage]:
+        """
+        Execute tool calls concurrently.
+
+        Args:
+            tool_calls: ``AIMessage.tool_calls`` entries (name, args, id)
+            resolver: Optional hook that may answer a call without running the tool
+
+        Returns:
+            One ToolMessage per tool call, in the original order
+        """
+        if not tool_calls:
+            return []
+
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        contents = await asyncio.gather(
+            *(self._execute_one(tool_call, resolver, semaphore) for tool_call in tool_calls)
+        )
+        logger.debug(
+            f"Executed {len(tool_calls)} tool call(s) in "
+            f"{(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+
+        return [
+            ToolMessage(content=content, tool_call_id=tool_call["id"])
+            for tool_call, content in zip(tool_calls, contents)
+        ]
+
+    async def _execute_one(
+        self,
+        tool_call: dict[str, Any],
+        resolver: ToolCallResolver | None,
+        semaphore: asyncio.Semaphore,
+    ) -> str:
+        """Run a single tool call; errors and timeouts become result strings."""
+        name = tool_call["name"]
+        tool = self._tools.get(name)
+        if tool is None:
+            return f"Error: Unknown tool '{name}'"
+
+        self._calls += 1
+        try:
+            # The deadline covers waiting for a slot as well as the call itself
+            return await asyncio.wait_for(
+                self._run(tool, tool_call, resolver, semaphore), timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            logger.warning(f"Tool '{name}' timed out after {self.timeout}s")
+            return f"Error: Tool '{name}' timed out after {self.timeout:.0f} seconds"
+        except Exception as e:
+            self._errors += 1
+            logger.error(f"Tool '{name}' failed: {e}")
+            return f"Error: Tool '{name}' failed: {e}"
+
+    @staticmethod
+    async def _run(
+        tool: BaseTool,
+        tool_call: dict[str, Any],
+        resolver: ToolCallResolver | None,
+        semaphore: asyncio.Semaphore,
+    ) -> str:
+        """Wait for a slot, then resolve the call through the hook or invoke the tool."""
+        async with semaphore:
+            if resolver is not None:
+                resolved = await resolver(tool_call)
+                if resolved is not None:
+                    return resolved
+
+            result = await tool.ainvoke(tool_call["args"])
+            return result if isinstance(result, str) else str(result)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get executor counters.
+
+        Returns:
+            Dict with call, timeout and error counts
+        """
+        return {
+            "calls": self._calls,
+            "timeouts": self._timeouts,
+            "errors": self._errors,
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout,
+        }
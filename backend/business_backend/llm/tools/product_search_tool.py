@@ -5,6 +5,9 @@ This tool allows the LLM to search products in the database.
 Uses ProductService with SQLAlchemy ORM.
 """
 
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any
 
 from langchain_core.tools import BaseTool
@@ -13,6 +16,44 @@ from pydantic import BaseModel, Field
 from business_backend.database.models import ProductStock
 from business_backend.services.product_service import ProductService
 
+# Stock status code -> human readable label
+STOCK_STATUS_LABELS: dict[int, str] = {
+    0: "Out of Stock",
+    1: "In Stock",
+    2: "Low Stock",
+    3: "Overstock",
+}
+
+
+# Per-invocation sink for search results. The tool is a shared singleton, so
+# results must not live on the instance: concurrent requests would read each
+# other's rows. Tasks spawned inside the collecting context (e.g. by
+# asyncio.gather) inherit the same list and append to it.
+_search_results: ContextVar[list[ProductStock] | None] = ContextVar(
+    "product_search_results", default=None
+)
+
+
+@contextmanager
+def collect_search_results() -> Iterator[list[ProductStock]]:
+    """
+    Collect rows returned by product_search calls made within the block.
+
+    Usage:
+        with collect_search_results() as found:
+            await tool_executor.execute(tool_calls)
+        products = found
+
+    Yields:
+        List that receives the rows of every search in this context
+    """
+    bucket: list[ProductStock] = []
+    token = _search_results.set(bucket)
+    try:
+        yield bucket
+    finally:
+        _search_results.reset(token)
+
 
 class ProductSearchInput(BaseModel):
     """Input schema for product search tool."""
@@ -42,8 +83,8 @@ class ProductSearchTool(BaseTool):
     # Service reference (set during initialization)
     product_service: ProductService | None = None
 
-    # Store last search results for the response
-    last_results: list[ProductStock] = []
+    # Maximum rows returned per search
+    result_limit: int = 10
 
     model_config = {"arbitrary_types_allowed": True}
 
@@ -64,10 +105,29 @@ class ProductSearchTool(BaseTool):
         if self.product_service is None:
             return "Error: Product service not configured"
 
-        products = await self.product_service.search_by_name(name=search_term, limit=10)
+        products = await self.product_service.search_by_name(
+            name=search_term, limit=self.result_limit
+        )
+        return self.render_results(search_term, products)
 
-        # Store results for later use
-        self.last_results = products
+    def render_results(self, search_term: str, products: list[ProductStock]) -> str:
+        """
+        Record search results and format them for the LLM.
+
+        Used by ``_arun`` and by callers that already have the rows
+        (e.g. a speculative query that ran ahead of the tool call).
+
+        Args:
+            search_term: Term the results belong to
+            products: Matching products
+
+        Returns:
+            Formatted string with product information
+        """
+        # Hand results to the collecting request, if any
+        bucket = _search_results.get()
+        if bucket is not None:
+            bucket.extend(products)
 
         if not products:
             return f"No products found matching '{search_term}'"
@@ -89,17 +149,7 @@ class ProductSearchTool(BaseTool):
 
     def _get_stock_status_text(self, status: int) -> str:
         """Convert stock status code to text."""
-        status_map = {
-            0: "Out of Stock",
-            1: "In Stock",
-            2: "Low Stock",
-            3: "Overstock",
-        }
-        return status_map.get(status, "Unknown")
-
-    def get_last_results(self) -> list[ProductStock]:
-        """Get the last search results."""
-        return self.last_results
+        return STOCK_STATUS_LABELS.get(status, "Unknown")
 
 
 def create_product_search_tool(product_service: ProductService) -> ProductSearchTool:
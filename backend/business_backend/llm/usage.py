@@ -0,0 +1,216 @@
+"""
+LLM Token and Prompt-Cache Instrumentation.
+
+LangChain callback handler that records, per LLM call, prompt, cached
+and completion tokens and time to first token, aggregated globally,
+per model and per request (cost per request).
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+from loguru import logger
+
+from business_backend.llm.resilience import LatencyWindow
+
+
+@dataclass(frozen=True)
+class TokenPrices:
+    """USD per million tokens (all zero disables cost estimates)."""
+
+    prompt: float = 0.0
+    cached: float = 0.0
+    completion: float = 0.0
+
+    def cost(self, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+        uncached = prompt_tokens - cached_tokens
+        return (
+            uncached * self.prompt + cached_tokens * self.cached + completion_tokens * self.completion
+        ) / 1_000_000
+
+
+@dataclass
+class TokenUsage:
+    """Token counters for a set of LLM calls."""
+
+    calls: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+
+    def add(self, prompt: int, cached: int, completion: int) -> None:
+        self.calls += 1
+        self.prompt_tokens += prompt
+        self.cached_tokens += cached
+        self.completion_tokens += completion
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cache_hit_rate": self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+        }
+
+
+# Usage of the request being served in the current task (see request_scope)
+_request_usage: ContextVar[TokenUsage | None] = ContextVar("llm_request_usage", default=None)
+
+
+def _extract_usage(response: LLMResult) -> tuple[int, int, int]:
+    """(prompt, cached, completion) tokens from an LLM result."""
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage:
+        details = usage.get("prompt_tokens_details") or {}
+        return (
+            usage.get("prompt_tokens") or 0,
+            details.get("cached_tokens") or 0,
+            usage.get("completion_tokens") or 0,
+        )
+
+    # Streaming / newer LangChain: usage travels on the message
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if metadata:
+                details = metadata.get("input_token_details") or {}
+                return (
+                    metadata.get("input_tokens") or 0,
+                    details.get("cache_read") or 0,
+                    metadata.get("output_tokens") or 0,
+                )
+    return 0, 0, 0
+
+
+class LLMUsageTracker(AsyncCallbackHandler):
+    """
+    Records token usage, prompt-cache hits and time to first token.
+
+    Attach to chat models via ``callbacks=[tracker]``. Wrap the handling
+    of one user request in ``request_scope()`` to get per-request totals.
+    """
+
+    def __init__(self, prices: TokenPrices | None = None) -> None:
+        """
+        Initialize tracker.
+
+        Args:
+            prices: Token prices for cost estimates
+        """
+        self.prices = prices or TokenPrices()
+        self.total = TokenUsage()
+        self.by_model: dict[str, TokenUsage] = {}
+        self.ttft = LatencyWindow(size=500)
+        self.latency = LatencyWindow(size=500)
+        self._started: dict[UUID, float] = {}
+        self._first_token: dict[UUID, float] = {}
+        self._errors = 0
+        self._requests = 0
+        self._request_totals = TokenUsage()
+
+    async def on_chat_model_start(
+        self, serialized: dict[str, Any], messages: list[list[Any]], *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._started[run_id] = time.monotonic()
+
+    async def on_llm_start(
+        self, serialized: dict[str, Any], prompts: list[str], *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._started[run_id] = time.monotonic()
+
+    async def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        self._first_token.setdefault(run_id, time.monotonic())
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started.pop(run_id, None)
+        self._first_token.pop(run_id, None)
+        self._errors += 1
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        now = time.monotonic()
+        started = self._started.pop(run_id, now)
+        # Non-streaming calls deliver everything at once: TTFT is the full latency
+        first_token = self._first_token.pop(run_id, now)
+        ttft = first_token - started
+        self.ttft.record(ttft)
+        self.latency.record(now - started)
+
+        prompt, cached, completion = _extract_usage(response)
+        model = (response.llm_output or {}).get("model_name") or "unknown"
+        self.total.add(prompt, cached, completion)
+        self.by_model.setdefault(model, TokenUsage()).add(prompt, cached, completion)
+
+        request_usage = _request_usage.get()
+        if request_usage is not None:
+            request_usage.add(prompt, cached, completion)
+
+        logger.debug(
+            f"LLM call [{model}]: prompt={prompt} cached={cached} completion={completion} "
+            f"ttft={ttft * 1000:.0f}ms total={(now - started) * 1000:.0f}ms"
+        )
+
+    @contextmanager
+    def request_scope(self) -> Iterator[TokenUsage]:
+        """
+        Attribute LLM calls made inside the block to one request.
+
+        Yields:
+            Usage of this request (filled as calls complete)
+        """
+        usage = TokenUsage()
+        token = _request_usage.set(usage)
+        try:
+            yield usage
+        finally:
+            _request_usage.reset(token)
+            self._requests += 1
+            self._request_totals.calls += usage.calls
+            self._request_totals.prompt_tokens += usage.prompt_tokens
+            self._request_totals.cached_tokens += usage.cached_tokens
+            self._request_totals.completion_tokens += usage.completion_tokens
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get token, prompt-cache and TTFT counters.
+
+        Returns:
+            Dict with totals, per-model usage, TTFT percentiles and per-request averages
+        """
+        ttft_p50 = self.ttft.percentile(50)
+        ttft_p95 = self.ttft.percentile(95)
+        latency_p50 = self.latency.percentile(50)
+        requests = self._requests
+        per_request = self._request_totals
+        cost = self.prices.cost(
+            self.total.prompt_tokens, self.total.cached_tokens, self.total.completion_tokens
+        )
+        request_cost = self.prices.cost(
+            per_request.prompt_tokens, per_request.cached_tokens, per_request.completion_tokens
+        )
+        return {
+            **self.total.as_dict(),
+            "errors": self._errors,
+            "ttft_p50_ms": ttft_p50 * 1000 if ttft_p50 is not None else None,
+            "ttft_p95_ms": ttft_p95 * 1000 if ttft_p95 is not None else None,
+            "latency_p50_ms": latency_p50 * 1000 if latency_p50 is not None else None,
+            "estimated_cost_usd": cost,
+            "by_model": {name: usage.as_dict() for name, usage in self.by_model.items()},
+            "requests": {
+                "count": requests,
+                "llm_calls_per_request": per_request.calls / requests if requests else 0.0,
+                "prompt_tokens_per_request": per_request.prompt_tokens / requests if requests else 0.0,
+                "cached_tokens_per_request": per_request.cached_tokens / requests if requests else 0.0,
+                "completion_tokens_per_request": (
+                    per_request.completion_tokens / requests if requests else 0.0
+                ),
+                "cost_usd_per_request": request_cost / requests if requests else 0.0,
+            },
+        }
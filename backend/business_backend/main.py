@@ -15,20 +15,50 @@ Usage:
 """
 
 import argparse
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
 
 import strawberry
 import uvicorn
 from aioinject.ext.strawberry import AioInjectExtension
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 from strawberry.fastapi import GraphQLRouter
 
 from business_backend.api.graphql.queries import BusinessQuery
+from business_backend.api.graphql.subscriptions import BusinessSubscription
 from business_backend.api.rest.endpoints import router as detection_router
 from business_backend.api.rest.computer_endpoints import router as computer_router
 from business_backend.api.rest.chat_endpoints import router as chat_router
+from business_backend.api.rest.metrics_endpoints import router as metrics_router
 from business_backend.container import create_business_container
+from business_backend.ml.models.registry import ModelRegistry
+from business_backend.ml.serving.warmup import ModelWarmup
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Warm up production models in the background; stop the inference pool on shutdown.
+
+    The server accepts requests (and /health) while models load; /ready
+    answers 503 until they are warm.
+    """
+    async with create_business_container().context() as ctx:
+        warmup = await ctx.resolve(ModelWarmup)
+        registry = await ctx.resolve(ModelRegistry)
+    app.state.model_warmup = warmup
+    task = warmup.start()
+    try:
+        yield
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        if registry.executor is not None:
+            registry.executor.shutdown()
 
 
 def create_business_backend_app() -> FastAPI:
@@ -44,6 +74,7 @@ def create_business_backend_app() -> FastAPI:
         version="1.0.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     # Create business_backend's own DI container
@@ -67,6 +98,7 @@ def create_business_backend_app() -> FastAPI:
     # Create GraphQL schema with BusinessQuery as root
     schema = strawberry.Schema(
         query=BusinessQuery,
+        subscription=BusinessSubscription,  # Streaming semantic search over WebSocket
         extensions=[
             AioInjectExtension(container),  # Uses business_backend's container
         ],
@@ -84,6 +116,7 @@ def create_business_backend_app() -> FastAPI:
     app.include_router(detection_router, prefix="/api", tags=["Detection"])
     app.include_router(computer_router, prefix="/api", tags=["Computers"])
     app.include_router(chat_router, prefix="/api", tags=["Chat"])
+    app.include_router(metrics_router, prefix="/api", tags=["Metrics"])
 
     # Health check endpoint
     @app.get("/health")
@@ -95,6 +128,14 @@ def create_business_backend_app() -> FastAPI:
             "version": "1.0.0",
         }
 
+    @app.get("/ready")
+    async def ready(request: Request, response: Response):
+        """Readiness check: 503 until production models are loaded and warm."""
+        warmup: ModelWarmup = request.app.state.model_warmup
+        if not warmup.ready:
+            response.status_code = 503
+        return warmup.get_stats()
+
     @app.get("/")
     async def root():
         """Root endpoint with service information."""
@@ -104,6 +145,7 @@ def create_business_backend_app() -> FastAPI:
             "graphql_endpoint": "/graphql",
             "graphiql_ui": "/graphql (browser)",
             "health_check": "/health",
+            "readiness_check": "/ready",
             "docs": "/docs",
         }
 
@@ -5,10 +5,14 @@ All ML models should inherit from this class to ensure
 consistent interface across different model types.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from business_backend.ml.serving.executor import InferenceExecutor
+
 
 class BaseModel(ABC):
     """
@@ -23,12 +27,15 @@ class BaseModel(ABC):
     # Override in subclass
     model_type: str = "generic"  # image, text, tabular, audio
     input_shape: tuple[int, ...] | None = None
+    batch_size: int = 16  # Inputs per forward pass in predict_batch
 
     def __init__(self) -> None:
         """Initialize model (not loaded yet)."""
         self._model: Any = None
         self._is_loaded: bool = False
         self._model_path: Path | None = None
+        # Where blocking inference runs (set by the registry; None: default thread pool)
+        self.executor: "InferenceExecutor | None" = None
 
     @property
     def is_loaded(self) -> bool:
@@ -63,23 +70,56 @@ class BaseModel(ABC):
         # Here your code for model inference
         pass
 
-    async def predict_batch(self, data_list: list[Any]) -> list[dict[str, Any]]:
+    async def predict_batch(
+        self,
+        data_list: list[Any],
+        batch_size: int | None = None,
+    ) -> list[dict[str, Any]]:
         """
         Run batch inference.
 
+        Models that can run several inputs in one forward pass override
+        this; the default runs ``predict`` concurrently, ``batch_size``
+        inputs at a time.
+
         Args:
             data_list: List of preprocessed inputs
+            batch_size: Inputs per forward pass (defaults to ``self.batch_size``)
 
         Returns:
-            List of prediction dicts
+            List of prediction dicts, in input order
         """
-        # Here your code for batch inference (default: sequential)
-        results = []
-        for data in data_list:
-            result = await self.predict(data)
-            results.append(result)
+        # Here your code for batch inference (default: concurrent single predictions)
+        size = batch_size or self.batch_size
+        results: list[dict[str, Any]] = []
+        for start in range(0, len(data_list), size):
+            chunk = data_list[start:start + size]
+            results.extend(await asyncio.gather(*(self.predict(data) for data in chunk)))
         return results
 
+    async def warmup(self, resolutions: list[tuple[int, int]], runs: int = 1) -> None:
+        """
+        Run forward passes on synthetic inputs so the first request is fast.
+
+        Called once after ``load`` at startup. Models with per-shape setup
+        costs override this; the default does nothing.
+
+        Args:
+            resolutions: (width, height) of the inputs to warm up with
+            runs: Passes per resolution
+        """
+        # Here your code for warmup passes
+        return None
+
+    def memory_footprint(self) -> int | None:
+        """
+        Estimate the memory held by the loaded model.
+
+        Returns:
+            Bytes, or None if unknown (the registry then uses the weights' size on disk)
+        """
+        return None
+
     async def unload(self) -> None:
         """Release model from memory."""
         # Here your code for releasing model resources
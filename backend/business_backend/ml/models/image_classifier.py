@@ -2,15 +2,20 @@
 Image Classifier Model.
 
 Example implementation of BaseModel for image classification.
-Supports Keras/TensorFlow, PyTorch and YOLO models.
+Runs Ultralytics YOLO detection models on PyTorch (.pt) or ONNX
+Runtime (.onnx), selected by the weights file extension.
 """
 
-from typing import Any
+import asyncio
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar
 from pathlib import Path
 import random
 from loguru import logger
 
 from business_backend.ml.models.base import BaseModel
+from business_backend.ml.serving.executor import ExecutorKind
 
 try:
     from ultralytics import YOLO
@@ -18,18 +23,21 @@ try:
 except ImportError:
     ULTRALYTICS_AVAILABLE = False
 
+# Minimum detection confidence (YOLO's default is 0.25)
+YOLO_CONFIDENCE = 0.40
+
+T = TypeVar("T")
+
 
 class ImageClassifier(BaseModel):
     """
     Image classification model wrapper.
 
     Supports loading models from:
-    - YOLO (.pt)
-    - Keras H5 format (.h5)
-    - Keras JSON + weights (model.json + weights.h5)
-    - TensorFlow SavedModel format (directory)
-    - PyTorch (.pt, .pth)
-    - ONNX (.onnx)
+    - YOLO PyTorch weights (.pt), run by Ultralytics
+    - YOLO ONNX export (.onnx, see ``ml.training.export.export_onnx``),
+      run by ONNX Runtime with Ultralytics' letterbox, NMS and result parsing
+      (outputs close to the PyTorch ones, not bit-identical)
     """
 
     model_type: str = "image"
@@ -40,6 +48,10 @@ class ImageClassifier(BaseModel):
         super().__init__()
         self._class_labels: list[str] = []
         self.model = None
+        # PROCESS executor: the model lives only in the workers, keyed by file stamp
+        self._weights_stamp: tuple[int, int] | None = None
+        # One forward pass at a time per model, whatever the executor's thread count
+        self._lock = threading.Lock()
 
     async def load(self, path: str | Path) -> None:
         """
@@ -68,10 +80,21 @@ class ImageClassifier(BaseModel):
                  # Raise error or fallback? Let's raise to be clear
                  raise FileNotFoundError(f"Model file not found: {self.loading_path}")
 
+            if self.executor is not None and self.executor.kind == ExecutorKind.PROCESS:
+                # No copy in the serving process: a worker loads it (and fails here if it can't)
+                self._weights_stamp = _weights_stamp(self.loading_path)
+                logger.info(f"🚀 Initializing YOLO model from {self.loading_path} in a worker process...")
+                await self.executor.run(
+                    _load_in_worker, self.loading_path, self._weights_stamp, self._runtime_threads()
+                )
+                self._is_loaded = True
+                logger.info(f"✅ YOLO model loaded successfully ({_runtime(self.loading_path)}, process workers).")
+                return
+
             logger.info(f"🚀 Initializing YOLO model from {self.loading_path}...")
-            self.model = YOLO(self.loading_path)
+            self.model = await asyncio.to_thread(_load_model, self.loading_path, self._runtime_threads())
             self._is_loaded = True
-            logger.info("✅ YOLO model loaded successfully.")
+            logger.info(f"✅ YOLO model loaded successfully ({_runtime(self.loading_path)}).")
         except Exception as e:
             logger.exception(f"❌ Failed to load YOLO model: {e}")
             raise e
@@ -90,81 +113,37 @@ class ImageClassifier(BaseModel):
             raise RuntimeError("Model not loaded")
 
         # Use Real Model if loaded
-        if self.model is not None:
-            logger.info(f"🔮 Running YOLO prediction on {data}")
+        if self._has_model():
+            logger.info(f"🔮 Running YOLO prediction on {_describe(data)}")
             return await self._predict_yolo(data)
             
         # Fallback to Mock
-        logger.warning(f"⚠️ YOLO model not active. Using Mock prediction for {data}")
+        logger.warning(f"⚠️ YOLO model not active. Using Mock prediction for {_describe(data)}")
         return await self._predict_mock(data)
 
     async def _predict_yolo(self, data: Any) -> dict[str, Any]:
-        """Real YOLO inference."""
+        """Real YOLO inference, run off the event loop."""
         try:
-            logger.info(f"Running YOLO inference on: {data}")
-            
-            # Run inference
-            # YOLO accepts file paths (str), PIL, numpy.
-            # conf=0.40 sets the minimum confidence threshold (Default is 0.25)
-            results = self.model(data, verbose=False, conf=0.40)
-            
-            if not results:
-                 logger.warning("No results returned from YOLO")
-                 return self._empty_result()
+            logger.info(f"Running YOLO inference on: {_describe(data)}")
 
-            result = results[0] # First image
-            
-            if not getattr(result, 'boxes', None) or len(result.boxes) == 0:
-                 logger.info("No objects detected in image.")
-                 return {
-                    "prediction": "No Product Detected",
-                    "confidence": 0.0,
-                    "class_id": -1,
-                    "metadata": {"message": "No objects found"}
-                 }
-            
-            # Find index of max confidence
-            top_idx = result.boxes.conf.argmax().item()
-            
-            class_id = int(result.boxes.cls[top_idx].item())
-            confidence = float(result.boxes.conf[top_idx].item())
-            class_name = result.names[class_id]
-            
-            # --- MODELO CUSTOM CARGADO (train7) ---
-            # El modelo ya detecta las clases específicas, no necesitamos simular nada.
-            logger.info(f"Detected Custom Class: {class_name} ({confidence:.2f})")
-            
-            # Mapeo de seguridad por si los nombres del dataset difieren ligeramente del inventario
-            # Aunque idealmente deberían coincidir
-            
-            return {
-                "prediction": class_name,
-                "confidence": confidence,
-                "class_id": class_id,
-                "metadata": {
-                    "model_version": "yolo-v11",
-                    "all_detections": [
-                        {
-                            "class": result.names[int(box.cls.item())],
-                            "conf": float(box.conf.item())
-                        } for box in result.boxes
-                    ]
-                }
-            }
+            # The forward pass is blocking CPU/GPU work: never run it on the event loop
+            if self.executor is None:
+                return await asyncio.to_thread(self._locked, _yolo_predict, data)
+            if self.executor.kind == ExecutorKind.PROCESS:
+                # Models don't cross process boundaries: workers load their own copy
+                return await self.executor.run(
+                    _yolo_predict_in_worker, self.loading_path, self._weights_stamp, self._runtime_threads(), data
+                )
+            return await self.executor.run(self._locked, _yolo_predict, data)
         except Exception as e:
             # If we fall here, it might be an issue with the image reading (like "WARNING ⚠️ Image Read Error")
             # We want to catch it and not crash, but maybe try to return "No Product Detected" if it was just an empty image read.
             logger.error(f"YOLO Prediction Error: {e}")
             
             # If it's a specific error related to empty arrays (often caused by bad image reads in YOLO)
-            if "stack" in str(e) or "array" in str(e):
+            if _is_read_error(e):
                 logger.warning("Handling empty stack/array error as No Detection")
-                return {
-                    "prediction": "No Product Detected",
-                    "confidence": 0.0,
-                    "class_id": -1,
-                    "metadata": {"message": "Error reading image or no detections"}
-                 }
+                return _no_detection_result("Error reading image or no detections")
 
             raise e
 
@@ -210,29 +189,98 @@ class ImageClassifier(BaseModel):
                 "sales_pitch": selected["sales_pitch"]
             }
         }
-        
-    def _empty_result(self) -> dict[str, Any]:
-        return {
-            "prediction": "Unknown",
-            "confidence": 0.0,
-            "class_id": -1,
-            "metadata": {}
-        }
 
-    async def predict_batch(self, data_list: list[Any]) -> list[dict[str, Any]]:
+    async def predict_batch(
+        self,
+        data_list: list[Any],
+        batch_size: int | None = None,
+    ) -> list[dict[str, Any]]:
         """
-        Optimized batch prediction.
+        Batched prediction: images go through YOLO in groups, not one call each.
+
+        Results are identical to calling ``predict`` on each image.
 
         Args:
-            data_list: List of preprocessed images
+            data_list: List of preprocessed images (paths, PIL images or arrays)
+            batch_size: Images per forward pass (defaults to ``self.batch_size``)
 
         Returns:
-            List of prediction results
+            List of prediction results, in input order
         """
-        results = []
-        for data in data_list:
-            results.append(await self.predict(data))
-        return results
+        if not hasattr(self, "_is_loaded") or not self._is_loaded:
+            raise RuntimeError("Model not loaded")
+        if not data_list:
+            return []
+
+        if not self._has_model():
+            logger.warning(f"⚠️ YOLO model not active. Using Mock prediction for {len(data_list)} image(s)")
+            return [await self._predict_mock(data) for data in data_list]
+
+        size = batch_size or self.batch_size
+        logger.info(f"Running batched YOLO inference on {len(data_list)} image(s), {size} per pass")
+        if self.executor is None:
+            return await asyncio.to_thread(self._locked, _yolo_predict_batch, data_list, size)
+        if self.executor.kind == ExecutorKind.PROCESS:
+            return await self.executor.run(
+                _yolo_predict_batch_in_worker,
+                self.loading_path,
+                self._weights_stamp,
+                self._runtime_threads(),
+                data_list,
+                size,
+            )
+        return await self.executor.run(self._locked, _yolo_predict_batch, data_list, size)
+
+    async def warmup(self, resolutions: list[tuple[int, int]], runs: int = 1) -> None:
+        """
+        Run predictions on synthetic images through the serving path.
+
+        Each resolution is a distinct letterboxed input shape (its own
+        allocations and kernel selection). Every pass sends one image per
+        executor worker so process-pool workers load their model copy too.
+
+        Args:
+            resolutions: (width, height) of the synthetic images
+            runs: Passes per resolution
+        """
+        if not self._has_model():
+            return
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        workers = self.executor.workers if self.executor is not None else 1
+        for width, height in resolutions:
+            # Noise, not a flat image: exercises NMS and result parsing as well
+            image = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+            for _ in range(runs):
+                await asyncio.gather(*(self.predict(image) for _ in range(workers)))
+
+    def memory_footprint(self) -> int | None:
+        """
+        Bytes of the PyTorch model's parameters and buffers.
+
+        Returns:
+            Bytes, or None for ONNX Runtime sessions, process-pool workers and the mock
+            (registry uses the file size)
+        """
+        module = getattr(self.model, "model", None)
+        if module is None or not hasattr(module, "parameters"):
+            return None
+        tensors = [*module.parameters(), *module.buffers()]
+        return sum(t.numel() * t.element_size() for t in tensors)
+
+    def _has_model(self) -> bool:
+        """Whether real weights are loaded (here, or in the process-pool workers)."""
+        return self.model is not None or self._weights_stamp is not None
+
+    def _runtime_threads(self) -> int | None:
+        """Intra-op threads for ONNX Runtime sessions: the executor's per-worker torch threads."""
+        return self.executor.torch_threads if self.executor is not None else None
+
+    def _locked(self, fn: Callable[..., T], *args: Any) -> T:
+        """Call ``fn(self.model, *args)`` holding the model lock (YOLO predictors aren't thread-safe)."""
+        with self._lock:
+            return fn(self.model, *args)
 
     def set_class_labels(self, labels: list[str]) -> None:
         """Set class label names for predictions."""
@@ -241,3 +289,251 @@ class ImageClassifier(BaseModel):
     def get_class_labels(self) -> list[str]:
         """Get configured class labels."""
         return self._class_labels
+
+
+def _runtime(model_path: str) -> str:
+    """Inference runtime for a weights file: ONNX Runtime for .onnx, PyTorch otherwise."""
+    return "onnxruntime" if Path(model_path).suffix.lower() == ".onnx" else "pytorch"
+
+
+def _load_model(model_path: str, intra_op_threads: int | None = None) -> Any:
+    """
+    Load a YOLO model on the runtime matching its file extension (blocking).
+
+    Args:
+        model_path: ``.pt`` weights or ``.onnx`` export
+        intra_op_threads: ONNX Runtime threads per operator (PyTorch uses the executor's setting)
+
+    Returns:
+        Callable model: ``model(images, verbose=False, conf=...)`` returns Ultralytics Results
+    """
+    if _runtime(model_path) == "onnxruntime":
+        from business_backend.ml.models.onnx_detector import OnnxDetector
+
+        return OnnxDetector(model_path, intra_op_threads=intra_op_threads)
+    return YOLO(model_path)
+
+
+def _describe(data: Any) -> str:
+    """Short log label of an input (arrays are not printed)."""
+    shape = getattr(data, "shape", None)
+    return f"array {tuple(shape)}" if shape is not None else str(data)
+
+
+def _empty_result() -> dict[str, Any]:
+    return {
+        "prediction": "Unknown",
+        "confidence": 0.0,
+        "class_id": -1,
+        "metadata": {}
+    }
+
+
+def _no_detection_result(message: str) -> dict[str, Any]:
+    return {
+        "prediction": "No Product Detected",
+        "confidence": 0.0,
+        "class_id": -1,
+        "metadata": {"message": message}
+    }
+
+
+def _is_read_error(error: Exception) -> bool:
+    """Errors YOLO raises on unreadable/empty images (reported as no detection)."""
+    return "stack" in str(error) or "array" in str(error)
+
+
+def _parse_result(result: Any) -> dict[str, Any]:
+    """
+    Turn one image's YOLO result into a prediction dict.
+
+    Confidences and classes are copied off the tensor once per image
+    (no per-box ``.item()`` round trips); the top detection is the
+    first box with the highest confidence, as ``argmax`` picks it.
+
+    Args:
+        result: ultralytics Results of one image
+
+    Returns:
+        Prediction dict
+    """
+    boxes = getattr(result, 'boxes', None)
+    if not boxes or len(boxes) == 0:
+         logger.info("No objects detected in image.")
+         return _no_detection_result("No objects found")
+
+    confidences: list[float] = boxes.conf.tolist()
+    class_ids: list[int] = boxes.cls.int().tolist()
+
+    # Find index of max confidence
+    top_idx = max(range(len(confidences)), key=confidences.__getitem__)
+
+    class_id = class_ids[top_idx]
+    confidence = confidences[top_idx]
+    class_name = result.names[class_id]
+
+    # --- MODELO CUSTOM CARGADO (train7) ---
+    # El modelo ya detecta las clases específicas, no necesitamos simular nada.
+    logger.info(f"Detected Custom Class: {class_name} ({confidence:.2f})")
+
+    # Mapeo de seguridad por si los nombres del dataset difieren ligeramente del inventario
+    # Aunque idealmente deberían coincidir
+
+    return {
+        "prediction": class_name,
+        "confidence": confidence,
+        "class_id": class_id,
+        "metadata": {
+            "model_version": "yolo-v11",
+            "all_detections": [
+                {"class": result.names[cls], "conf": conf}
+                for cls, conf in zip(class_ids, confidences)
+            ]
+        }
+    }
+
+
+def _yolo_predict(model: Any, data: Any) -> dict[str, Any]:
+    """
+    Blocking YOLO forward pass and result parsing (runs in an executor worker).
+
+    Args:
+        model: Loaded YOLO model
+        data: File path, PIL image or numpy array
+
+    Returns:
+        Prediction dict
+    """
+    # Run inference
+    # YOLO accepts file paths (str), PIL, numpy.
+    results = model(data, verbose=False, conf=YOLO_CONFIDENCE)
+
+    if not results:
+         logger.warning("No results returned from YOLO")
+         return _empty_result()
+
+    return _parse_result(results[0]) # First image
+
+
+def _load_image(data: Any) -> Any:
+    """Decode a file path to a BGR array as YOLO would; other inputs pass through."""
+    if not isinstance(data, (str, Path)):
+        return data
+    import cv2
+
+    image = cv2.imread(str(data))
+    # Unreadable: let YOLO raise its own error for this input alone
+    return image if image is not None else data
+
+
+def _shape_key(image: Any, index: int) -> Any:
+    """Inputs with equal keys are letterboxed identically when batched together."""
+    shape = getattr(image, "shape", None)
+    if shape is not None:
+        return ("array", tuple(shape))
+    size = getattr(image, "size", None)
+    if isinstance(size, tuple):
+        return ("pil", size, getattr(image, "mode", None))
+    return ("single", index)
+
+
+def _yolo_predict_batch(model: Any, data_list: list[Any], batch_size: int) -> list[dict[str, Any]]:
+    """
+    Blocking batched YOLO inference (runs in an executor worker).
+
+    Images are grouped by shape and each group runs in forward passes of
+    up to ``batch_size`` images. YOLO letterboxes a batch of equal shapes
+    like a single image (minimal padding) but pads a mixed batch to a
+    square, so grouping keeps every result identical to a single call.
+
+    Args:
+        model: Loaded YOLO model
+        data_list: File paths, PIL images or numpy arrays
+        batch_size: Images per forward pass
+
+    Returns:
+        Prediction dicts, in input order
+    """
+    images = [_load_image(data) for data in data_list]
+    groups: dict[Any, list[int]] = {}
+    for index, image in enumerate(images):
+        groups.setdefault(_shape_key(image, index), []).append(index)
+
+    predictions: list[dict[str, Any]] = [_empty_result() for _ in images]
+    for indices in groups.values():
+        for start in range(0, len(indices), batch_size):
+            chunk = indices[start:start + batch_size]
+            try:
+                results = model([images[i] for i in chunk], verbose=False, conf=YOLO_CONFIDENCE)
+            except Exception as e:
+                if not _is_read_error(e):
+                    raise
+                # One bad image must not fail its neighbours: retry the chunk image by image
+                logger.warning(f"Batched YOLO call failed ({e}), retrying {len(chunk)} image(s) singly")
+                for i in chunk:
+                    predictions[i] = _yolo_predict_safe(model, images[i])
+                continue
+            for i, result in zip(chunk, results):
+                predictions[i] = _parse_result(result)
+    return predictions
+
+
+def _yolo_predict_safe(model: Any, data: Any) -> dict[str, Any]:
+    """_yolo_predict reporting an unreadable image as no detection."""
+    try:
+        return _yolo_predict(model, data)
+    except Exception as e:
+        if not _is_read_error(e):
+            raise
+        logger.warning(f"Handling empty stack/array error as No Detection: {e}")
+        return _no_detection_result("Error reading image or no detections")
+
+
+def _weights_stamp(model_path: str) -> tuple[int, int]:
+    """(mtime_ns, size) of a weights file: changes when the file is replaced."""
+    stat = Path(model_path).stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+# Per-process model cache of process-pool workers (model path -> (weights stamp, YOLO or OnnxDetector))
+_worker_models: dict[str, tuple[tuple[int, int], Any]] = {}
+
+
+def _worker_model(model_path: str, stamp: tuple[int, int] | None, intra_op_threads: int | None) -> Any:
+    """Model of this process-pool worker, loaded once per process and weights version."""
+    cached = _worker_models.get(model_path)
+    # A caller with an older stamp (model being reloaded) gets what is on disk now
+    if cached is not None and (cached[0] == stamp or cached[0] == _weights_stamp(model_path)):
+        return cached[1]
+    # New weights at this path: drop the old copy before loading
+    _worker_models.pop(model_path, None)
+    current = _weights_stamp(model_path)
+    model = _load_model(model_path, intra_op_threads)
+    _worker_models[model_path] = (current, model)
+    return model
+
+
+def _load_in_worker(model_path: str, stamp: tuple[int, int] | None, intra_op_threads: int | None) -> None:
+    """Load the model into a process-pool worker's cache (the model itself stays there)."""
+    _worker_model(model_path, stamp, intra_op_threads)
+
+
+def _yolo_predict_in_worker(
+    model_path: str,
+    stamp: tuple[int, int] | None,
+    intra_op_threads: int | None,
+    data: Any,
+) -> dict[str, Any]:
+    """_yolo_predict in a process-pool worker."""
+    return _yolo_predict(_worker_model(model_path, stamp, intra_op_threads), data)
+
+
+def _yolo_predict_batch_in_worker(
+    model_path: str,
+    stamp: tuple[int, int] | None,
+    intra_op_threads: int | None,
+    data_list: list[Any],
+    batch_size: int,
+) -> list[dict[str, Any]]:
+    """_yolo_predict_batch in a process-pool worker."""
+    return _yolo_predict_batch(_worker_model(model_path, stamp, intra_op_threads), data_list, batch_size)
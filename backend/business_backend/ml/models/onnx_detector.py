@@ -0,0 +1,225 @@
+"""
+ONNX Runtime YOLO Detector.
+
+Runs a YOLO detection model exported to ONNX with ONNX Runtime on CPU.
+Pre- and post-processing reuse Ultralytics' own letterbox, NMS and
+Results, so a detector stands in for ``YOLO(...)`` in ImageClassifier:
+``detector(images, conf=...)`` returns the ``Results`` objects the
+PyTorch path parses. Dynamic-shape exports (``export_onnx``'s default)
+are letterboxed to the same minimal rectangle as on PyTorch; fixed-shape
+exports are padded to the full export size. Boxes and confidences are
+close to the PyTorch ones, not bit-identical (different kernels, and the
+extra padding of fixed shapes).
+"""
+
+import ast
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+# Ultralytics predict() defaults
+NMS_IOU = 0.7
+MAX_DETECTIONS = 300
+
+
+def _non_max_suppression() -> Any:
+    """Ultralytics' NMS (moved from utils.ops to utils.nms in recent releases)."""
+    try:
+        from ultralytics.utils.nms import non_max_suppression
+    except ImportError:
+        from ultralytics.utils.ops import non_max_suppression
+    return non_max_suppression
+
+
+def create_session(
+    path: str | Path,
+    intra_op_threads: int | None = None,
+    inter_op_threads: int = 1,
+) -> "ort.InferenceSession":
+    """
+    Create a CPU ONNX Runtime session tuned for latency.
+
+    Args:
+        path: ``.onnx`` model file
+        intra_op_threads: Threads per operator (None keeps ORT's default, one per physical core)
+        inter_op_threads: Threads running independent graph nodes (YOLO graphs are sequential)
+
+    Returns:
+        InferenceSession on the CPU execution provider
+    """
+    if not ONNXRUNTIME_AVAILABLE:
+        raise ImportError("onnxruntime is required for .onnx models: poetry install --extras onnx")
+
+    options = ort.SessionOptions()
+    # Constant folding, node fusions (Conv+BN+activation) and layout optimizations
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.inter_op_num_threads = inter_op_threads
+    if intra_op_threads:
+        options.intra_op_num_threads = intra_op_threads
+    return ort.InferenceSession(str(path), sess_options=options, providers=["CPUExecutionProvider"])
+
+
+class OnnxDetector:
+    """
+    YOLO detection model on ONNX Runtime.
+
+    Class names, input size and stride are read from the metadata
+    Ultralytics writes into exported models. Models exported with a
+    fixed batch size run one image per session call.
+
+    Usage:
+        detector = OnnxDetector("best.onnx", intra_op_threads=4)
+        results = detector([image], conf=0.4)
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        intra_op_threads: int | None = None,
+        inter_op_threads: int = 1,
+    ) -> None:
+        """
+        Load the model into a tuned session.
+
+        Args:
+            path: ``.onnx`` model exported by Ultralytics
+            intra_op_threads: Threads per operator (None keeps ORT's default)
+            inter_op_threads: Threads running independent graph nodes
+        """
+        self.path = str(path)
+        self.session = create_session(path, intra_op_threads, inter_op_threads)
+
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        if "names" not in metadata:
+            raise ValueError(f"{self.path} has no Ultralytics metadata (export it with export_onnx)")
+        self.names: dict[int, str] = ast.literal_eval(metadata["names"])
+        imgsz = ast.literal_eval(metadata.get("imgsz", "[640, 640]"))
+        self.imgsz: tuple[int, int] = (imgsz, imgsz) if isinstance(imgsz, int) else tuple(imgsz)
+        self.stride = int(metadata.get("stride", 32))
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.input_dtype = np.float16 if "float16" in model_input.type else np.float32
+        # Symbolic batch axis ("batch"): the whole batch goes through one session call
+        self.dynamic_batch = not isinstance(model_input.shape[0], int)
+        # Symbolic height/width: inputs can keep the minimal letterbox rectangle
+        self.dynamic_shape = not all(isinstance(dim, int) for dim in model_input.shape[2:])
+        logger.info(
+            f"ONNX model loaded: {len(self.names)} classes, input {self.imgsz}, "
+            f"{'dynamic' if self.dynamic_batch else 'fixed'} batch, "
+            f"{'dynamic' if self.dynamic_shape else 'fixed'} shape"
+        )
+
+    def __call__(
+        self,
+        source: Any,
+        conf: float = 0.25,
+        iou: float = NMS_IOU,
+        max_det: int = MAX_DETECTIONS,
+        verbose: bool = False,
+    ) -> list[Any]:
+        """
+        Detect objects, like calling an Ultralytics ``YOLO`` model.
+
+        Args:
+            source: Image or list of images (file paths, PIL images or BGR arrays)
+            conf: Minimum detection confidence
+            iou: NMS IoU threshold
+            max_det: Detections kept per image
+            verbose: Unused, accepted for ``YOLO`` call compatibility
+
+        Returns:
+            One ``ultralytics.engine.results.Results`` per image
+        """
+        images = [self.read_image(item) for item in (source if isinstance(source, list) else [source])]
+        if not images:
+            return []
+
+        batch = self.preprocess(images)
+        if self.dynamic_batch:
+            outputs = self.session.run(None, {self.input_name: batch})[0]
+        else:
+            outputs = np.concatenate(
+                [self.session.run(None, {self.input_name: batch[i : i + 1]})[0] for i in range(len(images))]
+            )
+        return self._postprocess(outputs, batch, images, conf, iou, max_det)
+
+    @staticmethod
+    def read_image(item: Any) -> np.ndarray:
+        """
+        Decode an input to a BGR array, as Ultralytics' loaders do.
+
+        Args:
+            item: File path, PIL image or BGR array
+
+        Returns:
+            BGR array
+        """
+        if isinstance(item, (str, Path)):
+            import cv2
+
+            image = cv2.imread(str(item))
+            if image is None:
+                raise FileNotFoundError(f"Image Read Error: {item}")
+            return image
+        if isinstance(item, np.ndarray):
+            return item
+        # PIL image: RGB -> BGR
+        return np.asarray(item.convert("RGB"))[..., ::-1]
+
+    def preprocess(self, images: list[np.ndarray]) -> np.ndarray:
+        """
+        Build the model input batch: letterbox, BGR->RGB, HWC->CHW, scale to [0, 1].
+
+        Args:
+            images: Decoded BGR images
+
+        Returns:
+            Contiguous (N, 3, H, W) array in the model's input dtype
+        """
+        from ultralytics.data.augment import LetterBox
+
+        # As Ultralytics' predictor does for .pt models: minimal stride-aligned rectangle when
+        # the graph takes any height/width and the batch shares one shape, else the full size
+        same_shapes = len({image.shape for image in images}) == 1
+        letterbox = LetterBox(self.imgsz, auto=self.dynamic_shape and same_shapes, stride=self.stride)
+        batch = np.stack([letterbox(image=image) for image in images])
+        batch = np.ascontiguousarray(batch[..., ::-1].transpose(0, 3, 1, 2))
+        return batch.astype(self.input_dtype) / 255
+
+    def _postprocess(
+        self,
+        outputs: np.ndarray,
+        batch: np.ndarray,
+        images: list[np.ndarray],
+        conf: float,
+        iou: float,
+        max_det: int,
+    ) -> list[Any]:
+        """Same steps as Ultralytics' DetectionPredictor.postprocess."""
+        import torch
+        from ultralytics.engine.results import Results
+        from ultralytics.utils import ops
+
+        preds = torch.from_numpy(outputs.astype(np.float32))
+        if preds.shape[-1] == 6:
+            # End-to-end (NMS-free) export: rows are already (x1, y1, x2, y2, conf, class)
+            detections = [pred[pred[:, 4] > conf][:max_det] for pred in preds]
+        else:
+            nms = _non_max_suppression()
+            detections = nms(preds, conf, iou, max_det=max_det, nc=len(self.names))
+
+        results = []
+        for image, det in zip(images, detections):
+            det[:, :4] = ops.scale_boxes(batch.shape[2:], det[:, :4], image.shape)
+            results.append(Results(image, path=self.path, names=self.names, boxes=det[:, :6]))
+        return results
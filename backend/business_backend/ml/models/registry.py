@@ -5,12 +5,21 @@ Manages ML model registration, loading, and lifecycle.
 Follows MLflow registry pattern for model management.
 """
 
-from typing import Any
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 from pathlib import Path
 from dataclasses import dataclass, field
 from enum import Enum
 
+from loguru import logger
+
 from business_backend.ml.models.base import BaseModel
+from business_backend.shared.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from business_backend.ml.serving.executor import InferenceExecutor
 
 
 class ModelStage(str, Enum):
@@ -41,14 +50,41 @@ class ModelRegistry:
     Provides:
     - Model registration with metadata
     - Lazy loading (models loaded on first use)
-    - In-memory caching (singleton per model)
+    - In-memory caching (singleton per model; concurrent first loads share one load)
+    - Memory budget: least recently used models are evicted to fit it,
+      except production models, which stay pinned
     - Version and stage management
+    - Weights versioning: listeners are told when a model's weights may
+      have changed (reload, unload, re-registration)
     """
 
-    def __init__(self) -> None:
-        """Initialize empty registry."""
+    def __init__(
+        self,
+        executor: "InferenceExecutor | None" = None,
+        memory_budget_bytes: int | None = None,
+    ) -> None:
+        """
+        Initialize empty registry.
+
+        Args:
+            executor: Executor given to every loaded model for its blocking inference
+            memory_budget_bytes: Total footprint of loaded models (None: unlimited)
+        """
+        self.executor = executor
+        self.memory_budget_bytes = memory_budget_bytes
         self._registry: dict[str, ModelInfo] = {}
-        self._loaded_models: dict[str, BaseModel] = {}
+        # Least recently used first
+        self._loaded_models: OrderedDict[str, BaseModel] = OrderedDict()
+        self._footprints: dict[str, int] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._loads: SingleFlight[BaseModel] = SingleFlight()
+        self._generations: dict[str, int] = {}
+        self._listeners: list[Callable[[str], None]] = []
+
+        self._hits = 0
+        self._load_count = 0
+        self._load_failures = 0
+        self._evictions = 0
 
     def register(
         self,
@@ -70,6 +106,8 @@ class ModelRegistry:
             version: Model version string
             metadata: Additional model metadata
         """
+        if name in self._registry:
+            self._weights_changed(name)
         self._registry[name] = ModelInfo(
             name=name,
             model_class=model_class,
@@ -86,15 +124,18 @@ class ModelRegistry:
         Args:
             name: Model identifier
         """
-        if name in self._loaded_models:
-            self._loaded_models.pop(name)
+        self._drop(name)
         if name in self._registry:
             self._registry.pop(name)
+            self._weights_changed(name)
 
     async def load(self, name: str) -> BaseModel:
         """
         Load model by name (lazy loading with cache).
 
+        Concurrent first loads of a model share one load, so the weights
+        are never deserialized twice at once.
+
         Args:
             name: Model identifier
 
@@ -107,17 +148,46 @@ class ModelRegistry:
         if name not in self._registry:
             raise KeyError(f"Model '{name}' not found in registry")
 
-        if name in self._loaded_models:
-            return self._loaded_models[name]
+        model = self._loaded_models.get(name)
+        if model is not None:
+            self._loaded_models.move_to_end(name)
+            self._hits += 1
+            return model
+
+        return await self._loads.do(name, lambda: self._load(name))
+
+    async def _load(self, name: str) -> BaseModel:
+        async with self._lock(name):
+            # Loaded by a reload while this load waited for the lock
+            model = self._loaded_models.get(name)
+            if model is not None:
+                return model
+            return await self._load_locked(name)
+
+    async def _load_locked(self, name: str) -> BaseModel:
+        """Instantiate and load a model (caller holds its lock)."""
+        info = self._registry.get(name)
+        if info is None:
+            raise KeyError(f"Model '{name}' not found in registry")
+
+        # Make room first: peak memory stays within budget while the weights load
+        self._evict(self._disk_size(info.model_path), keep=name)
 
-        info = self._registry[name]
-        
         # Instantiate and load
         model_instance = info.model_class()
-        await model_instance.load(info.model_path)
-        
+        model_instance.executor = self.executor
+        try:
+            await model_instance.load(info.model_path)
+        except Exception:
+            self._load_failures += 1
+            raise
+
         # Cache
+        footprint = model_instance.memory_footprint()
+        self._footprints[name] = footprint if footprint is not None else self._disk_size(info.model_path)
         self._loaded_models[name] = model_instance
+        self._load_count += 1
+        self._evict(0, keep=name)
         return model_instance
 
     async def unload(self, name: str) -> None:
@@ -127,8 +197,8 @@ class ModelRegistry:
         Args:
             name: Model identifier
         """
-        if name in self._loaded_models:
-            del self._loaded_models[name]
+        async with self._lock(name):
+            self._drop(name)
 
     async def reload(self, name: str) -> BaseModel:
         """
@@ -140,8 +210,96 @@ class ModelRegistry:
         Returns:
             Reloaded model instance
         """
-        await self.unload(name)
-        return await self.load(name)
+        if name not in self._registry:
+            raise KeyError(f"Model '{name}' not found in registry")
+        async with self._lock(name):
+            self._drop(name)
+            return await self._load_locked(name)
+
+    def _lock(self, name: str) -> asyncio.Lock:
+        """Lock serializing load/unload/reload of one model."""
+        lock = self._locks.get(name)
+        if lock is None:
+            lock = self._locks[name] = asyncio.Lock()
+        return lock
+
+    def _drop(self, name: str) -> bool:
+        """Forget a loaded model; returns whether it was loaded."""
+        if name not in self._loaded_models:
+            return False
+        del self._loaded_models[name]
+        self._footprints.pop(name, None)
+        # Next load reads the weights from disk again, which may have been replaced
+        self._weights_changed(name)
+        return True
+
+    def _evict(self, incoming_bytes: int, keep: str) -> None:
+        """Evict least recently used, unpinned models until ``incoming_bytes`` more fit the budget."""
+        if self.memory_budget_bytes is None:
+            return
+        for name in list(self._loaded_models):
+            if self.memory_bytes() + incoming_bytes <= self.memory_budget_bytes:
+                return
+            info = self._registry.get(name)
+            pinned = info is not None and info.stage == ModelStage.PRODUCTION
+            if pinned or name == keep or self._lock(name).locked():
+                continue
+            freed = self._footprints.get(name, 0)
+            self._drop(name)
+            self._evictions += 1
+            logger.info(f"Evicted model '{name}' ({freed / 2**20:.0f} MiB) to stay within the memory budget")
+
+        if self.memory_bytes() + incoming_bytes > self.memory_budget_bytes:
+            logger.warning(
+                f"Model memory {self.memory_bytes() / 2**20:.0f} MiB (+{incoming_bytes / 2**20:.0f} MiB) "
+                f"exceeds the {self.memory_budget_bytes / 2**20:.0f} MiB budget: only pinned models are left"
+            )
+
+    @staticmethod
+    def _disk_size(path: str | Path) -> int:
+        """Size of a weights file or directory (estimate of a model's footprint)."""
+        path = Path(path)
+        if path.is_file():
+            return path.stat().st_size
+        if path.is_dir():
+            return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+        return 0
+
+    def memory_bytes(self) -> int:
+        """Total footprint of loaded models."""
+        return sum(self._footprints.values())
+
+    def weights_version(self, name: str) -> str | None:
+        """
+        Get a tag identifying the weights a model currently serves.
+
+        The registered version plus a counter bumped on every reload,
+        so results computed before a reload never match it.
+
+        Args:
+            name: Model identifier
+
+        Returns:
+            Version tag, or None if not registered
+        """
+        info = self._registry.get(name)
+        if info is None:
+            return None
+        return f"{info.version}+{self._generations.get(name, 0)}"
+
+    def add_listener(self, callback: Callable[[str], None]) -> None:
+        """
+        Subscribe to weights changes (reload, unload, re-registration).
+
+        Args:
+            callback: Called with the model name
+        """
+        self._listeners.append(callback)
+
+    def _weights_changed(self, name: str) -> None:
+        self._generations[name] = self._generations.get(name, 0) + 1
+        for callback in self._listeners:
+            callback(name)
 
     def get_info(self, name: str) -> ModelInfo | None:
         """
@@ -180,3 +338,31 @@ class ModelRegistry:
             True if loaded
         """
         return name in self._loaded_models
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get model cache counters.
+
+        Returns:
+            Dict with loads, hits, evictions, coalesced loads and memory per loaded model
+        """
+        loads = self._loads.get_stats()
+        return {
+            "registered": len(self._registry),
+            "loaded": len(self._loaded_models),
+            "loads": self._load_count,
+            "load_failures": self._load_failures,
+            "hits": self._hits,
+            "coalesced_loads": loads["coalesced"],
+            "loading": loads["in_flight"],
+            "evictions": self._evictions,
+            "memory_bytes": self.memory_bytes(),
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "models": {
+                name: {
+                    "footprint_bytes": self._footprints.get(name),
+                    "pinned": name in self._registry and self._registry[name].stage == ModelStage.PRODUCTION,
+                }
+                for name in self._loaded_models
+            },
+        }
@@ -2,27 +2,97 @@
 Image Preprocessor.
 
 Handles image preprocessing for ML models:
-- Decoding (base64, bytes, file path)
-- Resizing
+- Decoding (base64, bytes, file path, PIL, NumPy)
+- Letterbox resizing
 - Normalization
 - Color mode conversion
+
+Decoding and resizing run in a thread pool (OpenCV releases the GIL);
+color conversion and normalization are vectorized NumPy writes into
+the batch's preallocated output array.
 """
 
+import asyncio
+import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
+
 from business_backend.ml.preprocessing.base import BasePreprocessor
 
+# ITU-R BT.601 luma weights (same as OpenCV's RGB2GRAY)
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+# Longest string still checked as a file path before trying base64
+_MAX_PATH_LENGTH = 4096
+
+# Leading bytes of the encodings OpenCV decodes (JPEG, PNG, GIF, BMP, WebP, TIFF)
+_IMAGE_SIGNATURES = (b"\xff\xd8\xff", b"\x89PNG", b"GIF8", b"BM", b"RIFF", b"II*\x00", b"MM\x00*")
+
+# Per-thread letterbox canvas, reused across images of the same target size
+_scratch = threading.local()
+
+
+def _cv2() -> Any:
+    try:
+        import cv2
+    except ImportError as e:
+        raise ImportError("OpenCV is required for image decoding: pip install opencv-python-headless") from e
+    return cv2
+
+
+def decode_image_bytes(data: bytes | bytearray | memoryview) -> Any:
+    """
+    Decode an encoded image (JPEG, PNG, WebP...) in memory.
+
+    Blocking (CPU-bound): call it from a worker thread.
+
+    Args:
+        data: Encoded image bytes
+
+    Returns:
+        BGR uint8 numpy array (H, W, 3), as YOLO reads image files
+
+    Raises:
+        ImportError: OpenCV is not installed
+        ValueError: Bytes are not a decodable image
+    """
+    if not data:
+        raise ValueError("Empty image")
+    cv2 = _cv2()
+
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Could not decode image")
+    return image
+
+
+def _strip_data_url(data_url: str) -> str:
+    """Base64 payload of a data URL (the string itself if it has no prefix)."""
+    if data_url.startswith("data:"):
+        _, _, data_url = data_url.partition(",")
+    return data_url
+
+
+def _is_path(data: str) -> bool:
+    return len(data) < _MAX_PATH_LENGTH and not data.startswith("data:") and Path(data).is_file()
+
 
 @dataclass
 class ImageConfig:
     """Configuration for image preprocessing."""
 
-    target_size: tuple[int, int] = (224, 224)
+    target_size: tuple[int, int] = (224, 224)  # (width, height)
     normalize: bool = True
     normalize_range: tuple[float, float] = (0.0, 1.0)
     color_mode: str = "rgb"  # rgb, grayscale, rgba
+    letterbox: bool = True  # Keep aspect ratio and pad (False: stretch to target_size)
+    pad_value: int = 114  # Letterbox border gray level (YOLO's)
+    array_order: str = "rgb"  # Channel order of NumPy inputs ("bgr" for OpenCV arrays)
 
 
 class ImagePreprocessor(BasePreprocessor):
@@ -35,16 +105,38 @@ class ImagePreprocessor(BasePreprocessor):
     - File path
     - NumPy array
     - PIL Image
+
+    Output is a (height, width, channels) array per image: float32 in
+    ``normalize_range`` when normalizing, uint8 otherwise. Batches are
+    one contiguous (N, height, width, channels) array that every worker
+    fills in place, so no per-image arrays are stacked afterwards.
     """
 
-    def __init__(self, config: ImageConfig | None = None) -> None:
+    def __init__(self, config: ImageConfig | None = None, workers: int = 4) -> None:
         """
         Initialize processor with config.
 
         Args:
             config: Image preprocessing configuration
+            workers: Decode/resize threads
         """
         self.config = config or ImageConfig()
+        if self.config.color_mode not in ("rgb", "grayscale", "rgba"):
+            raise ValueError(f"Unsupported color mode: {self.config.color_mode}")
+        self.workers = workers
+        self._pool: ThreadPoolExecutor | None = None
+
+    @property
+    def output_shape(self) -> tuple[int, int, int]:
+        """Shape of one preprocessed image: (height, width, channels)."""
+        width, height = self.config.target_size
+        channels = {"rgb": 3, "grayscale": 1, "rgba": 4}[self.config.color_mode]
+        return height, width, channels
+
+    @property
+    def output_dtype(self) -> Any:
+        """float32 when normalizing, uint8 otherwise."""
+        return np.float32 if self.config.normalize else np.uint8
 
     async def process(self, data: Any) -> Any:
         """
@@ -56,27 +148,32 @@ class ImagePreprocessor(BasePreprocessor):
         Returns:
             Preprocessed numpy array ready for model input
         """
-        # Here your code for:
-        # 1. Detect input type (base64, bytes, path, PIL, numpy)
-        # 2. Convert to PIL Image
-        # 3. Resize to target_size
-        # 4. Convert color mode (rgb, grayscale, rgba)
-        # 5. Convert to numpy array
-        # 6. Normalize if enabled
-        pass
-
-    async def process_batch(self, data_list: list[Any]) -> list[Any]:
+        return (await self.process_batch([data]))[0]
+
+    async def process_batch(self, data_list: list[Any], out: Any = None) -> Any:
         """
         Process batch of images.
 
+        Images are decoded and resized concurrently in the thread pool,
+        each written straight into its slot of the batch array.
+
         Args:
             data_list: List of images in any supported format
+            out: Optional preallocated (N, height, width, channels) array to fill
 
         Returns:
             Stacked numpy array (batch_size, height, width, channels)
         """
-        # Here your code for batch image processing
-        pass
+        shape = (len(data_list), *self.output_shape)
+        if out is None:
+            out = np.empty(shape, dtype=self.output_dtype)
+        elif out.shape != shape or out.dtype != self.output_dtype:
+            raise ValueError(f"Output buffer must be {shape} {np.dtype(self.output_dtype)}")
+
+        await asyncio.gather(*(
+            self._run(self._process_into, data, out[i]) for i, data in enumerate(data_list)
+        ))
+        return out
 
     def validate(self, data: Any) -> bool:
         """
@@ -88,8 +185,22 @@ class ImagePreprocessor(BasePreprocessor):
         Returns:
             True if valid image format
         """
-        # Here your code for image validation
-        pass
+        if isinstance(data, np.ndarray):
+            return data.ndim == 2 or (data.ndim == 3 and data.shape[2] in (1, 3, 4))
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return bytes(data[:4]).startswith(_IMAGE_SIGNATURES)
+        if isinstance(data, Path):
+            return data.is_file()
+        if isinstance(data, str):
+            if _is_path(data):
+                return True
+            try:
+                # The header is enough to recognize the encoding
+                head = base64.b64decode(_strip_data_url(data)[:64], validate=True)
+            except ValueError:
+                return False
+            return head.startswith(_IMAGE_SIGNATURES)
+        return hasattr(data, "convert") and hasattr(data, "size")  # PIL Image
 
     async def decode_base64(self, data_url: str) -> Any:
         """
@@ -99,10 +210,10 @@ class ImagePreprocessor(BasePreprocessor):
             data_url: Base64 encoded image (with or without data URL prefix)
 
         Returns:
-            PIL Image
+            RGB uint8 numpy array (H, W, 3), not resized
         """
-        # Here your code for base64 decoding
-        pass
+        image = await self._run(self._decode_base64, data_url)
+        return _cv2().cvtColor(image, _cv2().COLOR_BGR2RGB)
 
     async def to_base64(self, image: Any, format: str = "PNG") -> str:
         """
@@ -115,8 +226,8 @@ class ImagePreprocessor(BasePreprocessor):
         Returns:
             Base64 encoded string with data URL prefix
         """
-        # Here your code for base64 encoding
-        pass
+        encoded = await self._run(self._encode, image, format)
+        return f"data:image/{format.lower()};base64,{base64.b64encode(encoded).decode('ascii')}"
 
     async def save(self, image: Any, path: str | Path) -> Path:
         """
@@ -124,10 +235,121 @@ class ImagePreprocessor(BasePreprocessor):
 
         Args:
             image: PIL Image or numpy array
-            path: Output file path
+            path: Output file path (format from its extension)
 
         Returns:
             Path to saved file
         """
-        # Here your code for saving image to disk
-        pass
+        path = Path(path)
+        encoded = await self._run(self._encode, image, path.suffix.lstrip(".") or "png")
+        await self._run(path.write_bytes, encoded)
+        return path
+
+    async def _run(self, fn: Any, *args: Any) -> Any:
+        """Run blocking work in the preprocessing thread pool."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="preprocess")
+        return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+
+    def _load(self, data: Any) -> tuple[Any, bool]:
+        """Decode any supported input to a uint8 array; also returns whether it is BGR."""
+        if isinstance(data, np.ndarray):
+            if data.dtype != np.uint8:
+                raise ValueError(f"NumPy images must be uint8, got {data.dtype}")
+            return data, self.config.array_order == "bgr"
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return decode_image_bytes(data), True
+        if isinstance(data, Path):
+            return decode_image_bytes(data.read_bytes()), True
+        if isinstance(data, str):
+            if _is_path(data):
+                return decode_image_bytes(Path(data).read_bytes()), True
+            return self._decode_base64(data), True
+        if hasattr(data, "convert") and hasattr(data, "size"):  # PIL Image
+            return np.asarray(data.convert("RGB")), False
+        raise ValueError(f"Unsupported image input: {type(data).__name__}")
+
+    def _decode_base64(self, data_url: str) -> Any:
+        try:
+            raw = base64.b64decode(_strip_data_url(data_url))
+        except ValueError as e:
+            raise ValueError("Invalid base64 image") from e
+        return decode_image_bytes(raw)
+
+    def _process_into(self, data: Any, out: Any) -> None:
+        """Decode, letterbox, convert and normalize one image into ``out`` (blocking)."""
+        image, bgr = self._load(data)
+        if image.ndim == 3 and image.shape[2] == 4:
+            image = image[..., :3]  # Drop alpha; rgba output gets an opaque one
+        canvas = self._letterbox(image, bgr)
+        self._finish(canvas, out)
+
+    def _letterbox(self, image: Any, bgr: bool) -> Any:
+        """Resize into this thread's reusable RGB canvas (aspect kept, borders padded)."""
+        cv2 = _cv2()
+        width, height = self.config.target_size
+        canvas = getattr(_scratch, "canvas", None)
+        if canvas is None or canvas.shape != (height, width, 3):
+            canvas = _scratch.canvas = np.empty((height, width, 3), dtype=np.uint8)
+
+        h, w = image.shape[:2]
+        if self.config.letterbox:
+            scale = min(width / w, height / h)
+            new_w, new_h = max(1, round(w * scale)), max(1, round(h * scale))
+        else:
+            new_w, new_h = width, height
+        resized = image if (new_w, new_h) == (w, h) else cv2.resize(
+            image, (new_w, new_h), interpolation=cv2.INTER_LINEAR
+        )
+        if resized.ndim == 2:
+            resized = resized[..., None]  # Grayscale input: broadcast to 3 channels
+        elif bgr:
+            resized = resized[..., ::-1]  # Channel swap as a view, copied once below
+
+        top, left = (height - new_h) // 2, (width - new_w) // 2
+        if (new_w, new_h) != (width, height):
+            canvas[:top] = self.config.pad_value
+            canvas[top + new_h:] = self.config.pad_value
+            canvas[top:top + new_h, :left] = self.config.pad_value
+            canvas[top:top + new_h, left + new_w:] = self.config.pad_value
+        canvas[top:top + new_h, left:left + new_w] = resized
+        return canvas
+
+    def _finish(self, canvas: Any, out: Any) -> None:
+        """Color conversion and normalization of the canvas, written into ``out``."""
+        mode = self.config.color_mode
+        low, high = self.config.normalize_range
+        source = canvas
+        if mode == "grayscale":
+            source = (canvas @ _LUMA)[..., None]
+            if not self.config.normalize:
+                np.rint(source, out=source)
+
+        target = out[..., :3] if mode == "rgba" else out
+        if self.config.normalize:
+            np.multiply(source, np.float32((high - low) / 255), out=target, casting="unsafe")
+            if low:
+                target += np.float32(low)
+        else:
+            np.copyto(target, source, casting="unsafe")
+
+        if mode == "rgba":
+            out[..., 3] = high if self.config.normalize else 255
+
+    def _encode(self, image: Any, format: str) -> bytes:
+        """Encode an RGB(A)/grayscale image to ``format`` bytes (blocking)."""
+        cv2 = _cv2()
+        if hasattr(image, "convert") and not isinstance(image, np.ndarray):  # PIL Image
+            image = np.asarray(image.convert("RGB"))
+        image = np.asarray(image)
+        if image.dtype != np.uint8:
+            low, high = self.config.normalize_range
+            image = np.clip((image - low) * (255 / (high - low)), 0, 255).astype(np.uint8)
+        if image.ndim == 3 and image.shape[2] == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        elif image.ndim == 3 and image.shape[2] == 4:
+            image = cv2.cvtColor(image, cv2.COLOR_RGBA2BGRA)
+        ok, encoded = cv2.imencode(f".{format.lower()}", image)
+        if not ok:
+            raise ValueError(f"Could not encode image as {format}")
+        return encoded.tobytes()
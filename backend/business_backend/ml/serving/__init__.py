@@ -1,5 +1,8 @@
 """Serving module for ML inference service."""
 
+from business_backend.ml.serving.batching import BatchConfig, MicroBatcher
+from business_backend.ml.serving.executor import ExecutorKind, InferenceExecutor
 from business_backend.ml.serving.inference_service import InferenceService
+from business_backend.ml.serving.warmup import ModelWarmup
 
-__all__ = ["InferenceService"]
+__all__ = ["InferenceService", "InferenceExecutor", "ExecutorKind", "MicroBatcher", "BatchConfig", "ModelWarmup"]
@@ -0,0 +1,157 @@
+"""
+Dynamic Micro-Batching.
+
+Collects concurrent single-item inference calls into one batched
+forward pass:
+- A batch is flushed when it reaches ``max_batch_size`` items or when
+  its oldest item has waited ``max_wait_ms``
+- Results (or the batch's error) are scattered back to each caller
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class BatchConfig:
+    """Micro-batching tunables for one model."""
+
+    enabled: bool = True
+    max_batch_size: int = 8
+    max_wait_ms: float = 5.0
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Micro-batching scheduler in front of a batched function.
+
+    The first item of a batch starts the ``max_wait_ms`` timer; the
+    batch runs when the timer fires or as soon as it is full. Batches
+    run as tasks, so a new batch fills up while the previous one runs.
+    A caller cancelled before its batch starts is left out of it.
+
+    Usage:
+        batcher = MicroBatcher(model.predict_batch, max_batch_size=8, max_wait_ms=5)
+        result = await batcher.submit(image)
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[list[T]], Awaitable[list[R]]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        """
+        Initialize batcher.
+
+        Args:
+            run_batch: Batched function returning one result per item, in order
+            max_batch_size: Items per batch
+            max_wait_ms: Longest an item waits for the batch to fill
+        """
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self._pending: list[tuple[T, asyncio.Future[R]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+        self._batches = 0
+        self._items = 0
+        self._flushed_full = 0
+        self._flushed_timeout = 0
+        self._largest_batch = 0
+        self._failed_batches = 0
+
+    async def submit(self, item: T) -> R:
+        """
+        Add an item to the current batch and wait for its result.
+
+        Args:
+            item: One model input
+
+        Returns:
+            The item's result from the batched call
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[R] = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flushed_full += 1
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._on_timeout)
+        return await future
+
+    def _on_timeout(self) -> None:
+        self._timer = None
+        if self._pending:
+            self._flushed_timeout += 1
+            self._flush()
+
+    def _flush(self) -> None:
+        """Start the pending items as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch = [(item, future) for item, future in self._pending[: self.max_batch_size] if not future.done()]
+        del self._pending[: self.max_batch_size]
+        if self._pending:
+            # Leftovers start the next batch
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait_ms / 1000, self._on_timeout)
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[T, asyncio.Future[R]]]) -> None:
+        """Run one batch and scatter its results."""
+        self._batches += 1
+        self._items += len(batch)
+        self._largest_batch = max(self._largest_batch, len(batch))
+        try:
+            results = await self.run_batch([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"Batch of {len(batch)} items returned {len(results)} results")
+        except Exception as e:
+            self._failed_batches += 1
+            logger.warning(f"Inference batch of {len(batch)} failed: {e!r}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get batching counters.
+
+        Returns:
+            Dict with config, batches run, average/largest batch size and flush causes
+        """
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": self._items / self._batches if self._batches else 0.0,
+            "largest_batch": self._largest_batch,
+            "flushed_full": self._flushed_full,
+            "flushed_timeout": self._flushed_timeout,
+            "failed_batches": self._failed_batches,
+            "pending": len(self._pending),
+        }
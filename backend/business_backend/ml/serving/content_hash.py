@@ -0,0 +1,143 @@
+"""
+Content Hashing for Inference Inputs.
+
+Computes a stable digest of model inputs so identical images can be
+recognized regardless of how they arrive (bytes, file path, array),
+and a perceptual hash (dHash) so near-duplicates (re-encoded, resized
+re-uploads of the same photo) can be matched too.
+"""
+
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Any
+
+# Larger in-memory inputs are hashed in a worker thread
+INLINE_HASH_MAX_BYTES = 1 << 20
+
+# dHash grid: 8 rows of 9 pixels give 8x8 = 64 left/right gradient bits
+_DHASH_SIZE = 8
+
+
+def _digest_bytes(data: bytes | bytearray | memoryview) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _digest_array(header: bytes, data: Any) -> str:
+    digest = hashlib.sha256(header)
+    flags = getattr(data, "flags", None)
+    # Contiguous arrays are hashed in place, without a tobytes() copy
+    digest.update(data.data if flags is not None and flags.c_contiguous else data.tobytes())
+    return digest.hexdigest()
+
+
+def _digest_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def content_digest(data: Any) -> str | None:
+    """
+    Compute the sha256 of an inference input's content.
+
+    Supports raw bytes, file paths (content is hashed, not the name)
+    and array-likes exposing ``shape``/``dtype``/``tobytes``.
+
+    Args:
+        data: Model input
+
+    Returns:
+        Hex digest, or None if the input type can't be hashed
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return _digest_bytes(data)
+
+    if isinstance(data, (str, Path)):
+        path = Path(data)
+        if not path.is_file():
+            return None
+        # File read is blocking I/O: keep it off the event loop
+        return await asyncio.to_thread(_digest_file, path)
+
+    if hasattr(data, "tobytes") and hasattr(data, "shape"):
+        header = f"{getattr(data, 'dtype', '')}{tuple(data.shape)}".encode()
+        if getattr(data, "nbytes", 0) > INLINE_HASH_MAX_BYTES:
+            # Decoded photos are tens of MB: hash them off the event loop
+            return await asyncio.to_thread(_digest_array, header, data)
+        return _digest_array(header, data)
+
+    return None
+
+
+def _dhash_image(image: Any) -> int | None:
+    """64-bit difference hash of a decoded image (BGR, BGRA or grayscale)."""
+    import cv2
+    import numpy as np
+
+    image = np.asarray(image)
+    if image.ndim not in (2, 3) or image.size == 0:
+        return None
+    # Shrink first: area averaging makes the hash independent of resolution and JPEG noise
+    small = cv2.resize(image, (_DHASH_SIZE + 1, _DHASH_SIZE), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(np.ascontiguousarray(small[..., :3]), cv2.COLOR_BGR2GRAY)
+    value = 0
+    for bit in (small[:, 1:] > small[:, :-1]).flatten():
+        value = (value << 1) | int(bit)
+    return value
+
+
+def _dhash_encoded(data: bytes | bytearray | memoryview) -> int | None:
+    """dHash of an encoded image, decoded at 1/8 scale (JPEG decodes only the DC terms)."""
+    import cv2
+    import numpy as np
+
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    if image is None:
+        return None
+    return _dhash_image(image)
+
+
+def _dhash_file(path: Path) -> int | None:
+    return _dhash_encoded(path.read_bytes())
+
+
+async def perceptual_hash(data: Any) -> int | None:
+    """
+    Compute a 64-bit perceptual hash (dHash) of an image input.
+
+    Near-duplicate images (re-encoded, resized, slightly recompressed)
+    hash to values a few bits apart. Decoding and resizing run in a
+    worker thread.
+
+    Args:
+        data: Encoded image bytes, image file path, or decoded image array
+
+    Returns:
+        Hash as an int, or None if the input isn't a decodable image
+        (or numpy/opencv aren't installed)
+    """
+    try:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return await asyncio.to_thread(_dhash_encoded, data)
+        if isinstance(data, (str, Path)):
+            path = Path(data)
+            if not path.is_file():
+                return None
+            return await asyncio.to_thread(_dhash_file, path)
+        if hasattr(data, "shape") and hasattr(data, "dtype"):
+            return await asyncio.to_thread(_dhash_image, data)
+    except ImportError:
+        return None
+    except Exception:
+        # cv2.error on exotic dtypes/channel counts: no near-duplicate matching for this input
+        return None
+    return None
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two perceptual hashes."""
+    return bin(a ^ b).count("1")
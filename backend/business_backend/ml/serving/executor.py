@@ -0,0 +1,187 @@
+"""
+Inference Executor.
+
+Runs blocking model calls (YOLO/PyTorch forward passes) off the event
+loop so the API stays responsive while images are being classified:
+- Dedicated thread pool (torch intra-op threads configurable) or process pool
+- Semaphore capping in-flight inferences; extra calls wait in a queue
+- Queue depth, wait time and run time exposed for /api/metrics
+"""
+
+import asyncio
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from typing import Any, TypeVar
+
+from loguru import logger
+
+from business_backend.shared.latency import LatencyWindow
+
+T = TypeVar("T")
+
+
+class ExecutorKind(str, Enum):
+    """Where blocking inference runs."""
+
+    THREAD = "thread"  # Worker threads sharing the loaded model (torch releases the GIL)
+    PROCESS = "process"  # Worker processes, each loading its own copy of the model
+
+
+def _set_torch_threads(torch_threads: int | None) -> None:
+    """Set torch intra-op threads of the current process (process-wide, not per thread)."""
+    if not torch_threads:
+        return
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(torch_threads)
+
+
+class InferenceExecutor:
+    """
+    Bounded executor for blocking inference calls.
+
+    At most ``max_concurrency`` calls are submitted to the pool at once;
+    the others wait on a semaphore (the queue). A caller cancelled while
+    its inference runs doesn't free the slot until the work really ends,
+    so the cap holds for the CPU, not just for the awaiting coroutines.
+
+    Usage:
+        executor = InferenceExecutor(workers=2, torch_threads=4)
+        results = await executor.run(model, image)
+    """
+
+    def __init__(
+        self,
+        kind: ExecutorKind = ExecutorKind.THREAD,
+        workers: int = 1,
+        max_concurrency: int | None = None,
+        torch_threads: int | None = None,
+    ) -> None:
+        """
+        Initialize executor (the pool is started on first use).
+
+        Args:
+            kind: Thread or process pool
+            workers: Pool size
+            max_concurrency: In-flight inferences (defaults to ``workers``)
+            torch_threads: torch intra-op threads per worker (None keeps torch's default)
+        """
+        self.kind = ExecutorKind(kind)
+        self.workers = workers
+        self.max_concurrency = max_concurrency or workers
+        self.torch_threads = torch_threads
+        self._pool: Executor | None = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self.wait_times = LatencyWindow()
+        self.run_times = LatencyWindow()
+        self._waiting = 0
+        self._in_flight = 0
+        self._submitted = 0
+        self._failures = 0
+
+    @property
+    def pool(self) -> Executor:
+        """The underlying pool (created on first access)."""
+        if self._pool is None:
+            if self.kind == ExecutorKind.PROCESS:
+                # spawn: forking a process that already holds torch/OpenMP state can deadlock
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_set_torch_threads,
+                    initargs=(self.torch_threads,),
+                )
+            else:
+                # Threads share this process' torch thread pool: set it once here
+                _set_torch_threads(self.torch_threads)
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="inference",
+                )
+            logger.info(
+                f"Inference executor started: {self.workers} {self.kind.value} worker(s), "
+                f"max {self.max_concurrency} in flight, torch threads {self.torch_threads or 'default'}"
+            )
+        return self._pool
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run ``fn(*args)`` in the pool once a slot is free.
+
+        With a process pool, ``fn`` and its arguments must be picklable.
+
+        Args:
+            fn: Blocking callable
+            *args: Positional arguments for ``fn``
+
+        Returns:
+            ``fn``'s result
+        """
+        queued_at = time.monotonic()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self.wait_times.record(time.monotonic() - queued_at)
+
+        self._submitted += 1
+        self._in_flight += 1
+        started_at = time.monotonic()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+        except BaseException:
+            self._release(started_at)
+            raise
+        future.add_done_callback(lambda f: self._finished(f, started_at))
+        # shield: a cancelled caller must not release the slot of a still-running inference
+        return await asyncio.shield(future)
+
+    def _finished(self, future: "asyncio.Future[Any]", started_at: float) -> None:
+        if future.cancelled() or future.exception() is not None:
+            self._failures += 1
+        self._release(started_at)
+
+    def _release(self, started_at: float) -> None:
+        self._in_flight -= 1
+        self.run_times.record(time.monotonic() - started_at)
+        self._semaphore.release()
+
+    def shutdown(self) -> None:
+        """Stop the pool (running inferences finish first)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get executor counters.
+
+        Returns:
+            Dict with pool config, queue depth, in-flight count and wait/run percentiles
+        """
+
+        def ms(window: LatencyWindow, pct: float) -> float | None:
+            value = window.percentile(pct)
+            return value * 1000 if value is not None else None
+
+        return {
+            "kind": self.kind.value,
+            "workers": self.workers,
+            "torch_threads": self.torch_threads,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self._waiting,
+            "in_flight": self._in_flight,
+            "submitted": self._submitted,
+            "failures": self._failures,
+            "wait_p50_ms": ms(self.wait_times, 50),
+            "wait_p95_ms": ms(self.wait_times, 95),
+            "run_p50_ms": ms(self.run_times, 50),
+            "run_p95_ms": ms(self.run_times, 95),
+        }
@@ -0,0 +1,255 @@
+"""
+Inference Result Cache.
+
+Two-tier cache in front of InferenceService.predict:
+- Tier 1: exact match on the sha256 of the input content
+- Tier 2: optional near-duplicate match on the input's perceptual hash
+  (dHash) within a Hamming distance
+
+Entries are tagged with the model name and version they were computed
+with; the registry bumps a model's version whenever its weights are
+reloaded, so stale predictions are never served.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from business_backend.ml.serving.content_hash import hamming_distance
+
+# Fixed overhead per entry (key tuple, entry object, OrderedDict node)
+_ENTRY_OVERHEAD_BYTES = 256
+
+
+@dataclass
+class _CacheEntry:
+    """Cached prediction with the model version it is valid for."""
+
+    value: Any
+    model_name: str
+    model_version: str
+    variant: Hashable
+    created_at: float
+    size: int
+    phash: int | None
+
+
+def _approx_size(value: Any, depth: int = 0) -> int:
+    """Rough deep size of a prediction (dataclasses, dicts, lists, scalars)."""
+    size = sys.getsizeof(value)
+    if depth > 4:
+        return size
+    if isinstance(value, dict):
+        return size + sum(_approx_size(k, depth + 1) + _approx_size(v, depth + 1) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(_approx_size(v, depth + 1) for v in value)
+    if hasattr(value, "__dict__"):
+        return size + _approx_size(vars(value), depth + 1)
+    return size
+
+
+class InferenceCache:
+    """
+    LRU/TTL prediction cache bounded by entry count and approximate memory.
+
+    Tier 2 only compares entries of the same model, version and
+    variant, at most ``max_entries`` hashes per miss.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl_seconds: float = 3600.0,
+        perceptual_max_distance: int | None = None,
+    ) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum cached predictions (least recently used evicted)
+            max_bytes: Approximate memory bound for cached predictions
+            ttl_seconds: Entry lifetime
+            perceptual_max_distance: Largest dHash Hamming distance (of 64 bits)
+                for a tier 2 hit (None disables tier 2)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.perceptual_max_distance = perceptual_max_distance
+        self._entries: OrderedDict[tuple[str, str, Hashable, str], _CacheEntry] = OrderedDict()
+        self._bytes = 0
+
+        self._exact_hits = 0
+        self._near_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @property
+    def perceptual(self) -> bool:
+        """Whether the near-duplicate tier is on (callers skip computing hashes otherwise)."""
+        return self.perceptual_max_distance is not None
+
+    def get(
+        self,
+        model_name: str,
+        model_version: str,
+        digest: str,
+        phash: int | None = None,
+        variant: Hashable = None,
+    ) -> Any | None:
+        """
+        Look up a cached prediction.
+
+        Args:
+            model_name: Model the prediction must come from
+            model_version: Current version of the model
+            digest: sha256 of the input content
+            phash: Perceptual hash of the input, for the near-duplicate tier
+            variant: Anything else the result depends on (e.g. preprocessing on/off)
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        now = time.monotonic()
+
+        # Tier 1: exact content match
+        entry_key = (model_name, model_version, variant, digest)
+        entry = self._entries.get(entry_key)
+        if entry is not None:
+            if self._is_fresh(entry, now):
+                self._entries.move_to_end(entry_key)
+                self._exact_hits += 1
+                return entry.value
+            self._drop(entry_key)
+            self._expirations += 1
+
+        # Tier 2: closest perceptual hash among fresh entries of the same model version
+        if self.perceptual_max_distance is not None and phash is not None:
+            best_key: tuple[str, str, Hashable, str] | None = None
+            best_distance = self.perceptual_max_distance
+
+            for candidate_key, candidate in list(self._entries.items()):
+                if not self._is_fresh(candidate, now):
+                    self._drop(candidate_key)
+                    self._expirations += 1
+                    continue
+                if (
+                    candidate.phash is None
+                    or candidate.model_name != model_name
+                    or candidate.model_version != model_version
+                    or candidate.variant != variant
+                ):
+                    continue
+                distance = hamming_distance(phash, candidate.phash)
+                if distance <= best_distance:
+                    best_key, best_distance = candidate_key, distance
+
+            if best_key is not None:
+                self._entries.move_to_end(best_key)
+                self._near_hits += 1
+                return self._entries[best_key].value
+
+        self._misses += 1
+        return None
+
+    def put(
+        self,
+        model_name: str,
+        model_version: str,
+        digest: str,
+        value: Any,
+        phash: int | None = None,
+        variant: Hashable = None,
+    ) -> None:
+        """
+        Store a prediction.
+
+        Args:
+            model_name: Model that produced the prediction
+            model_version: Model version the prediction was computed with
+            digest: sha256 of the input content
+            value: Prediction to cache
+            phash: Perceptual hash of the input
+            variant: Anything else the result depends on
+        """
+        entry_key = (model_name, model_version, variant, digest)
+        if entry_key in self._entries:
+            self._drop(entry_key)
+
+        size = _approx_size(value) + _ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+        self._entries[entry_key] = _CacheEntry(
+            value=value,
+            model_name=model_name,
+            model_version=model_version,
+            variant=variant,
+            created_at=time.monotonic(),
+            size=size,
+            phash=phash,
+        )
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self._evictions += 1
+
+    def invalidate(self, model_name: str) -> int:
+        """
+        Drop every entry of a model (its weights changed).
+
+        Args:
+            model_name: Model identifier
+
+        Returns:
+            Number of entries removed
+        """
+        stale = [key for key, entry in self._entries.items() if entry.model_name == model_name]
+        for key in stale:
+            self._drop(key)
+        self._invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict with hits per tier, misses, evictions, memory use and hit rate
+        """
+        hits = self._exact_hits + self._near_hits
+        lookups = hits + self._misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "perceptual": self.perceptual,
+            "exact_hits": self._exact_hits,
+            "near_hits": self._near_hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "invalidations": self._invalidations,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def _is_fresh(self, entry: _CacheEntry, now: float) -> bool:
+        return now - entry.created_at < self.ttl_seconds
+
+    def _drop(self, key: tuple[str, str, Hashable, str]) -> None:
+        """Remove an entry and release its bytes."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
@@ -5,11 +5,16 @@ Generic service for running ML model inference.
 Orchestrates preprocessing, prediction, and postprocessing pipeline.
 """
 
+import copy
 from typing import Any
 from dataclasses import dataclass
 
 from business_backend.ml.models.registry import ModelRegistry
 from business_backend.ml.preprocessing.base import BasePreprocessor
+from business_backend.ml.serving.batching import BatchConfig, MicroBatcher
+from business_backend.ml.serving.content_hash import content_digest, perceptual_hash
+from business_backend.ml.serving.inference_cache import InferenceCache
+from business_backend.shared.singleflight import SingleFlight
 
 
 @dataclass
@@ -40,6 +45,9 @@ class InferenceService:
         self,
         model_registry: ModelRegistry,
         preprocessor: BasePreprocessor | None = None,
+        coalesce: bool = True,
+        batching: dict[str, BatchConfig] | None = None,
+        cache: InferenceCache | None = None,
     ) -> None:
         """
         Initialize inference service.
@@ -47,9 +55,20 @@ class InferenceService:
         Args:
             model_registry: Registry for loading models
             preprocessor: Optional preprocessor for input data
+            coalesce: Share one inference among concurrent calls on identical inputs
+            batching: Micro-batching config per model name (models not listed run one call per input)
+            cache: Optional result cache for repeated inputs (invalidated on model reload)
         """
         self.registry = model_registry
         self.preprocessor = preprocessor
+        self.flights: SingleFlight[PredictionResult] | None = (
+            SingleFlight() if coalesce else None
+        )
+        self.batching = batching or {}
+        self._batchers: dict[str, MicroBatcher[Any, dict[str, Any]]] = {}
+        self.cache = cache
+        if cache is not None:
+            model_registry.add_listener(cache.invalidate)
 
     async def predict(
         self,
@@ -68,6 +87,43 @@ class InferenceService:
         Returns:
             PredictionResult with prediction and metadata
         """
+        digest = None
+        if self.flights is not None or self.cache is not None:
+            digest = await content_digest(data)
+        if digest is None:
+            return await self._predict(model_name, data, preprocess)
+
+        version = self.registry.weights_version(model_name)
+        phash = None
+        if self.cache is not None and version is not None:
+            if self.cache.perceptual:
+                phash = await perceptual_hash(data)
+            cached = self.cache.get(model_name, version, digest, phash, variant=preprocess)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
+        if self.flights is not None:
+            # Identical inputs in flight (retries, re-scans) share one inference
+            result = await self.flights.do(
+                (model_name, preprocess, digest),
+                lambda: self._predict(model_name, data, preprocess),
+            )
+        else:
+            result = await self._predict(model_name, data, preprocess)
+
+        # Not cached if the weights were reloaded while this inference ran
+        if self.cache is not None and version is not None and version == self.registry.weights_version(model_name):
+            self.cache.put(model_name, version, digest, result, phash, variant=preprocess)
+        # The result object is shared with coalesced callers and the cache: hand out a copy
+        return copy.deepcopy(result)
+
+    async def _predict(
+        self,
+        model_name: str,
+        data: Any,
+        preprocess: bool,
+    ) -> PredictionResult:
+        """Run the preprocess/predict/format pipeline for one input."""
         # 1. Load model from registry
         model = await self.registry.load(model_name)
         
@@ -76,8 +132,12 @@ class InferenceService:
         if preprocess and self.preprocessor:
             input_data = await self.preprocessor.process(data)
             
-        # 3. Run model.predict()
-        result = await model.predict(input_data)
+        # 3. Run model.predict(), batched with concurrent calls when enabled
+        batcher = self._batcher(model_name)
+        if batcher is not None:
+            result = await batcher.submit(input_data)
+        else:
+            result = await model.predict(input_data)
         
         # 4. Format and return PredictionResult
         prediction_value = result.get("prediction")
@@ -91,11 +151,32 @@ class InferenceService:
             metadata=metadata
         )
 
+    def _batcher(self, model_name: str) -> MicroBatcher[Any, dict[str, Any]] | None:
+        """Micro-batcher of a model (created on first use), or None if batching is off for it."""
+        config = self.batching.get(model_name)
+        if config is None or not config.enabled:
+            return None
+        batcher = self._batchers.get(model_name)
+        if batcher is None:
+
+            async def run_batch(items: list[Any]) -> list[dict[str, Any]]:
+                # Resolved per batch so a reloaded model is picked up
+                model = await self.registry.load(model_name)
+                return await model.predict_batch(items)
+
+            batcher = self._batchers[model_name] = MicroBatcher(
+                run_batch,
+                max_batch_size=config.max_batch_size,
+                max_wait_ms=config.max_wait_ms,
+            )
+        return batcher
+
     async def predict_batch(
         self,
         model_name: str,
         data_list: list[Any],
         preprocess: bool = True,
+        batch_size: int | None = None,
     ) -> list[PredictionResult]:
         """
         Run batch inference.
@@ -104,6 +185,7 @@ class InferenceService:
             model_name: Name of registered model
             data_list: List of input data items
             preprocess: Whether to run preprocessing
+            batch_size: Inputs per forward pass (defaults to the model's)
 
         Returns:
             List of PredictionResults
@@ -114,7 +196,7 @@ class InferenceService:
         if preprocess and self.preprocessor:
             processed_list = await self.preprocessor.process_batch(data_list)
             
-        batch_results = await model.predict_batch(processed_list)
+        batch_results = await model.predict_batch(processed_list, batch_size=batch_size)
         
         return [
             PredictionResult(
@@ -174,3 +256,20 @@ class InferenceService:
             "registered": is_registered,
             "loaded": is_loaded
         }
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get inference metrics.
+
+        Returns:
+            Dict with model registry, cache, coalescing, executor and per-model batching
+            counters (None if disabled)
+        """
+        executor = self.registry.executor
+        return {
+            "models": self.registry.get_stats(),
+            "cache": self.cache.get_stats() if self.cache else None,
+            "coalescing": self.flights.get_stats() if self.flights else None,
+            "executor": executor.get_stats() if executor else None,
+            "batching": {name: b.get_stats() for name, b in self._batchers.items()} or None,
+        }
@@ -0,0 +1,176 @@
+"""
+Model Warmup.
+
+Loads serving models at startup and runs forward passes on synthetic
+inputs, so the first real request doesn't pay for deserialization and
+first-inference setup (predictor construction, allocator and kernel
+caches per input shape). Readiness is reported per model.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from loguru import logger
+
+from business_backend.ml.models.registry import ModelRegistry, ModelStage
+
+
+class WarmupState(str, Enum):
+    """Startup state of one model."""
+
+    PENDING = "pending"
+    LOADING = "loading"
+    WARMING = "warming"
+    READY = "ready"
+    FAILED = "failed"
+
+
+@dataclass
+class ModelWarmupStatus:
+    """Startup progress of one model."""
+
+    state: WarmupState = WarmupState.PENDING
+    load_ms: float | None = None
+    warmup_ms: float | None = None
+    error: str | None = None
+
+
+def parse_resolution(value: str) -> tuple[int, int]:
+    """
+    Parse a ``WIDTHxHEIGHT`` string.
+
+    Args:
+        value: e.g. "640x480"
+
+    Returns:
+        (width, height)
+    """
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+class ModelWarmup:
+    """
+    Eager load and warmup of serving models.
+
+    ``ready`` turns true once every model is loaded and warm (at once
+    when warmup is disabled: models then load lazily on first use).
+
+    Usage:
+        warmup = ModelWarmup(registry, resolutions=[(640, 480)])
+        warmup.start()
+        ...
+        if warmup.ready: ...
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        models: list[str] | None = None,
+        resolutions: list[tuple[int, int]] | None = None,
+        runs: int = 1,
+        enabled: bool = True,
+    ) -> None:
+        """
+        Initialize warmup.
+
+        Args:
+            registry: Registry holding the models
+            models: Models to warm (None: every production model)
+            resolutions: (width, height) of the synthetic inputs, one pass set per resolution
+            runs: Passes per resolution
+            enabled: False skips warmup and reports ready immediately
+        """
+        self.registry = registry
+        self.models = models
+        self.resolutions = resolutions or [(640, 480)]
+        self.runs = runs
+        self.enabled = enabled
+        self.status: dict[str, ModelWarmupStatus] = {}
+        self._task: asyncio.Task[bool] | None = None
+        self._done = not enabled
+
+    @property
+    def ready(self) -> bool:
+        """Every model is loaded and warm."""
+        return self._done and all(s.state == WarmupState.READY for s in self.status.values())
+
+    def start(self) -> "asyncio.Task[bool]":
+        """
+        Run warmup in a background task (idempotent).
+
+        Returns:
+            Task resolving to ``ready``
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def run(self) -> bool:
+        """
+        Load and warm every model, one after another.
+
+        Returns:
+            True if all models are ready
+        """
+        if not self.enabled:
+            return True
+
+        names = self.models
+        if names is None:
+            names = [info.name for info in self.registry.list_models(ModelStage.PRODUCTION)]
+        self.status = {name: ModelWarmupStatus() for name in names}
+
+        started_at = time.monotonic()
+        for name in names:
+            await self._warm(name, self.status[name])
+        self._done = True
+
+        logger.info(
+            f"Model warmup finished in {time.monotonic() - started_at:.1f}s: "
+            f"{sum(s.state == WarmupState.READY for s in self.status.values())}/{len(names)} ready"
+        )
+        return self.ready
+
+    async def _warm(self, name: str, status: ModelWarmupStatus) -> None:
+        try:
+            status.state = WarmupState.LOADING
+            started_at = time.monotonic()
+            model = await self.registry.load(name)
+            status.load_ms = (time.monotonic() - started_at) * 1000
+
+            status.state = WarmupState.WARMING
+            started_at = time.monotonic()
+            await model.warmup(self.resolutions, runs=self.runs)
+            status.warmup_ms = (time.monotonic() - started_at) * 1000
+            status.state = WarmupState.READY
+            logger.info(f"Model '{name}' ready: load {status.load_ms:.0f}ms, warmup {status.warmup_ms:.0f}ms")
+        except Exception as e:
+            status.state = WarmupState.FAILED
+            status.error = f"{type(e).__name__}: {e}"
+            logger.exception(f"Warmup of model '{name}' failed: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get readiness details.
+
+        Returns:
+            Dict with overall readiness and per-model state and timings
+        """
+        return {
+            "ready": self.ready,
+            "enabled": self.enabled,
+            "resolutions": [f"{w}x{h}" for w, h in self.resolutions],
+            "models": {
+                name: {
+                    "state": s.state.value,
+                    "load_ms": s.load_ms,
+                    "warmup_ms": s.warmup_ms,
+                    "error": s.error,
+                }
+                for name, s in self.status.items()
+            },
+        }
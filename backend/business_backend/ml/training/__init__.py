@@ -2,5 +2,8 @@
 
 from business_backend.ml.training.trainer import Trainer, TrainConfig, TrainResult
 from business_backend.ml.training.experiment_tracker import ExperimentTracker
+from business_backend.ml.training.export import export_onnx
+from business_backend.ml.training.quantization import QuantizationConfig, QuantizationPipeline, QuantizationResult
 
-__all__ = ["Trainer", "TrainConfig", "TrainResult", "ExperimentTracker"]
+__all__ = ["Trainer", "TrainConfig", "TrainResult", "ExperimentTracker", "export_onnx",
+           "QuantizationConfig", "QuantizationPipeline", "QuantizationResult"]
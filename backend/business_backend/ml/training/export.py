@@ -0,0 +1,75 @@
+"""
+Model Export.
+
+Exports trained YOLO weights (best.pt) to ONNX for CPU serving with
+ONNX Runtime (see ``ml.models.onnx_detector``).
+
+Usage (from backend/):
+    poetry run python -m business_backend.ml.training.export ml/weights/best.pt
+"""
+
+import argparse
+import shutil
+from pathlib import Path
+
+from loguru import logger
+
+
+def export_onnx(
+    weights: str | Path,
+    output: str | Path | None = None,
+    imgsz: int = 640,
+    dynamic: bool = True,
+    simplify: bool = True,
+    opset: int | None = None,
+) -> Path:
+    """
+    Export YOLO weights to ONNX with Ultralytics' exporter.
+
+    The exported file carries the class names, input size and stride
+    as metadata, which OnnxDetector reads back.
+
+    Args:
+        weights: Trained ``.pt`` weights
+        output: Destination ``.onnx`` path (defaults to next to ``weights``)
+        imgsz: Square input size the graph is exported for
+        dynamic: Symbolic batch, height and width axes: batches run in one session call
+            and images keep the minimal letterbox rectangle of the PyTorch path
+        simplify: Fold constants and simplify the graph (onnxslim)
+        opset: ONNX opset (None: Ultralytics' default)
+
+    Returns:
+        Path of the exported model
+    """
+    from ultralytics import YOLO
+
+    weights = Path(weights)
+    logger.info(f"Exporting {weights} to ONNX (imgsz={imgsz}, dynamic={dynamic})")
+    exported = Path(
+        YOLO(str(weights)).export(
+            format="onnx",
+            imgsz=imgsz,
+            dynamic=dynamic,
+            simplify=simplify,
+            opset=opset,
+            device="cpu",
+        )
+    )
+
+    if output is not None and Path(output) != exported:
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        exported = Path(shutil.move(str(exported), output))
+    logger.info(f"ONNX model written to {exported}")
+    return exported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export YOLO weights to ONNX")
+    _ = parser.add_argument("weights", help="Trained .pt weights")
+    _ = parser.add_argument("--output", default=None, help="Destination .onnx path")
+    _ = parser.add_argument("--imgsz", type=int, default=640)
+    _ = parser.add_argument("--static", action="store_true", help="Fixed input shape (batch 1, imgsz x imgsz)")
+    _ = parser.add_argument("--opset", type=int, default=None)
+    args = parser.parse_args()
+    export_onnx(args.weights, args.output, imgsz=args.imgsz, dynamic=not args.static, opset=args.opset)
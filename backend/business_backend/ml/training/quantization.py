@@ -0,0 +1,496 @@
+"""
+INT8 Post-Training Quantization.
+
+Quantizes a YOLO ONNX model to INT8 for CPU serving:
+1. Calibrate activation ranges on a random sample of the training images
+2. Quantize statically (QDQ, per-channel weights; the detection head stays FP32)
+3. Evaluate FP32 and INT8 on the validation split: mAP, top-1, latency
+4. Register the INT8 model as a new version; promote it to serve only
+   if accuracy stays within the configured tolerance
+
+Usage (from backend/):
+    poetry run python -m business_backend.ml.training.quantization ml/weights/best.pt --data data.yaml
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from business_backend.ml.models.registry import ModelRegistry, ModelStage
+from business_backend.ml.training.experiment_tracker import ExperimentTracker
+from business_backend.ml.training.export import export_onnx
+
+try:
+    from onnxruntime.quantization import CalibrationDataReader
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    CalibrationDataReader = object
+    ONNXRUNTIME_AVAILABLE = False
+
+_IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+# Ultralytics node names: "/model.<module index>/..."
+_MODULE_INDEX = re.compile(r"^/model\.(\d+)/")
+
+
+@dataclass
+class QuantizationConfig:
+    """Configuration for INT8 quantization and promotion."""
+
+    calibration_samples: int = 200
+    calibration_method: str = "minmax"  # "minmax", "entropy" or "percentile"
+    per_channel: bool = True
+    # The Detect head (box regression, DFL, class scores) loses the most accuracy in INT8
+    quantize_head: bool = False
+    eval_samples: int = 200  # Validation images for top-1 and latency (mAP uses the whole split)
+    compute_map: bool = True
+    imgsz: int = 640
+    intra_op_threads: int | None = None
+    # Promotion gates: absolute drops allowed vs FP32, minimum p50 speedup
+    max_map_drop: float = 0.01
+    max_top1_drop: float = 0.01
+    min_speedup: float = 1.0
+    seed: int = 0
+
+
+@dataclass
+class EvalMetrics:
+    """Accuracy and latency of one model on the validation sample."""
+
+    map50_95: float | None
+    map50: float | None
+    top1: float | None
+    latency_p50_ms: float
+    latency_p95_ms: float
+    images: int
+
+
+@dataclass
+class QuantizationResult:
+    """Outcome of a quantization run."""
+
+    model_name: str
+    version: str
+    fp32_path: Path
+    int8_path: Path
+    fp32: EvalMetrics
+    int8: EvalMetrics
+    promoted: bool
+    rejections: list[str] = field(default_factory=list)
+
+
+class ImageCalibrationReader(CalibrationDataReader):
+    """Feeds calibration images to ONNX Runtime one at a time, preprocessed like serving."""
+
+    def __init__(self, detector: Any, images: list[Path]) -> None:
+        """
+        Initialize reader.
+
+        Args:
+            detector: OnnxDetector of the FP32 model (input name and preprocessing)
+            images: Calibration image paths
+        """
+        self.detector = detector
+        self.images = images
+        self._next = 0
+
+    def get_next(self) -> dict[str, Any] | None:
+        while self._next < len(self.images):
+            path = self.images[self._next]
+            self._next += 1
+            try:
+                image = self.detector.read_image(path)
+            except FileNotFoundError:
+                logger.warning(f"Skipping unreadable calibration image {path}")
+                continue
+            return {self.detector.input_name: self.detector.preprocess([image])}
+        return None
+
+    def rewind(self) -> None:
+        self._next = 0
+
+
+def _list_images(source: Any) -> list[Path]:
+    """Images of an Ultralytics split entry: directory, list file, or a list of either."""
+    if isinstance(source, (list, tuple)):
+        return [image for item in source for image in _list_images(item)]
+    path = Path(source)
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*") if p.suffix.lower() in _IMAGE_SUFFIXES)
+    if path.suffix == ".txt" and path.is_file():
+        root = path.parent
+        return [(root / line.strip()).resolve() for line in path.read_text().splitlines() if line.strip()]
+    return []
+
+
+def _label_path(image: Path) -> Path:
+    """YOLO layout: .../images/x.jpg -> .../labels/x.txt."""
+    parts = list(image.parts)
+    if "images" in parts:
+        parts[len(parts) - 1 - parts[::-1].index("images")] = "labels"
+    return Path(*parts).with_suffix(".txt")
+
+
+def _dominant_class(label_file: Path) -> int | None:
+    """Class of the largest labelled object (boxes or segmentation polygons), None if unlabelled."""
+    if not label_file.is_file():
+        return None
+    best: tuple[float, int] | None = None
+    for line in label_file.read_text().splitlines():
+        values = line.split()
+        if len(values) < 5:
+            continue
+        coords = [float(v) for v in values[1:]]
+        if len(coords) == 4:
+            area = coords[2] * coords[3]
+        else:
+            xs, ys = coords[0::2], coords[1::2]
+            area = (max(xs) - min(xs)) * (max(ys) - min(ys))
+        if best is None or area > best[0]:
+            best = (area, int(values[0]))
+    return best[1] if best else None
+
+
+def _head_nodes(model_path: Path) -> list[str]:
+    """Nodes of the last Ultralytics module (the Detect/Segment head)."""
+    import onnx
+
+    names = [node.name for node in onnx.load(str(model_path)).graph.node]
+    indices = [int(m.group(1)) for name in names if (m := _MODULE_INDEX.match(name))]
+    if not indices:
+        return []
+    prefix = f"/model.{max(indices)}/"
+    return [name for name in names if name.startswith(prefix)]
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class QuantizationPipeline:
+    """
+    Post-training INT8 quantization with an accuracy gate.
+
+    The INT8 model is always registered as ``<name>_int8`` (staging).
+    When it passes the gates, ``<name>`` is re-registered to serve it
+    (the previous weights stay registered as ``<name>_fp32``, archived,
+    for rollback) and the loaded FP32 model is unloaded.
+
+    Usage:
+        pipeline = QuantizationPipeline(registry, QuantizationConfig(max_map_drop=0.02))
+        result = await pipeline.run("product_classifier", "datasets/laptops/data.yaml")
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        config: QuantizationConfig | None = None,
+        experiment_tracker: ExperimentTracker | None = None,
+    ) -> None:
+        """
+        Initialize pipeline.
+
+        Args:
+            registry: Registry holding the FP32 model
+            config: Quantization and promotion settings
+            experiment_tracker: Optional tracker for params and metrics
+        """
+        self.registry = registry
+        self.config = config or QuantizationConfig()
+        self.tracker = experiment_tracker
+
+    async def run(
+        self,
+        model_name: str,
+        data: str | Path,
+        output: str | Path | None = None,
+    ) -> QuantizationResult:
+        """
+        Quantize a registered model, evaluate it and promote it if it passes.
+
+        Args:
+            model_name: Registered FP32 model (.pt weights are exported to ONNX first)
+            data: Ultralytics dataset YAML (train split calibrates, val split evaluates)
+            output: INT8 model path (defaults to ``<fp32>.int8.onnx``)
+
+        Returns:
+            QuantizationResult with both evaluations and the promotion decision
+
+        Raises:
+            KeyError: If model not registered
+        """
+        info = self.registry.get_info(model_name)
+        if info is None:
+            raise KeyError(f"Model '{model_name}' not found in registry")
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError("onnxruntime is required for quantization: poetry install --extras onnx")
+        config = self.config
+
+        fp32_path = Path(info.model_path)
+        if fp32_path.suffix.lower() != ".onnx":
+            fp32_path = await asyncio.to_thread(export_onnx, fp32_path, imgsz=config.imgsz)
+        int8_path = Path(output) if output else fp32_path.with_name(f"{fp32_path.stem}.int8.onnx")
+
+        from ultralytics.data.utils import check_det_dataset
+
+        dataset = await asyncio.to_thread(check_det_dataset, str(data))
+        rng = random.Random(config.seed)
+        train_images = _list_images(dataset["train"])
+        val_images = _list_images(dataset["val"])
+        calibration = rng.sample(train_images, min(config.calibration_samples, len(train_images)))
+        evaluation = rng.sample(val_images, min(config.eval_samples, len(val_images)))
+        if not calibration or not evaluation:
+            raise ValueError(f"{data}: no train/val images found")
+
+        if self.tracker:
+            self.tracker.start_run("quantization", run_name=f"{model_name}-int8")
+            self.tracker.log_params({**asdict(config), "model_name": model_name, "fp32_path": str(fp32_path)})
+
+        await asyncio.to_thread(self._quantize, fp32_path, int8_path, calibration)
+        fp32 = await asyncio.to_thread(self._evaluate, fp32_path, data, evaluation)
+        int8 = await asyncio.to_thread(self._evaluate, int8_path, data, evaluation)
+
+        result = QuantizationResult(
+            model_name=model_name,
+            version=f"{info.version}-int8",
+            fp32_path=fp32_path,
+            int8_path=int8_path,
+            fp32=fp32,
+            int8=int8,
+            promoted=False,
+            rejections=self._check(fp32, int8),
+        )
+        await self._register(result)
+        self._write_report(result)
+
+        if self.tracker:
+            self.tracker.log_metrics(
+                {f"{name}_{key}": value
+                 for name, metrics in (("fp32", fp32), ("int8", int8))
+                 for key, value in asdict(metrics).items() if value is not None}
+            )
+            self.tracker.log_artifact(int8_path)
+            self.tracker.end_run()
+        return result
+
+    def _quantize(self, fp32_path: Path, int8_path: Path, images: list[Path]) -> Path:
+        """Static QDQ quantization calibrated on ``images`` (blocking)."""
+        from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_static
+        from onnxruntime.quantization.shape_inference import quant_pre_process
+
+        from business_backend.ml.models.onnx_detector import OnnxDetector
+
+        config = self.config
+        methods = {
+            "minmax": CalibrationMethod.MinMax,
+            "entropy": CalibrationMethod.Entropy,
+            "percentile": CalibrationMethod.Percentile,
+        }
+
+        # Shape inference + graph cleanup first: ORT's recommended input for quantization
+        prepared = int8_path.with_name(f"{fp32_path.stem}.prep.onnx")
+        quant_pre_process(str(fp32_path), str(prepared))
+        excluded = [] if config.quantize_head else _head_nodes(prepared)
+
+        detector = OnnxDetector(fp32_path, intra_op_threads=config.intra_op_threads)
+        logger.info(
+            f"Quantizing {fp32_path.name} to INT8: {len(images)} calibration image(s), "
+            f"{config.calibration_method}, {len(excluded)} head node(s) kept in FP32"
+        )
+        try:
+            quantize_static(
+                prepared,
+                int8_path,
+                ImageCalibrationReader(detector, images),
+                quant_format=QuantFormat.QDQ,
+                per_channel=config.per_channel,
+                activation_type=QuantType.QUInt8,
+                weight_type=QuantType.QInt8,
+                nodes_to_exclude=excluded,
+                calibrate_method=methods[config.calibration_method],
+            )
+        finally:
+            prepared.unlink(missing_ok=True)
+        # quantize_static drops the metadata OnnxDetector needs (names, imgsz, stride)
+        self._copy_metadata(fp32_path, int8_path)
+        logger.info(f"INT8 model written to {int8_path}")
+        return int8_path
+
+    @staticmethod
+    def _copy_metadata(source: Path, target: Path) -> None:
+        import onnx
+
+        source_model = onnx.load(str(source), load_external_data=False)
+        target_model = onnx.load(str(target))
+        existing = {prop.key for prop in target_model.metadata_props}
+        for prop in source_model.metadata_props:
+            if prop.key not in existing:
+                target_model.metadata_props.add(key=prop.key, value=prop.value)
+        onnx.save(target_model, str(target))
+
+    def _evaluate(self, model_path: Path, data: str | Path, images: list[Path]) -> EvalMetrics:
+        """mAP on the val split, top-1 and single-image latency on ``images`` (blocking)."""
+        from business_backend.ml.models.image_classifier import _yolo_predict
+        from business_backend.ml.models.onnx_detector import OnnxDetector
+
+        config = self.config
+        detector = OnnxDetector(model_path, intra_op_threads=config.intra_op_threads)
+
+        latencies: list[float] = []
+        correct = labelled = 0
+        warmed_up = False
+        for path in images:
+            try:
+                image = detector.read_image(path)
+            except FileNotFoundError:
+                continue
+            if not warmed_up:
+                _yolo_predict(detector, image)
+                warmed_up = True
+
+            start = time.perf_counter()
+            prediction = _yolo_predict(detector, image)
+            latencies.append(time.perf_counter() - start)
+
+            expected = _dominant_class(_label_path(path))
+            if expected is not None:
+                labelled += 1
+                correct += prediction["prediction"] == detector.names.get(expected)
+
+        map50_95 = map50 = None
+        if config.compute_map:
+            from ultralytics import YOLO
+
+            metrics = YOLO(str(model_path)).val(
+                data=str(data), imgsz=config.imgsz, batch=1, device="cpu", plots=False, verbose=False
+            )
+            map50_95, map50 = float(metrics.box.map), float(metrics.box.map50)
+
+        if not latencies:
+            raise ValueError("No readable evaluation images")
+        result = EvalMetrics(
+            map50_95=map50_95,
+            map50=map50,
+            top1=correct / labelled if labelled else None,
+            latency_p50_ms=_percentile(latencies, 50) * 1000,
+            latency_p95_ms=_percentile(latencies, 95) * 1000,
+            images=len(latencies),
+        )
+        logger.info(f"Evaluated {model_path.name}: {result}")
+        return result
+
+    def _check(self, fp32: EvalMetrics, int8: EvalMetrics) -> list[str]:
+        """Reasons to refuse promotion (empty: promote)."""
+        config = self.config
+        rejections = []
+        if fp32.map50_95 is not None and int8.map50_95 is not None:
+            drop = fp32.map50_95 - int8.map50_95
+            if drop > config.max_map_drop:
+                rejections.append(f"mAP50-95 dropped {drop:.4f} (max {config.max_map_drop})")
+        if fp32.top1 is not None and int8.top1 is not None:
+            drop = fp32.top1 - int8.top1
+            if drop > config.max_top1_drop:
+                rejections.append(f"top-1 dropped {drop:.4f} (max {config.max_top1_drop})")
+        speedup = fp32.latency_p50_ms / int8.latency_p50_ms
+        if speedup < config.min_speedup:
+            rejections.append(f"p50 speedup {speedup:.2f}x (min {config.min_speedup}x)")
+        return rejections
+
+    async def _register(self, result: QuantizationResult) -> None:
+        """Register the INT8 candidate; swap it in for the FP32 model if it passed."""
+        info = self.registry.get_info(result.model_name)
+        metadata = {
+            "quantized_from": str(result.fp32_path),
+            "fp32": asdict(result.fp32),
+            "int8": asdict(result.int8),
+            "rejections": result.rejections,
+        }
+        candidate = f"{result.model_name}_int8"
+        self.registry.register(
+            candidate,
+            info.model_class,
+            result.int8_path,
+            stage=ModelStage.STAGING,
+            version=result.version,
+            metadata=metadata,
+        )
+
+        if result.rejections:
+            logger.warning(
+                f"INT8 {result.model_name} {result.version} not promoted: {'; '.join(result.rejections)}"
+            )
+            return
+
+        self.registry.register(
+            f"{result.model_name}_fp32",
+            info.model_class,
+            info.model_path,
+            stage=ModelStage.ARCHIVED,
+            version=info.version,
+            metadata=info.metadata,
+        )
+        self.registry.register(
+            result.model_name,
+            info.model_class,
+            result.int8_path,
+            stage=info.stage,
+            version=result.version,
+            metadata=metadata,
+        )
+        self.registry.unregister(candidate)
+        # The FP32 instance stays cached until unloaded: next load() reads the INT8 file
+        await self.registry.unload(result.model_name)
+        result.promoted = True
+        logger.info(f"Promoted INT8 {result.model_name} {result.version}")
+
+    @staticmethod
+    def _write_report(result: QuantizationResult) -> None:
+        """Save the evaluation next to the INT8 model (``<model>.json``)."""
+        report = {**asdict(result), "fp32_path": str(result.fp32_path), "int8_path": str(result.int8_path)}
+        result.int8_path.with_suffix(".json").write_text(json.dumps(report, indent=2))
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from business_backend.ml.models.image_classifier import ImageClassifier
+
+    registry = ModelRegistry()
+    registry.register(args.name, ImageClassifier, args.weights, stage=ModelStage.PRODUCTION)
+    config = QuantizationConfig(
+        calibration_samples=args.calibration_samples,
+        calibration_method=args.method,
+        eval_samples=args.eval_samples,
+        compute_map=not args.no_map,
+        imgsz=args.imgsz,
+        intra_op_threads=args.threads,
+        max_map_drop=args.max_map_drop,
+        max_top1_drop=args.max_top1_drop,
+    )
+    result = await QuantizationPipeline(registry, config).run(args.name, args.data, args.output)
+    print(json.dumps({"fp32": asdict(result.fp32), "int8": asdict(result.int8)}, indent=2))
+    print("promoted" if result.promoted else f"not promoted: {'; '.join(result.rejections)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="INT8 quantization with an accuracy gate")
+    _ = parser.add_argument("weights", help="FP32 .pt weights or .onnx export")
+    _ = parser.add_argument("--data", required=True, help="Ultralytics dataset YAML")
+    _ = parser.add_argument("--name", default="product_classifier")
+    _ = parser.add_argument("--output", default=None, help="INT8 .onnx path")
+    _ = parser.add_argument("--calibration-samples", type=int, default=200)
+    _ = parser.add_argument("--method", default="minmax", choices=["minmax", "entropy", "percentile"])
+    _ = parser.add_argument("--eval-samples", type=int, default=200)
+    _ = parser.add_argument("--no-map", action="store_true", help="Skip mAP (top-1 and latency only)")
+    _ = parser.add_argument("--imgsz", type=int, default=640)
+    _ = parser.add_argument("--threads", type=int, default=None)
+    _ = parser.add_argument("--max-map-drop", type=float, default=0.01)
+    _ = parser.add_argument("--max-top1-drop", type=float, default=0.01)
+    asyncio.run(_main(parser.parse_args()))
@@ -1,7 +1,8 @@
 """Business Backend Services."""
 
+from business_backend.services.inventory_context import InventoryContext
 from business_backend.services.product_service import ProductService
-from business_backend.services.search_service import SearchService
+from business_backend.services.search_service import SearchMode, SearchService
 from business_backend.services.tenant_data_service import TenantDataService
 
-__all__ = ["ProductService", "SearchService", "TenantDataService"]
+__all__ = ["InventoryContext", "ProductService", "SearchMode", "SearchService", "TenantDataService"]
@@ -4,11 +4,41 @@ Agent Service for Business Backend.
 Handles the 'Agent 2' logic: Recognition & Request Refinement.
 """
 
-from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
-from langchain_core.language_models import BaseChatModel
+import hashlib
+import json
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
 
+from langchain_core.messages import BaseMessage
+from loguru import logger
+
+from business_backend.llm.agent_executor import AgentExecutor
+from business_backend.llm.prompts import (
+    SALES_AGENT_SYSTEM_PROMPT,
+    SALES_AGENT_TOOLS_SYSTEM_PROMPT,
+    build_chat_messages,
+    context_section,
+)
 from business_backend.llm.provider import LLMProvider
+from business_backend.llm.resilience import LatencyWindow, LLMUnavailableError
+from business_backend.llm.tools.executor import ToolExecutor
+from business_backend.services.conversation_store import (
+    ConversationStore,
+    InMemoryConversationBackend,
+)
+from business_backend.services.inventory_context import InventoryContext
 from business_backend.services.product_service import ProductService
+from business_backend.shared.singleflight import SingleFlight
+
+
+@dataclass
+class ChatTurn:
+    """Reply to one chat turn and the conversation it belongs to."""
+
+    reply: str
+    conversation_id: str
 
 
 class AgentService:
@@ -18,6 +48,12 @@ class AgentService:
         self,
         llm_provider: LLMProvider | None,
         product_service: ProductService,
+        tool_executor: ToolExecutor | None = None,
+        coalesce: bool = True,
+        inventory_context: InventoryContext | None = None,
+        conversation_store: ConversationStore | None = None,
+        agent_executor: AgentExecutor | None = None,
+        inventory_on_demand: bool = True,
     ) -> None:
         """
         Initialize AgentService.
@@ -25,17 +61,144 @@ class AgentService:
         Args:
             llm_provider: Provider for the LLM (OpenAI/Groq)
             product_service: Service to access inventory context
+            tool_executor: Shared tool executor (product search, image recognition)
+            coalesce: Share one LLM computation among identical concurrent chat turns
+            inventory_context: Cached catalog used to pick the products put in the prompt
+            conversation_store: Server-side chat sessions (in-memory by default)
+            agent_executor: Multi-step tool loop (built from the provider and
+                tool_executor if not given)
+            inventory_on_demand: With tools, send only the brand overview and let
+                the agent query the inventory instead of putting products in every prompt
         """
         self.llm_provider = llm_provider
         self.product_service = product_service
+        self.tool_executor = tool_executor
+        self.inventory_context = inventory_context or InventoryContext(product_service)
+        self.conversation_store = conversation_store or ConversationStore(
+            InMemoryConversationBackend()
+        )
+        self.flights: SingleFlight[str] | None = SingleFlight() if coalesce else None
+
+        if agent_executor is None and llm_provider is not None and tool_executor is not None:
+            agent_executor = AgentExecutor(llm_provider, tool_executor)
+        self.agent_executor = agent_executor
+        self.inventory_on_demand = inventory_on_demand and agent_executor is not None
+
+        # Time to first byte: whole reply (POST /chat) vs first token (streaming)
+        self._reply_latency = LatencyWindow(size=500)
+        self._stream_ttfb = LatencyWindow(size=500)
+        self._stream_latency = LatencyWindow(size=500)
+        self._streams = 0
+        self._streams_cancelled = 0
+
+    async def chat(
+        self,
+        conversation_id: str | None,
+        messages: list[dict],
+        context_data: str = "",
+    ) -> ChatTurn:
+        """
+        Run one turn of a server-side conversation.
+
+        With a known ``conversation_id`` only the new messages need to be
+        sent; the stored (token-budgeted) history is prepended. Without one,
+        or when it expired, ``messages`` seeds a new conversation.
+
+        Args:
+            conversation_id: ID returned by a previous turn, or None
+            messages: New message dicts ({'role': 'user'|'assistant', 'content': '...'})
+            context_data: Extra data from vision system (detected SKU, etc.)
+
+        Returns:
+            ChatTurn with the reply and the conversation ID to send next time
+        """
+        store = self.conversation_store
+        conversation_id = conversation_id or store.new_id()
+        start = time.monotonic()
+
+        # Turns of the same conversation run one at a time
+        async with store.lock(conversation_id):
+            conversation = await store.load(conversation_id)
+            store.append(conversation, messages)
+            reply = await self.generate_refined_request(
+                conversation.messages, context_data, summary=conversation.summary
+            )
+            store.append(conversation, [{"role": "assistant", "content": reply}])
+            await store.save(conversation)
+
+        self._reply_latency.record(time.monotonic() - start)
+        return ChatTurn(reply=reply, conversation_id=conversation.id)
+
+    async def chat_stream(
+        self,
+        conversation_id: str | None,
+        messages: list[dict],
+        context_data: str = "",
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Run one conversation turn, yielding the reply as it is generated.
+
+        Events are dicts with a ``type``:
+        - ``start``: {'conversationId'}
+        - ``token``: {'content'} — a piece of the reply
+        - ``done``: {'reply', 'conversationId'} — the turn was saved
+
+        Closing the iterator (client disconnected) aborts the upstream LLM
+        call; the turn is then not saved to the conversation.
 
-    async def generate_refined_request(self, messages: list[dict], context_data: str = "") -> str:
+        Args:
+            conversation_id: ID returned by a previous turn, or None
+            messages: New message dicts ({'role': 'user'|'assistant', 'content': '...'})
+            context_data: Extra data from vision system (detected SKU, etc.)
+
+        Yields:
+            Stream events
+        """
+        store = self.conversation_store
+        conversation_id = conversation_id or store.new_id()
+        start = time.monotonic()
+        completed = False
+        self._streams += 1
+
+        yield {"type": "start", "conversationId": conversation_id}
+        try:
+            async with store.lock(conversation_id):
+                conversation = await store.load(conversation_id)
+                store.append(conversation, messages)
+
+                parts: list[str] = []
+                async for token in self._stream_reply(
+                    conversation.messages, context_data, conversation.summary
+                ):
+                    if not parts:
+                        self._stream_ttfb.record(time.monotonic() - start)
+                    parts.append(token)
+                    yield {"type": "token", "content": token}
+
+                reply = "".join(parts)
+                store.append(conversation, [{"role": "assistant", "content": reply}])
+                await store.save(conversation)
+
+            completed = True
+            self._stream_latency.record(time.monotonic() - start)
+            yield {"type": "done", "reply": reply, "conversationId": conversation_id}
+        finally:
+            if not completed:
+                self._streams_cancelled += 1
+
+    async def generate_refined_request(
+        self,
+        messages: list[dict],
+        context_data: str = "",
+        summary: str = "",
+    ) -> str:
         """
         Generate a refined request (Agent 2) based on chat history.
 
         Args:
             messages: List of message dicts ({'role': 'user'|'assistant', 'content': '...'})
             context_data: Extra data from vision system (detected SKU, etc.)
+            summary: Summary of earlier turns not included in ``messages``
 
         Returns:
             The refined request string from the LLM.
@@ -43,62 +206,160 @@ class AgentService:
         if not self.llm_provider:
             return "Error: LLM not configured."
 
-        # 1. Fetch Inventory for Context
-        products = await self.product_service.list_products(limit=100)
-        inventory_context = "\n".join(
-            [f"- {p.brand} {p.product_name} (Código: {p.sku})" for p in products]
+        try:
+            if not self.llm_provider.is_available():
+                raise LLMUnavailableError("LLM circuit open")
+
+            if self.flights is None:
+                return await self._generate(messages, context_data, summary)
+
+            # Identical concurrent turns (same history, vision data and inventory) share one answer
+            inventory_version = await self.product_service.get_inventory_version()
+            payload = json.dumps([messages, context_data, summary], sort_keys=True, ensure_ascii=False)
+            key = (hashlib.sha256(payload.encode()).hexdigest(), inventory_version)
+            return await self.flights.do(
+                key, lambda: self._generate(messages, context_data, summary)
+            )
+        except LLMUnavailableError as e:
+            logger.warning(f"LLM unavailable, using fallback reply: {e}")
+            return await self._fallback_reply(messages, context_data)
+        except Exception as e:
+            logger.error(f"LLM chat failed, using fallback reply: {e}")
+            return await self._fallback_reply(messages, context_data)
+
+    @staticmethod
+    def _retrieval_text(messages: list[dict], context_data: str, turns: int = 3) -> str:
+        """Latest user turns (newest first) plus vision data, for product retrieval."""
+        user_turns = [m["content"] for m in reversed(messages) if m["role"] == "user"][:turns]
+        return " ".join([context_data, *user_turns]).strip()
+
+    async def _fallback_reply(self, messages: list[dict], context_data: str) -> str:
+        """Answer from the cached inventory when the LLM can't respond in time."""
+        products = await self.inventory_context.relevant(
+            self._retrieval_text(messages, context_data, turns=1), k=3
+        )
+
+        notice = "Nuestro asesor virtual está muy ocupado en este momento."
+        if not products:
+            return f"{notice} Por favor, intenta de nuevo en unos segundos."
+
+        options = ", ".join(
+            f"{p.product_name} (${p.unit_cost}, {p.quantity_available} disponibles)"
+            for p in products
         )
+        return f"{notice} Mientras tanto, esto es lo que encontré en inventario: {options}."
+
+    async def _generate(self, messages: list[dict], context_data: str, summary: str) -> str:
+        """Run a chat turn, attributing its LLM calls to one request."""
+        assert self.llm_provider is not None
+
+        with self.llm_provider.track_request():
+            return await self._run_turn(messages, context_data, summary)
+
+    async def _stream_reply(
+        self, messages: list[dict], context_data: str, summary: str
+    ) -> AsyncIterator[str]:
+        """Stream reply tokens; tool rounds run between the streamed LLM calls."""
+        if not self.llm_provider:
+            yield "Error: LLM not configured."
+            return
+
+        streamed = False
+        try:
+            if not self.llm_provider.is_available():
+                raise LLMUnavailableError("LLM circuit open")
+
+            lc_messages = await self._build_prompt(messages, context_data, summary)
+
+            if self.agent_executor is None:
+                async for chunk in self.llm_provider.astream(lc_messages):
+                    if chunk.content:
+                        streamed = True
+                        yield str(chunk.content)
+                return
 
-        # 2. Build System Prompt (Strict Sales Agent)
-        system_prompt = f"""
-        Eres 'TecnoBot', asesor de ventas de TecnoCuenca.
-        
-        SITUACIÓN:
-        - Somos una tienda pequeña y exclusiva con stock limitado.
-        - SOLO vendemos los productos listados en el INVENTARIO REAL a continuación.
-        
-        INVENTARIO REAL (No alucines otros modelos):
-        {inventory_context}
-
-        REGLAS DE ORO (Si las rompes, fallas tu misión):
-        1. SOLO menciona productos del INVENTARIO REAL. Si el usuario pide algo que no está (ej: HP, Dell), di "Lo siento, solo manejamos [Marcas disponibles]".
-        2. SÉ BREVE: Máximo 10 oraciones. Respuestas cortas y directas.
-        3. NO hagas listas largas. Di: "Tenemos la [Marca Modelo] a $[Precio]..."
-        4. Si te preguntan "qué tienes", resume: "Actualmente contamos con opciones de [Marca 1] y [Marca 2]..." (Solo lo real).
-        
-        ESTILO:
-        - Amigable, corto y útil.
+            # Tool rounds run between the streamed LLM calls
+            async for event in self.agent_executor.astream(lc_messages):
+                if event.text:
+                    streamed = True
+                    yield event.text
+        except LLMUnavailableError as e:
+            if streamed:
+                raise
+            logger.warning(f"LLM unavailable, using fallback reply: {e}")
+            yield await self._fallback_reply(messages, context_data)
+        except Exception as e:
+            if streamed:
+                raise
+            logger.error(f"LLM chat failed, using fallback reply: {e}")
+            yield await self._fallback_reply(messages, context_data)
+
+    async def _build_prompt(
+        self, messages: list[dict], context_data: str, summary: str
+    ) -> list[BaseMessage]:
+        """Static system prompt + history, with this turn's inventory and vision sections."""
+        if self.inventory_on_demand:
+            # Brands only: the agent looks up models, prices and stock with its tools
+            sections = [context_section("CATÁLOGO", await self.inventory_context.overview())]
+            if context_data:
+                sections.append(context_section("DATOS DEL SISTEMA DE VISIÓN", context_data))
+            return build_chat_messages(
+                SALES_AGENT_TOOLS_SYSTEM_PROMPT, messages, sections, summary=summary
+            )
+
+        # 1. Products relevant to this conversation (cached catalog, no DB round trip)
+        inventory_context = await self.inventory_context.render(
+            self._retrieval_text(messages, context_data)
+        )
+
+        logger.debug(f"Inventory context injected: {inventory_context.count(chr(10)) + 1} line(s)")
+
+        # 2. Static system prompt + verbatim history, variable sections on the last turn
+        # (a stable prefix lets the provider reuse its prompt cache across turns)
+        sections = [context_section("INVENTARIO REAL", inventory_context)]
+        if context_data:
+            sections.append(context_section("DATOS DEL SISTEMA DE VISIÓN", context_data))
+        return build_chat_messages(SALES_AGENT_SYSTEM_PROMPT, messages, sections, summary=summary)
+
+    async def _run_turn(self, messages: list[dict], context_data: str, summary: str) -> str:
+        """Build the prompt from inventory and history, and run the LLM."""
+        assert self.llm_provider is not None
+
+        lc_messages = await self._build_prompt(messages, context_data, summary)
+
+        # Invoke LLM (tool loop when tools are available)
+        if self.agent_executor is None:
+            response = await self.llm_provider.ainvoke(lc_messages)
+            return response.content
+
+        run = await self.agent_executor.run(lc_messages)
+        return run.response.content
+
+    def get_stats(self) -> dict[str, Any]:
         """
-        
-        # DEBUG: Print prompt to console to verify what LLM sees
-        print("--- SYSTEM PROMPT ENVIADO A GROQ ---")
-        # print(system_prompt) # Uncomment to debug inventory injection
-        print(f"Inventario inyectado: {len(products)} productos.")
-        print("------------------------------------")
-        
-        # 3. Build LangChain Messages
-        # IMPORTANT: Start fresh with System Message to override any previous 'Agent 2' hidden context
-        lc_messages = [SystemMessage(content=system_prompt)]
-
-        # Add History
-        for msg in messages:
-            # Skip messages that look like generated refiners if we want clean chat
-            if msg["role"] == "user":
-                lc_messages.append(HumanMessage(content=msg["content"]))
-            else:
-                lc_messages.append(AIMessage(content=msg["content"]))
-        
-        # Add Context Data to the last user message if present
-        if context_data and messages and messages[-1]['role'] == 'user':
-            # Append context directly to the last message object in LangChain list
-            last_msg = lc_messages[-1] 
-            if isinstance(last_msg, HumanMessage):
-                 last_msg.content += f"\n\n[DATOS DEL SISTEMA DE VISIÓN]: {context_data}"
-        elif context_data:
-             lc_messages.append(HumanMessage(content=f"[DATOS DEL SISTEMA DE VISIÓN]: {context_data}"))
-
-        # 4. Invoke LLM
-        model = self.llm_provider.get_model()
-        response = await model.ainvoke(lc_messages)
-        
-        return response.content
+        Get chat metrics.
+
+        Returns:
+            Dict with coalescing (None if disabled), inventory context, session
+            and agent loop counters, and time to first byte of blocking vs streamed replies
+        """
+
+        def ms(window: LatencyWindow, pct: float) -> float | None:
+            value = window.percentile(pct)
+            return value * 1000 if value is not None else None
+
+        return {
+            "coalescing": self.flights.get_stats() if self.flights else None,
+            "inventory_context": self.inventory_context.get_stats(),
+            "conversations": self.conversation_store.get_stats(),
+            "agent": self.agent_executor.get_stats() if self.agent_executor else None,
+            "ttfb": {
+                "blocking_p50_ms": ms(self._reply_latency, 50),
+                "blocking_p95_ms": ms(self._reply_latency, 95),
+                "stream_p50_ms": ms(self._stream_ttfb, 50),
+                "stream_p95_ms": ms(self._stream_ttfb, 95),
+                "stream_total_p50_ms": ms(self._stream_latency, 50),
+                "streams": self._streams,
+                "streams_cancelled": self._streams_cancelled,
+            },
+        }
@@ -0,0 +1,264 @@
+"""
+Conversation Store for /api/chat.
+
+Keeps chat history server-side so clients only send the new turn:
+- In-memory backend with LRU/TTL eviction (default, per worker)
+- Optional Redis backend shared by all workers (needs the ``redis`` package)
+- History is bounded by a token budget: older turns are folded into an
+  extractive summary, recent turns are kept verbatim
+"""
+
+import asyncio
+import json
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Protocol
+
+
+@dataclass
+class Conversation:
+    """A chat session."""
+
+    id: str
+    messages: list[dict] = field(default_factory=list)  # {'role': ..., 'content': ...}
+    summary: str = ""  # Extractive summary of turns dropped from ``messages``
+    updated_at: float = field(default_factory=time.time)
+
+
+class ConversationBackend(Protocol):
+    """Storage for conversations."""
+
+    async def get(self, conversation_id: str) -> Conversation | None: ...
+
+    async def save(self, conversation: Conversation) -> None: ...
+
+    async def delete(self, conversation_id: str) -> None: ...
+
+    def get_stats(self) -> dict[str, Any]: ...
+
+
+class InMemoryConversationBackend:
+    """Per-process LRU/TTL conversation storage."""
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 3600.0) -> None:
+        """
+        Args:
+            max_entries: Maximum conversations kept (least recently used evicted)
+            ttl_seconds: Idle time after which a conversation expires
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, Conversation] = OrderedDict()
+        self._evictions = 0
+        self._expirations = 0
+
+    async def get(self, conversation_id: str) -> Conversation | None:
+        conversation = self._entries.get(conversation_id)
+        if conversation is None:
+            return None
+        if time.time() - conversation.updated_at > self.ttl_seconds:
+            del self._entries[conversation_id]
+            self._expirations += 1
+            return None
+        self._entries.move_to_end(conversation_id)
+        # Copy: like Redis, a turn that is never saved (e.g. cancelled) leaves no trace
+        return replace(conversation, messages=list(conversation.messages))
+
+    async def save(self, conversation: Conversation) -> None:
+        conversation.updated_at = time.time()
+        self._entries[conversation.id] = conversation
+        self._entries.move_to_end(conversation.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    async def delete(self, conversation_id: str) -> None:
+        self._entries.pop(conversation_id, None)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+        }
+
+
+class RedisConversationBackend:
+    """Conversation storage in Redis, shared across workers (TTL refreshed on save)."""
+
+    def __init__(self, url: str, ttl_seconds: float = 3600.0, prefix: str = "chat:conv:") -> None:
+        """
+        Args:
+            url: Redis URL (redis://host:6379/0)
+            ttl_seconds: Idle time after which a conversation expires
+            prefix: Key prefix
+        """
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError(
+                "CONVERSATION_STORE_BACKEND=redis requires the 'redis' package (pip install redis)"
+            ) from e
+
+        self._client = redis_asyncio.from_url(url, decode_responses=True)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    async def get(self, conversation_id: str) -> Conversation | None:
+        raw = await self._client.get(self.prefix + conversation_id)
+        return Conversation(**json.loads(raw)) if raw else None
+
+    async def save(self, conversation: Conversation) -> None:
+        conversation.updated_at = time.time()
+        await self._client.set(
+            self.prefix + conversation.id,
+            json.dumps(asdict(conversation), ensure_ascii=False),
+            ex=int(self.ttl_seconds),
+        )
+
+    async def delete(self, conversation_id: str) -> None:
+        await self._client.delete(self.prefix + conversation_id)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {"backend": "redis"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def _summary_line(message: dict, max_chars: int = 160) -> str:
+    """First sentence of a message, tagged with its speaker."""
+    content = " ".join(message["content"].split())
+    sentence = content.split(". ")[0]
+    if len(sentence) > max_chars:
+        sentence = sentence[: max_chars - 1].rstrip() + "…"
+    speaker = "Usuario" if message["role"] == "user" else "Asistente"
+    return f"- {speaker}: {sentence}"
+
+
+class ConversationStore:
+    """
+    Server-side chat sessions with token-budgeted history.
+
+    When the verbatim history exceeds ``max_history_tokens``, the oldest
+    messages are folded into the conversation summary (first sentence of
+    each), always keeping the last ``keep_recent_messages`` verbatim.
+    The summary itself is capped at ``max_summary_tokens`` (oldest lines
+    dropped first).
+    """
+
+    def __init__(
+        self,
+        backend: ConversationBackend,
+        max_history_tokens: int = 1500,
+        keep_recent_messages: int = 6,
+        max_summary_tokens: int = 300,
+    ) -> None:
+        """
+        Initialize store.
+
+        Args:
+            backend: Conversation storage
+            max_history_tokens: Budget for verbatim history sent to the LLM
+            keep_recent_messages: Messages never folded into the summary
+            max_summary_tokens: Budget for the summary of older turns
+        """
+        self.backend = backend
+        self.max_history_tokens = max_history_tokens
+        self.keep_recent_messages = keep_recent_messages
+        self.max_summary_tokens = max_summary_tokens
+        self._locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+
+        self._created = 0
+        self._resumed = 0
+        self._compactions = 0
+        self._summarized_messages = 0
+
+    def lock(self, conversation_id: str) -> asyncio.Lock:
+        """Per-conversation lock serializing concurrent turns of the same chat."""
+        lock = self._locks.get(conversation_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[conversation_id] = lock
+        return lock
+
+    @staticmethod
+    def new_id() -> str:
+        """Generate a conversation ID."""
+        return uuid.uuid4().hex
+
+    async def load(self, conversation_id: str) -> Conversation:
+        """
+        Load a conversation, or start a new one under that ID.
+
+        Args:
+            conversation_id: Conversation ID (unknown or expired IDs start empty)
+
+        Returns:
+            Conversation
+        """
+        conversation = await self.backend.get(conversation_id)
+        if conversation is not None:
+            self._resumed += 1
+            return conversation
+
+        self._created += 1
+        return Conversation(id=conversation_id)
+
+    def append(self, conversation: Conversation, messages: list[dict]) -> None:
+        """
+        Add messages and compact the history to its token budget.
+
+        Args:
+            conversation: Conversation to extend
+            messages: Messages as {'role': ..., 'content': ...}
+        """
+        conversation.messages.extend(messages)
+        self._compact(conversation)
+
+    async def save(self, conversation: Conversation) -> None:
+        """Persist a conversation."""
+        await self.backend.save(conversation)
+
+    def _compact(self, conversation: Conversation) -> None:
+        """Fold the oldest messages into the summary until the history fits the budget."""
+        messages = conversation.messages
+        total = sum(estimate_tokens(m["content"]) for m in messages)
+        folded: list[str] = []
+
+        while total > self.max_history_tokens and len(messages) > self.keep_recent_messages:
+            oldest = messages.pop(0)
+            total -= estimate_tokens(oldest["content"])
+            folded.append(_summary_line(oldest))
+
+        if not folded:
+            return
+
+        lines = [line for line in conversation.summary.splitlines() if line] + folded
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > self.max_summary_tokens:
+            lines.pop(0)
+        conversation.summary = "\n".join(lines)
+
+        self._compactions += 1
+        self._summarized_messages += len(folded)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get session counters.
+
+        Returns:
+            Dict with created/resumed sessions, compactions and backend stats
+        """
+        return {
+            "created": self._created,
+            "resumed": self._resumed,
+            "compactions": self._compactions,
+            "summarized_messages": self._summarized_messages,
+            **self.backend.get_stats(),
+        }
@@ -0,0 +1,196 @@
+"""
+Inventory Context for LLM prompts.
+
+Keeps a compact, in-memory rendering of the catalog keyed by inventory
+version and selects the top-k products relevant to a conversation, so
+chat prompts carry a handful of lines instead of the whole inventory and
+no DB round trip is needed per turn.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+from business_backend.database.models import ProductStock
+from business_backend.services.product_service import ProductService
+from business_backend.services.query_utils import extract_keywords, strip_accents
+from business_backend.shared.singleflight import SingleFlight
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """One product as rendered into prompts."""
+
+    product_name: str
+    product_sku: str | None
+    supplier_name: str
+    quantity_available: int
+    unit_cost: Any
+    line: str  # Compact prompt rendering
+    search_text: str  # Lowercased, accent-free name/SKU/supplier
+
+
+@dataclass(frozen=True)
+class _Catalog:
+    """Catalog snapshot for one inventory version."""
+
+    version: str
+    entries: tuple[CatalogEntry, ...]
+    overview: str  # Suppliers with product counts, for turns with no matching product
+
+
+def _entry(product: ProductStock) -> CatalogEntry:
+    sku = f" (SKU {product.product_sku})" if product.product_sku else ""
+    line = (
+        f"- {product.product_name}{sku} | {product.supplier_name} | "
+        f"${product.unit_cost} | {product.quantity_available} disp."
+    )
+    search_text = strip_accents(
+        f"{product.product_name} {product.product_sku or ''} {product.supplier_name}".lower()
+    )
+    return CatalogEntry(
+        product_name=product.product_name,
+        product_sku=product.product_sku,
+        supplier_name=product.supplier_name,
+        quantity_available=product.quantity_available,
+        unit_cost=product.unit_cost,
+        line=line,
+        search_text=search_text,
+    )
+
+
+class InventoryContext:
+    """
+    Version-keyed catalog cache with keyword retrieval.
+
+    The catalog is rebuilt (once, even under concurrency) only when
+    ProductService.get_inventory_version changes.
+    """
+
+    def __init__(
+        self,
+        product_service: ProductService,
+        top_k: int = 8,
+        max_products: int = 5000,
+    ) -> None:
+        """
+        Initialize inventory context.
+
+        Args:
+            product_service: Source of products and inventory version
+            top_k: Products injected per prompt
+            max_products: Upper bound on catalog rows kept in memory
+        """
+        self.product_service = product_service
+        self.top_k = top_k
+        self.max_products = max_products
+        self._catalog: _Catalog | None = None
+        self._builds: SingleFlight[_Catalog] = SingleFlight()
+
+        self._rebuilds = 0
+        self._hits = 0
+
+    async def get_catalog(self) -> _Catalog:
+        """Catalog for the current inventory version (rebuilt on change)."""
+        version = await self.product_service.get_inventory_version()
+        catalog = self._catalog
+        if catalog is not None and catalog.version == version:
+            self._hits += 1
+            return catalog
+        return await self._builds.do(version, lambda: self._build(version))
+
+    async def _build(self, version: str) -> _Catalog:
+        products = await self.product_service.list_products(limit=self.max_products)
+        entries = tuple(_entry(p) for p in products)
+
+        suppliers = Counter(e.supplier_name for e in entries)
+        overview = ", ".join(f"{name} ({count})" for name, count in suppliers.most_common(15))
+
+        catalog = _Catalog(version=version, entries=entries, overview=overview)
+        self._catalog = catalog
+        self._rebuilds += 1
+        logger.debug(f"Inventory context rebuilt: {len(entries)} products (version {version})")
+        return catalog
+
+    async def relevant(self, text: str, k: int | None = None) -> list[CatalogEntry]:
+        """
+        Products most relevant to a piece of conversation.
+
+        Scores each product by how many query keywords appear in its
+        name, SKU or supplier (an exact SKU counts double), then by
+        available quantity.
+
+        Args:
+            text: Conversation text (latest user turns, vision data)
+            k: Maximum products (defaults to top_k)
+
+        Returns:
+            Matching entries, best first (empty if nothing matches)
+        """
+        keywords = extract_keywords(text, max_keywords=8)
+        if not keywords:
+            return []
+
+        catalog = await self.get_catalog()
+        scored: list[tuple[int, int, CatalogEntry]] = []
+        for entry in catalog.entries:
+            score = sum(1 for keyword in keywords if keyword in entry.search_text)
+            if not score:
+                continue
+            if entry.product_sku and entry.product_sku.lower() in keywords:
+                score += 1
+            scored.append((score, entry.quantity_available, entry))
+
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [entry for _, _, entry in scored[: k or self.top_k]]
+
+    async def render(self, text: str, k: int | None = None) -> str:
+        """
+        Prompt section with the products relevant to ``text``.
+
+        Falls back to a supplier overview when no product matches, so the
+        model can still say what the store carries.
+
+        Args:
+            text: Conversation text
+            k: Maximum products (defaults to top_k)
+
+        Returns:
+            Compact multi-line inventory section
+        """
+        entries = await self.relevant(text, k)
+        if entries:
+            return "\n".join(entry.line for entry in entries)
+
+        catalog = await self.get_catalog()
+        if not catalog.entries:
+            return "(Inventario vacío)"
+        return f"(Ningún producto coincide con la consulta) Marcas disponibles: {catalog.overview}"
+
+    async def overview(self) -> str:
+        """
+        Brands carried, with product counts (no prices or stock).
+
+        Returns:
+            One-line overview, or "(Inventario vacío)"
+        """
+        catalog = await self.get_catalog()
+        if not catalog.entries:
+            return "(Inventario vacío)"
+        return f"Marcas disponibles: {catalog.overview}"
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict with catalog size, rebuilds and cache hits
+        """
+        return {
+            "catalog_size": len(self._catalog.entries) if self._catalog else 0,
+            "version": self._catalog.version if self._catalog else None,
+            "rebuilds": self._rebuilds,
+            "hits": self._hits,
+        }
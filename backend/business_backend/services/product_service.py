@@ -4,25 +4,66 @@ Product Service for Business Backend.
 Provides CRUD operations for ProductStock using SQLAlchemy ORM.
 """
 
+import hashlib
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, case, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from business_backend.database.models import ProductStock
+from business_backend.shared.singleflight import SingleFlight
 
 
 class ProductService:
     """Service for product stock operations."""
 
-    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        inventory_version_ttl: float = 5.0,
+        coalesce: bool = True,
+    ) -> None:
         """
         Initialize ProductService.
 
         Args:
             session_factory: Async session factory for database operations
+            inventory_version_ttl: Seconds an inventory version is reused
+                before the fingerprint query runs again
+            coalesce: Share one DB query among identical concurrent reads
         """
         self.session_factory = session_factory
+        self.inventory_version_ttl = inventory_version_ttl
+        self._inventory_version: str | None = None
+        self._inventory_version_at: float = 0.0
+        self._flights: SingleFlight[Any] | None = SingleFlight() if coalesce else None
+
+    async def _coalesced(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` once among identical concurrent reads (if enabled)."""
+        if self._flights is None:
+            return await fn()
+        return await self._flights.do(key, fn)
+
+    async def _fetch_all(self, key: Hashable, query: Select[Any]) -> list[ProductStock]:
+        """
+        Execute a read query, coalescing identical concurrent calls.
+
+        Args:
+            key: Identity of the read (method name and arguments)
+            query: SELECT statement returning ProductStock rows
+
+        Returns:
+            List of ProductStock instances (a fresh list per caller)
+        """
+        async def run() -> list[ProductStock]:
+            async with self.session_factory() as session:
+                result = await session.execute(query)
+                return list(result.scalars().all())
+
+        return list(await self._coalesced(key, run))
 
     async def list_products(
         self,
@@ -41,16 +82,14 @@ class ProductService:
         Returns:
             List of ProductStock instances
         """
-        async with self.session_factory() as session:
-            query = select(ProductStock)
+        query = select(ProductStock)
 
-            if active_only:
-                query = query.where(ProductStock.is_active == True)  # noqa: E712
+        if active_only:
+            query = query.where(ProductStock.is_active == True)  # noqa: E712
 
-            query = query.order_by(ProductStock.product_name).limit(limit).offset(offset)
+        query = query.order_by(ProductStock.product_name).limit(limit).offset(offset)
 
-            result = await session.execute(query)
-            return list(result.scalars().all())
+        return await self._fetch_all(("list_products", limit, offset, active_only), query)
 
     async def get_product(self, product_id: UUID) -> ProductStock | None:
         """
@@ -62,10 +101,13 @@ class ProductService:
         Returns:
             ProductStock instance or None if not found
         """
-        async with self.session_factory() as session:
-            query = select(ProductStock).where(ProductStock.id == product_id)
-            result = await session.execute(query)
-            return result.scalar_one_or_none()
+        async def run() -> ProductStock | None:
+            async with self.session_factory() as session:
+                query = select(ProductStock).where(ProductStock.id == product_id)
+                result = await session.execute(query)
+                return result.scalar_one_or_none()
+
+        return await self._coalesced(("get_product", product_id), run)
 
     async def search_by_name(
         self,
@@ -84,18 +126,68 @@ class ProductService:
         Returns:
             List of matching ProductStock instances
         """
-        async with self.session_factory() as session:
-            query = select(ProductStock).where(
-                ProductStock.product_name.ilike(f"%{name}%")
+        query = select(ProductStock).where(
+            ProductStock.product_name.ilike(f"%{name}%")
+        )
+
+        if active_only:
+            query = query.where(ProductStock.is_active == True)  # noqa: E712
+
+        query = query.order_by(ProductStock.product_name).limit(limit)
+
+        return await self._fetch_all(("search_by_name", name, limit, active_only), query)
+
+    async def search_candidates(
+        self,
+        keywords: list[str],
+        limit: int = 10,
+        active_only: bool = True,
+    ) -> list[ProductStock]:
+        """
+        Retrieve candidate products matching any of the given keywords.
+
+        Each keyword is matched (case-insensitive) against product name,
+        SKU and supplier. Results are ranked by how many keywords matched,
+        then by available quantity.
+
+        Args:
+            keywords: Keywords extracted from the user's query
+            limit: Maximum number of results
+            active_only: If True, only return active products
+
+        Returns:
+            List of ProductStock instances, best match first
+        """
+        if not keywords:
+            return []
+
+        conditions = []
+        score = None
+        for keyword in keywords:
+            pattern = f"%{keyword}%"
+            condition = or_(
+                ProductStock.product_name.ilike(pattern),
+                ProductStock.product_sku.ilike(pattern),
+                ProductStock.supplier_name.ilike(pattern),
             )
+            conditions.append(condition)
+            match = case((condition, 1), else_=0)
+            score = match if score is None else score + match
 
-            if active_only:
-                query = query.where(ProductStock.is_active == True)  # noqa: E712
+        query = select(ProductStock).where(or_(*conditions))
 
-            query = query.order_by(ProductStock.product_name).limit(limit)
+        if active_only:
+            query = query.where(ProductStock.is_active == True)  # noqa: E712
 
-            result = await session.execute(query)
-            return list(result.scalars().all())
+        query = query.order_by(
+            score.desc(),
+            ProductStock.quantity_available.desc(),
+            ProductStock.product_name,
+        ).limit(limit)
+
+        return await self._fetch_all(
+            ("search_candidates", tuple(keywords), limit, active_only), query
+        )
 
     async def get_low_stock_products(self, limit: int = 50) -> list[ProductStock]:
         """
@@ -137,3 +229,51 @@ class ProductService:
 
             result = await session.execute(query)
             return result.scalar_one()
+
+    async def get_inventory_version(self) -> str:
+        """
+        Get a fingerprint of the current inventory state.
+
+        Changes whenever rows are added/removed, updated (last_updated_at),
+        or quantities, status or activity flags change. Used to tag cached
+        answers so stock changes invalidate them. The value is memoized
+        for ``inventory_version_ttl`` seconds.
+
+        Returns:
+            Short hex version string
+        """
+        now = time.monotonic()
+        if (
+            self._inventory_version is not None
+            and now - self._inventory_version_at < self.inventory_version_ttl
+        ):
+            return self._inventory_version
+
+        async def fingerprint() -> str:
+            async with self.session_factory() as session:
+                query = select(
+                    func.count(ProductStock.id),
+                    func.max(ProductStock.last_updated_at),
+                    func.coalesce(func.sum(ProductStock.quantity_available), 0),
+                    func.coalesce(func.sum(ProductStock.stock_status), 0),
+                    func.coalesce(
+                        func.sum(case((ProductStock.is_active == True, 1), else_=0)),  # noqa: E712
+                        0,
+                    ),
+                )
+                result = await session.execute(query)
+                return repr(tuple(result.one()))
+
+        row = await self._coalesced(("inventory_version",), fingerprint)
+        self._inventory_version = hashlib.sha1(row.encode()).hexdigest()[:12]
+        self._inventory_version_at = now
+        return self._inventory_version
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get read coalescing counters.
+
+        Returns:
+            Dict with coalescing counters (None if disabled)
+        """
+        return {"coalescing": self._flights.get_stats() if self._flights else None}
@@ -0,0 +1,125 @@
+"""
+Query text utilities for Business Backend.
+
+Lightweight keyword extraction used to retrieve candidate products
+locally before (or instead of) asking the LLM to call a tool, and
+query normalization/vectorization used by the answer cache.
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+
+# Question words and filler that never identify a product (ES + EN)
+STOPWORDS: frozenset[str] = frozenset(
+    {
+        # Spanish
+        "a", "al", "algo", "alguna", "alguno", "algun", "buscar", "busco",
+        "como", "con", "cual", "cuales", "cuanto", "cuantos", "cuanta",
+        "cuantas", "de", "del", "dime", "disponible", "disponibles", "el",
+        "en", "es", "esta", "estan", "existe", "existen", "hay", "la", "las",
+        "lo", "los", "me", "mi", "modelo", "modelos", "necesito", "para",
+        "por", "precio", "producto", "productos", "que", "quiero", "se",
+        "su", "sus", "tendran", "tiene", "tienen", "tienes", "un", "una",
+        "unas", "unos", "vende", "venden", "y",
+        # English
+        "an", "and", "any", "available", "do", "does", "find", "for",
+        "have", "how", "i", "is", "looking", "many", "much", "need", "of",
+        "price", "product", "products", "the", "there", "what", "which",
+        "with", "you",
+        # Shared
+        "stock", "inventario", "inventory",
+    }
+)
+
+# Stopwords that still change what the user wants to know; kept by normalize_query
+INTENT_WORDS: frozenset[str] = frozenset(
+    {
+        "precio", "price", "stock", "disponible", "disponibles", "available",
+        "cuanto", "cuantos", "cuanta", "cuantas", "how", "many", "much",
+        "inventario", "inventory", "modelo", "modelos",
+    }
+)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9\-]*")
+
+
+def strip_accents(text: str) -> str:
+    """Remove diacritics (á -> a, ñ -> n) from text."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def extract_keywords(query: str, max_keywords: int = 5) -> list[str]:
+    """
+    Extract product keywords from a natural language query.
+
+    Lowercases, strips accents and punctuation, and drops stopwords.
+    Order of first appearance is preserved and duplicates removed.
+
+    Args:
+        query: User's natural language query
+        max_keywords: Maximum number of keywords to return
+
+    Returns:
+        List of keywords (may be empty)
+    """
+    tokens = _TOKEN_PATTERN.findall(strip_accents(query.lower()))
+
+    keywords: list[str] = []
+    for token in tokens:
+        if len(token) < 2 or token in STOPWORDS or token in keywords:
+            continue
+        keywords.append(token)
+        if len(keywords) >= max_keywords:
+            break
+    return keywords
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for cache lookups.
+
+    Lowercases, strips accents and punctuation and drops filler words,
+    so "¿Tienen MacBook?" and "tienen macbook" map to the same string.
+    Words that change the intent (price, stock, how many) are kept.
+
+    Args:
+        query: User's natural language query
+
+    Returns:
+        Space-separated normalized tokens
+    """
+    tokens = _TOKEN_PATTERN.findall(strip_accents(query.lower()))
+    return " ".join(
+        token for token in tokens
+        if token not in STOPWORDS or token in INTENT_WORDS
+    )
+
+
+def ngram_vector(text: str, n: int = 3) -> dict[str, float]:
+    """
+    Embed text as an L2-normalized bag of character n-grams.
+
+    Cheap local embedding for near-duplicate detection (typos,
+    word order); no model or network call involved.
+
+    Args:
+        text: Normalized text
+        n: N-gram length
+
+    Returns:
+        Sparse vector {ngram: weight}
+    """
+    padded = f" {text} "
+    counts = Counter(padded[i:i + n] for i in range(max(1, len(padded) - n + 1)))
+    norm = math.sqrt(sum(c * c for c in counts.values())) or 1.0
+    return {gram: c / norm for gram, c in counts.items()}
+
+
+def cosine_similarity(a: dict[str, float], b: dict[str, float]) -> float:
+    """Cosine similarity of two L2-normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(key, 0.0) for key, weight in a.items())
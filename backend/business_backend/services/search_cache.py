@@ -0,0 +1,193 @@
+"""
+Semantic Search Answer Cache.
+
+Two-tier cache in front of SearchService.semantic_search:
+- Tier 1: exact match on the normalized query
+- Tier 2: similarity match on query embeddings above a threshold
+
+Entries are tagged with the inventory version they were computed
+against, so any stock change invalidates them.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from business_backend.services.query_utils import cosine_similarity, ngram_vector
+
+Embedder = Callable[[str], dict[str, float]]
+
+
+@dataclass
+class _CacheEntry:
+    """Cached answer with the context it is valid for."""
+
+    value: Any
+    mode: str
+    inventory_version: str
+    created_at: float
+    vector: dict[str, float]
+    exact_tokens: frozenset[str]
+
+
+class SemanticSearchCache:
+    """
+    LRU/TTL answer cache keyed by normalized query and inventory version.
+
+    Tier 2 only matches entries whose tokens containing digits are
+    identical (so "x1" never answers for "x2") and compares at most
+    ``max_entries`` vectors per miss.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 600.0,
+        similarity_threshold: float = 0.85,
+        embedder: Embedder = ngram_vector,
+    ) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum cached answers (least recently used evicted)
+            ttl_seconds: Entry lifetime
+            similarity_threshold: Minimum cosine similarity for a tier 2 hit
+                (set above 1.0 to disable tier 2)
+            embedder: Function mapping a normalized query to a sparse unit vector
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.embedder = embedder
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+
+        self._exact_hits = 0
+        self._similar_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, normalized_query: str, mode: str, inventory_version: str) -> Any | None:
+        """
+        Look up a cached answer.
+
+        Args:
+            normalized_query: Output of ``normalize_query``
+            mode: Search pipeline the answer must come from
+            inventory_version: Current inventory version
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        now = time.monotonic()
+
+        # Tier 1: exact normalized match
+        key = self._key(normalized_query, mode)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._is_valid(entry, inventory_version, now):
+                self._entries.move_to_end(key)
+                self._exact_hits += 1
+                return entry.value
+            self._drop(key)
+
+        # Tier 2: nearest embedding among valid entries of the same mode
+        if self.similarity_threshold <= 1.0 and normalized_query:
+            vector = self.embedder(normalized_query)
+            exact_tokens = self._exact_tokens(normalized_query)
+            best_key: str | None = None
+            best_score = self.similarity_threshold
+
+            for candidate_key, candidate in list(self._entries.items()):
+                if not self._is_valid(candidate, inventory_version, now):
+                    self._drop(candidate_key)
+                    continue
+                if candidate.mode != mode or candidate.exact_tokens != exact_tokens:
+                    continue
+                score = cosine_similarity(vector, candidate.vector)
+                if score >= best_score:
+                    best_key, best_score = candidate_key, score
+
+            if best_key is not None:
+                self._entries.move_to_end(best_key)
+                self._similar_hits += 1
+                return self._entries[best_key].value
+
+        self._misses += 1
+        return None
+
+    def put(self, normalized_query: str, mode: str, inventory_version: str, value: Any) -> None:
+        """
+        Store an answer.
+
+        Args:
+            normalized_query: Output of ``normalize_query``
+            mode: Search pipeline that produced the answer
+            inventory_version: Inventory version the answer was computed against
+            value: Answer to cache
+        """
+        if not normalized_query:
+            return
+
+        key = self._key(normalized_query, mode)
+        self._entries[key] = _CacheEntry(
+            value=value,
+            mode=mode,
+            inventory_version=inventory_version,
+            created_at=time.monotonic(),
+            vector=self.embedder(normalized_query),
+            exact_tokens=self._exact_tokens(normalized_query),
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict with hits per tier, misses, evictions and hit rate
+        """
+        hits = self._exact_hits + self._similar_hits
+        lookups = hits + self._misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "exact_hits": self._exact_hits,
+            "similar_hits": self._similar_hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "invalidations": self._invalidations,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def _is_valid(self, entry: _CacheEntry, inventory_version: str, now: float) -> bool:
+        """Entry is fresh and was computed against the current inventory."""
+        return (
+            entry.inventory_version == inventory_version
+            and now - entry.created_at < self.ttl_seconds
+        )
+
+    def _drop(self, key: str) -> None:
+        """Remove a stale entry."""
+        del self._entries[key]
+        self._invalidations += 1
+
+    @staticmethod
+    def _key(normalized_query: str, mode: str) -> str:
+        return f"{mode}:{normalized_query}"
+
+    @staticmethod
+    def _exact_tokens(normalized_query: str) -> frozenset[str]:
+        """Tokens that must match exactly (model numbers, SKUs)."""
+        return frozenset(t for t in normalized_query.split() if any(c.isdigit() for c in t))
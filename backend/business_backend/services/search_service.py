@@ -4,19 +4,42 @@ Search Service for Business Backend.
 Orchestrates LLM with product search tool for semantic queries.
 """
 
+import asyncio
+import dataclasses
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import nullcontext
 from dataclasses import dataclass
+from enum import Enum
 from typing import Any
 
-from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from loguru import logger
 
 from business_backend.database.models import ProductStock
+from business_backend.llm.prompts import PREFETCH_SYSTEM_PROMPT, SEARCH_SYSTEM_PROMPT
 from business_backend.llm.provider import LLMProvider
+from business_backend.llm.resilience import LLMUnavailableError
+from business_backend.llm.agent_executor import AgentExecutor
+from business_backend.llm.tools.executor import ToolCallResolver, ToolExecutor
 from business_backend.llm.tools.product_search_tool import (
+    STOCK_STATUS_LABELS,
     ProductSearchTool,
+    collect_search_results,
     create_product_search_tool,
 )
 from business_backend.services.product_service import ProductService
+from business_backend.services.query_utils import extract_keywords, normalize_query
+from business_backend.services.search_cache import SemanticSearchCache
+from business_backend.shared.singleflight import SingleFlight
+
+
+class SearchMode(str, Enum):
+    """LLM pipeline used by semantic search."""
+
+    # LLM requests product_search, tool runs, LLM answers (2 LLM calls)
+    TOOL_CALLING = "tool_calling"
+    # Candidates retrieved locally and put in the prompt (1 LLM call)
+    PREFETCH = "prefetch"
 
 
 @dataclass
@@ -28,28 +51,83 @@ class SearchResult:
     query: str
 
 
-class SearchService:
-    """Service for semantic search using LLM and product database."""
+@dataclass
+class SearchStreamEvent:
+    """Incremental semantic search output (see ``semantic_search_stream``)."""
 
-    SYSTEM_PROMPT = """You are a helpful inventory assistant. You help users find products and check stock availability.
+    # Sent first, as soon as known; resent (full list) when a later tool round finds more
+    products_found: list[ProductStock] | None = None
+    answer_delta: str = ""  # Next piece of the answer
+    answer: str | None = None  # Full answer, on the last event
 
-When a user asks about products or stock, use the product_search tool to find information in the database.
 
-Always provide clear, concise answers about:
-- Whether the product exists
-- How many units are available
-- The product's stock status (In Stock, Low Stock, Out of Stock)
-- Price and supplier information when relevant
+@dataclass
+class _Speculation:
+    """A product search launched before the LLM asked for it."""
 
-If no products are found, let the user know politely and suggest they try a different search term.
+    term: str
+    task: asyncio.Task[tuple[list[ProductStock], float]]  # (rows, query seconds)
 
-Respond in the same language as the user's query."""
+
+@dataclass
+class SpeculationStats:
+    """Counters for speculative product searches."""
+
+    launched: int = 0
+    hits: int = 0
+    misses: int = 0
+    unused: int = 0  # LLM answered without calling product_search
+    saved_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Export counters with derived hit rate and average saving."""
+        resolved = self.hits + self.misses
+        return {
+            "launched": self.launched,
+            "hits": self.hits,
+            "misses": self.misses,
+            "unused": self.unused,
+            "hit_rate": self.hits / resolved if resolved else 0.0,
+            "saved_ms_total": self.saved_seconds * 1000,
+            "saved_ms_avg": self.saved_seconds * 1000 / self.hits if self.hits else 0.0,
+        }
+
+
+def _message_text(message: Any) -> str:
+    """Text content of an LLM response."""
+    return message.content if isinstance(message.content, str) else str(message.content)
+
+
+def _unique_products(products: list[ProductStock]) -> list[ProductStock]:
+    """Drop duplicate rows (same id) keeping first-seen order."""
+    seen: set[Any] = set()
+    unique = []
+    for p in products:
+        if p.id not in seen:
+            seen.add(p.id)
+            unique.append(p)
+    return unique
+
+
+class SearchService:
+    """Service for semantic search using LLM and product database."""
+
+    SYSTEM_PROMPT = SEARCH_SYSTEM_PROMPT
+    PREFETCH_SYSTEM_PROMPT = PREFETCH_SYSTEM_PROMPT
 
     def __init__(
         self,
         llm_provider: LLMProvider | None,
         product_service: ProductService,
         inference_service: Any | None = None,  # Loose type to avoid circular imports if any
+        tool_executor: ToolExecutor | None = None,
+        default_mode: SearchMode = SearchMode.TOOL_CALLING,
+        prefetch_limit: int = 8,
+        speculative: bool = False,
+        speculative_limit: int = 50,
+        cache: SemanticSearchCache | None = None,
+        coalesce: bool = True,
+        agent_executor: AgentExecutor | None = None,
     ) -> None:
         """
         Initialize SearchService.
@@ -58,29 +136,60 @@ Respond in the same language as the user's query."""
             llm_provider: LLM provider (can be None if disabled)
             product_service: ProductService for database queries
             inference_service: InferenceService for image analysis
+            tool_executor: Shared executor holding the LLM tools (built
+                from product_service/inference_service if not given)
+            default_mode: Pipeline used when a request doesn't pick one
+            prefetch_limit: Max candidate products put in the prompt (PREFETCH mode)
+            speculative: Run a keyword product search concurrently with the
+                first LLM call and reuse it if it covers the requested term
+            speculative_limit: Row limit of the speculative query
+            cache: Optional answer cache (keyed by normalized query and
+                inventory version)
+            coalesce: Share one in-flight computation among identical
+                concurrent searches
+            agent_executor: Multi-step tool loop (built from the provider and
+                tool executor if not given)
         """
         self.llm_provider = llm_provider
         self.product_service = product_service
         self.inference_service = inference_service
+        self.default_mode = default_mode
+        self.prefetch_limit = prefetch_limit
+        self.speculative = speculative
+        self.speculative_limit = speculative_limit
+        self.speculation_stats = SpeculationStats()
+        self.cache = cache
+        self.flights: SingleFlight[SearchResult] | None = SingleFlight() if coalesce else None
         
         self.search_tool: ProductSearchTool | None = None
-        self.image_tool: Any | None = None
+        self.tool_executor: ToolExecutor | None = None
+        self.agent_executor: AgentExecutor | None = None
 
         if llm_provider is not None:
-            self.search_tool = create_product_search_tool(product_service)
-            
-            if inference_service is not None:
-                from business_backend.llm.tools.image_recognition_tool import (
-                    create_image_recognition_tool,
-                )
-                self.image_tool = create_image_recognition_tool(inference_service)
+            if tool_executor is None:
+                tools = [create_product_search_tool(product_service)]
+                if inference_service is not None:
+                    from business_backend.llm.tools.image_recognition_tool import (
+                        create_image_recognition_tool,
+                    )
+                    tools.append(create_image_recognition_tool(inference_service))
+                tool_executor = ToolExecutor(tools)
 
-    async def semantic_search(self, query: str) -> SearchResult:
+            self.tool_executor = tool_executor
+            self.search_tool = tool_executor.get_tool("product_search")
+            self.agent_executor = agent_executor or AgentExecutor(llm_provider, tool_executor)
+
+    async def semantic_search(
+        self,
+        query: str,
+        mode: SearchMode | None = None,
+    ) -> SearchResult:
         """
         Perform semantic search using LLM with product search tool.
 
         Args:
             query: User's natural language query
+            mode: LLM pipeline to use (defaults to the service's default_mode)
 
         Returns:
             SearchResult with answer and found products
@@ -90,86 +199,450 @@ Respond in the same language as the user's query."""
             logger.warning("LLM not configured, using fallback search")
             return await self._fallback_search(query)
 
+        mode = mode or self.default_mode
+        normalized = normalize_query(query)
+
         try:
-            return await self._llm_search(query)
+            if self.cache is None and self.flights is None:
+                return await self._run_pipeline(query, mode)
+
+            inventory_version = await self.product_service.get_inventory_version()
+
+            if self.cache is not None:
+                cached = self.cache.get(normalized, mode.value, inventory_version)
+                if cached is not None:
+                    logger.debug(f"Search cache hit for '{normalized}'")
+                    return dataclasses.replace(cached, query=query)
+
+            if self.flights is None:
+                result = await self._run_and_cache(query, mode, normalized, inventory_version)
+            else:
+                # Identical concurrent searches share a single computation
+                key = (mode.value, normalized or query, inventory_version)
+                result = await self.flights.do(
+                    key,
+                    lambda: self._run_and_cache(query, mode, normalized, inventory_version),
+                )
+            return dataclasses.replace(result, query=query)
+        except LLMUnavailableError as e:
+            logger.warning(f"LLM unavailable, using fallback search: {e}")
+            return await self._fallback_search(query)
         except Exception as e:
             logger.error(f"LLM search failed: {e}")
             return await self._fallback_search(query)
 
+    async def semantic_search_stream(
+        self,
+        query: str,
+        mode: SearchMode | None = None,
+    ) -> AsyncIterator[SearchStreamEvent]:
+        """
+        Semantic search delivered incrementally.
+
+        The products are sent as soon as they are known (after each tool
+        round that finds more, or right after retrieval in PREFETCH mode),
+        then the answer is streamed from the final LLM call. The last event carries the
+        full answer. Cached answers and fallbacks arrive in two events.
+
+        Identical concurrent searches, streamed or not, share one run (as in
+        ``semantic_search``): a stream that joins a run started by another
+        request gets its products and answer in two events when it completes.
+
+        Args:
+            query: User's natural language query
+            mode: LLM pipeline to use (defaults to the service's default_mode)
+
+        Yields:
+            Products event, answer deltas, then the final event
+        """
+        if self.llm_provider is None or self.agent_executor is None:
+            logger.warning("LLM not configured, using fallback search")
+            result = await self._fallback_search(query)
+            yield SearchStreamEvent(products_found=result.products_found)
+            yield SearchStreamEvent(answer=result.answer)
+            return
+
+        mode = mode or self.default_mode
+        normalized = normalize_query(query)
+        inventory_version = None
+        if self.cache is not None or self.flights is not None:
+            inventory_version = await self.product_service.get_inventory_version()
+        if self.cache is not None:
+            cached = self.cache.get(normalized, mode.value, inventory_version)
+            if cached is not None:
+                yield SearchStreamEvent(products_found=cached.products_found)
+                yield SearchStreamEvent(answer=cached.answer)
+                return
+
+        # Only the request that starts the run is fed its events
+        events: asyncio.Queue[SearchStreamEvent] = asyncio.Queue()
+
+        def start() -> Awaitable[SearchResult]:
+            return self._stream_and_cache(query, mode, normalized, inventory_version, events)
+
+        if self.flights is None:
+            run = asyncio.ensure_future(start())
+        else:
+            key = (mode.value, normalized or query, inventory_version)
+            run = asyncio.ensure_future(self.flights.do(key, start))
+
+        products: list[ProductStock] | None = None
+        parts: list[str] = []
+        next_event: asyncio.Future[SearchStreamEvent] | None = None
+        try:
+            while not run.done() or not events.empty():
+                next_event = asyncio.ensure_future(events.get())
+                await asyncio.wait({next_event, run}, return_when=asyncio.FIRST_COMPLETED)
+                if not next_event.done():
+                    next_event.cancel()
+                    continue
+                event = next_event.result()
+                if event.products_found is not None:
+                    products = event.products_found
+                elif event.answer_delta:
+                    parts.append(event.answer_delta)
+                yield event
+            result = run.result()
+        except Exception as e:
+            if parts:
+                # Part of the answer is out: finish with what was generated
+                logger.error(f"LLM search stream interrupted: {e}")
+                yield SearchStreamEvent(answer="".join(parts))
+                return
+            logger.warning(f"LLM search failed, using fallback search: {e}")
+            result = await self._fallback_search(query)
+            if products is None:
+                yield SearchStreamEvent(products_found=result.products_found)
+            yield SearchStreamEvent(answer=result.answer)
+            return
+        finally:
+            # Client gone: leave the run (cancelled once no other request awaits it)
+            run.cancel()
+            if next_event is not None:
+                next_event.cancel()
+
+        if products is None:
+            yield SearchStreamEvent(products_found=result.products_found)
+        yield SearchStreamEvent(answer=result.answer)
+
+    async def _stream_and_cache(
+        self,
+        query: str,
+        mode: SearchMode,
+        normalized: str,
+        inventory_version: str | None,
+        events: asyncio.Queue[SearchStreamEvent],
+    ) -> SearchResult:
+        """Run the LLM pipeline with streamed calls, feeding ``events``, and store the answer in the cache."""
+        assert self.llm_provider is not None
+        if not self.llm_provider.is_available():
+            raise LLMUnavailableError("LLM circuit open")
+
+        products: list[ProductStock] | None = None
+        parts: list[str] = []
+        with self.llm_provider.track_request():
+            if mode == SearchMode.PREFETCH:
+                products, messages = await self._prefetch_prompt(query)
+                events.put_nowait(SearchStreamEvent(products_found=products))
+                async for chunk in self.llm_provider.astream(messages):
+                    if chunk.content:
+                        parts.append(_message_text(chunk))
+                        events.put_nowait(SearchStreamEvent(answer_delta=parts[-1]))
+            else:
+                async for event in self._agent_stream(query):
+                    if event.products_found is not None:
+                        products = event.products_found
+                    elif event.answer_delta:
+                        parts.append(event.answer_delta)
+                    events.put_nowait(event)
+
+        result = SearchResult(answer="".join(parts), products_found=products or [], query=query)
+        if self.cache is not None and inventory_version is not None:
+            self.cache.put(normalized, mode.value, inventory_version, result)
+        return result
+
+    async def _agent_stream(self, query: str) -> AsyncIterator[SearchStreamEvent]:
+        """Agent loop with streamed LLM calls: products after each tool round, then answer deltas."""
+        assert self.agent_executor is not None
+
+        products: list[ProductStock] | None = None
+        resolver, settle = self._speculate(query)
+        tool_calls = None
+        try:
+            with collect_search_results() as found:
+                async for event in self.agent_executor.astream(
+                    self._search_messages(query), resolver=resolver
+                ):
+                    if event.tool_messages is not None:
+                        current = _unique_products(found)
+                        if products is None or len(current) != len(products):
+                            products = current
+                            yield SearchStreamEvent(products_found=products)
+                    elif event.text:
+                        if products is None:
+                            # Answered without searching: products still come first
+                            products = []
+                            yield SearchStreamEvent(products_found=products)
+                        yield SearchStreamEvent(answer_delta=event.text)
+                    elif event.run is not None:
+                        tool_calls = event.run.tool_calls
+        finally:
+            settle(tool_calls)
+
+        if products is None:
+            yield SearchStreamEvent(products_found=[])
+
+    async def _run_and_cache(
+        self,
+        query: str,
+        mode: SearchMode,
+        normalized: str,
+        inventory_version: str,
+    ) -> SearchResult:
+        """Run the LLM pipeline and store the answer in the cache."""
+        result = await self._run_pipeline(query, mode)
+        if self.cache is not None:
+            self.cache.put(normalized, mode.value, inventory_version, result)
+        return result
+
+    async def _run_pipeline(self, query: str, mode: SearchMode) -> SearchResult:
+        """Dispatch to the LLM pipeline of the given mode."""
+        if self.llm_provider is not None and not self.llm_provider.is_available():
+            # Provider degraded (circuit open): skip straight to the local fallback
+            raise LLMUnavailableError("LLM circuit open")
+        with self.llm_provider.track_request() if self.llm_provider else nullcontext():
+            if mode == SearchMode.PREFETCH:
+                return await self._prefetch_search(query)
+            return await self._llm_search(query)
+
     async def _llm_search(self, query: str) -> SearchResult:
         """Perform search using LLM with tool calling."""
-        assert self.llm_provider is not None
-        assert self.search_tool is not None
+        # Rows from this request's tool calls only (safe under concurrency)
+        with collect_search_results() as found:
+            answer = await self._llm_answer(query)
 
-        # Bind tools to model
-        tools = [self.search_tool]
-        if self.image_tool:
-            tools.append(self.image_tool)
-            
-        model_with_tools = self.llm_provider.bind_tools(tools)
+        return SearchResult(
+            answer=answer,
+            products_found=_unique_products(found),
+            query=query,
+        )
 
-        # Create messages
-        messages = [
+    async def _llm_answer(self, query: str) -> str:
+        """Run the tool-calling agent loop and return the final answer."""
+        assert self.agent_executor is not None
+
+        resolver, settle = self._speculate(query)
+        tool_calls = None
+        try:
+            run = await self.agent_executor.run(self._search_messages(query), resolver=resolver)
+            tool_calls = run.tool_calls
+        finally:
+            settle(tool_calls)
+        return _message_text(run.response)
+
+    def _search_messages(self, query: str) -> list[dict]:
+        """Prompt of the tool-calling pipeline."""
+        return [
             {"role": "system", "content": self.SYSTEM_PROMPT},
             {"role": "user", "content": query},
         ]
 
-        # First LLM call - may request tool use
-        response = await model_with_tools.ainvoke(messages)
-
-        # Check if tool was called
-        if hasattr(response, "tool_calls") and response.tool_calls:
-            # Execute tool calls
-            tool_messages = []
-            for tool_call in response.tool_calls:
-                result_content = "Error: Unknown tool"
-                
-                if tool_call["name"] == "product_search":
-                    # Execute the search
-                    result_content = await self.search_tool._arun(
-                        tool_call["args"]["search_term"]
-                    )
-                elif tool_call["name"] == "image_recognition" and self.image_tool:
-                    # Execute image recognition
-                    result_content = await self.image_tool._arun(
-                        tool_call["args"]["image_path"]
-                    )
-                    
-                tool_messages.append(
-                    ToolMessage(
-                        content=result_content,
-                        tool_call_id=tool_call["id"],
-                    )
-                )
+    def _speculate(
+        self, query: str
+    ) -> tuple[ToolCallResolver | None, Callable[[list[dict[str, Any]] | None], None]]:
+        """
+        Speculatively query the DB while the first LLM call is in flight.
 
-            # Second LLM call with tool results
-            messages_with_tools = [
-                {"role": "system", "content": self.SYSTEM_PROMPT},
-                {"role": "user", "content": query},
-                response,  # AI message with tool calls
-                *tool_messages,  # Tool results
-            ]
-
-            final_response = await model_with_tools.ainvoke(messages_with_tools)
-            answer = (
-                final_response.content
-                if isinstance(final_response.content, str)
-                else str(final_response.content)
-            )
-        else:
-            # No tool call, use direct response
-            answer = (
-                response.content
-                if isinstance(response.content, str)
-                else str(response.content)
+        Returns:
+            (resolver answering the first covered product_search call from the
+            speculation, function settling it given the executed tool calls,
+            or None if the run failed)
+        """
+        speculation = self._start_speculation(query) if self.speculative else None
+        if speculation is None:
+            return None, lambda tool_calls: None
+
+        async def resolve_from_speculation(tool_call: dict[str, Any]) -> str | None:
+            """Answer the first covered product_search call from the speculation."""
+            nonlocal speculation
+            if tool_call["name"] != "product_search" or speculation is None:
+                return None
+
+            search_term = tool_call["args"].get("search_term", "")
+            if speculation.term not in search_term.strip().lower():
+                return None
+
+            claimed, speculation = speculation, None
+            products = await self._use_speculation(claimed, search_term)
+            if products is None:
+                return None
+            assert self.search_tool is not None
+            return self.search_tool.render_results(search_term, products)
+
+        def settle(tool_calls: list[dict[str, Any]] | None) -> None:
+            nonlocal speculation
+            if speculation is None:
+                return
+            # Never claimed: either no product_search call or none it covered
+            speculation.task.cancel()
+            speculation = None
+            if tool_calls is None:
+                return
+            if any(call["name"] == "product_search" for call in tool_calls):
+                self.speculation_stats.misses += 1
+            else:
+                self.speculation_stats.unused += 1
+
+        return resolve_from_speculation, settle
+
+    def _start_speculation(self, query: str) -> _Speculation | None:
+        """
+        Launch a product search on the most specific query keyword.
+
+        Returns:
+            Running speculation, or None if the query has no keywords
+        """
+        keywords = extract_keywords(query)
+        if not keywords:
+            return None
+
+        term = max(keywords, key=len)
+
+        async def run() -> tuple[list[ProductStock], float]:
+            start = time.perf_counter()
+            rows = await self.product_service.search_by_name(
+                name=term, limit=self.speculative_limit
             )
+            return rows, time.perf_counter() - start
+
+        task = asyncio.create_task(run())
+        # Retrieve errors of abandoned speculations so they aren't logged as unhandled
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self.speculation_stats.launched += 1
+        return _Speculation(term=term, task=task)
+
+    async def _use_speculation(
+        self,
+        speculation: _Speculation,
+        search_term: str,
+    ) -> list[ProductStock] | None:
+        """
+        Reuse speculative rows for the term the LLM requested, if possible.
+
+        The speculative query is ``ILIKE %term%``. When the requested term
+        contains that term, every row it would return is already among the
+        speculative rows, provided the speculative query wasn't truncated
+        by its limit; filtering them gives the same result as re-querying.
+
+        Args:
+            speculation: Speculation whose term is contained in search_term
+            search_term: Term requested by the LLM
+
+        Returns:
+            Rows for ``search_term``, or None on a miss (caller must query)
+        """
+        requested = search_term.strip().lower()
+        limit = self.search_tool.result_limit if self.search_tool else 10
+
+        wait_start = time.perf_counter()
+        try:
+            rows, query_time = await speculation.task
+        except Exception as e:
+            self.speculation_stats.misses += 1
+            logger.warning(f"Speculative search failed: {e}")
+            return None
+        waited = time.perf_counter() - wait_start
+
+        if requested != speculation.term:
+            if len(rows) >= self.speculative_limit:
+                # Truncated: rows matching the requested term may be missing
+                self.speculation_stats.misses += 1
+                logger.debug(f"Speculation miss (truncated): '{speculation.term}'")
+                return None
+            rows = [p for p in rows if requested in p.product_name.lower()]
+
+        # Time the re-query would have taken, minus what we still had to wait
+        saved = max(0.0, query_time - waited)
+        self.speculation_stats.hits += 1
+        self.speculation_stats.saved_seconds += saved
+        logger.debug(
+            f"Speculation hit: '{speculation.term}' covers '{search_term}' "
+            f"(saved {saved * 1000:.1f} ms)"
+        )
+        return rows[:limit]
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get search metrics.
+
+        Returns:
+            Dict with cache, coalescing, speculation, tool execution and agent loop counters
+        """
+        return {
+            "cache": self.cache.get_stats() if self.cache else None,
+            "coalescing": self.flights.get_stats() if self.flights else None,
+            "speculation": self.speculation_stats.as_dict(),
+            "tools": self.tool_executor.get_stats() if self.tool_executor else None,
+            "agent": self.agent_executor.get_stats() if self.agent_executor else None,
+        }
+
+    async def _prefetch_search(self, query: str) -> SearchResult:
+        """
+        Perform search with a single LLM call.
+
+        Candidate products are retrieved locally from the query keywords
+        and passed to the model as a compact table, so no tool round trip
+        is needed.
+        """
+        assert self.llm_provider is not None
+
+        candidates, messages = await self._prefetch_prompt(query)
+        response = await self.llm_provider.ainvoke(messages)
+        answer = _message_text(response)
 
         return SearchResult(
             answer=answer,
-            products_found=self.search_tool.get_last_results(),
+            products_found=candidates,
             query=query,
         )
 
+    async def _prefetch_prompt(self, query: str) -> tuple[list[ProductStock], list[dict]]:
+        """Retrieve candidate products for the query and build the single-call prompt."""
+        keywords = extract_keywords(query)
+        candidates = await self.product_service.search_candidates(
+            keywords, limit=self.prefetch_limit
+        )
+        logger.debug(
+            f"Prefetched {len(candidates)} candidates for keywords {keywords}"
+        )
+
+        messages = [
+            {"role": "system", "content": self.PREFETCH_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": (
+                    f"{query}\n\n"
+                    f"CANDIDATE PRODUCTS:\n{self._format_candidate_table(candidates)}"
+                ),
+            },
+        ]
+        return candidates, messages
+
+    @staticmethod
+    def _format_candidate_table(products: list[ProductStock]) -> str:
+        """Render products as a compact pipe-separated table for the prompt."""
+        if not products:
+            return "(no matching products)"
+
+        rows = ["name|sku|available|status|price|supplier"]
+        for p in products:
+            rows.append(
+                f"{p.product_name}|{p.product_sku or '-'}|{p.quantity_available}|"
+                f"{STOCK_STATUS_LABELS.get(p.stock_status, 'Unknown')}|"
+                f"{p.unit_cost:.2f}|{p.supplier_name}"
+            )
+        return "\n".join(rows)
+
     async def _fallback_search(self, query: str) -> SearchResult:
         """
         Fallback search without LLM.
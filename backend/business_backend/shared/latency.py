@@ -0,0 +1,34 @@
+"""
+Rolling latency samples.
+
+Fixed-size window of recent durations with nearest-rank percentiles,
+used for LLM hedging delays and the latency figures in /api/metrics.
+"""
+
+from collections import deque
+
+
+class LatencyWindow:
+    """Rolling window of call latencies for percentile estimates."""
+
+    def __init__(self, size: int = 200) -> None:
+        """
+        Args:
+            size: Number of most recent samples kept
+        """
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """Add a latency sample."""
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        """Nearest-rank percentile, or None without samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
@@ -0,0 +1,102 @@
+"""
+Single-flight request coalescing.
+
+Identical concurrent calls (same key) share one in-flight computation
+instead of each running it. Used for semantic searches, chat turns,
+product reads and model inference on identical inputs.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Flight(Generic[T]):
+    """A running computation and how many callers await it."""
+
+    task: asyncio.Task[T]
+    waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesce identical concurrent async calls.
+
+    The first caller for a key starts the computation as a task; callers
+    arriving while it runs await the same task. Results and exceptions
+    are delivered to every waiter. Cancelling one waiter never cancels
+    the shared task while others still wait; when the last waiter is
+    cancelled the task is cancelled too.
+
+    Usage:
+        flights: SingleFlight[SearchResult] = SingleFlight()
+        result = await flights.do(key, lambda: compute(query))
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no flights in progress."""
+        self._flights: dict[Hashable, _Flight[T]] = {}
+        self._executions = 0
+        self._coalesced = 0
+        self._cancelled = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn`` once per key among concurrent callers.
+
+        Args:
+            key: Identity of the computation
+            fn: Zero-argument coroutine factory (only called by the first caller)
+
+        Returns:
+            Result of the shared computation
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(task=asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            self._executions += 1
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self._coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # shield: a cancelled waiter must not cancel the shared task
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody is interested anymore
+                self._forget(key, flight)
+                flight.task.cancel()
+                self._cancelled += 1
+
+    def in_flight(self) -> int:
+        """Number of computations currently running."""
+        return len(self._flights)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Dict with executions, coalesced callers and cancellations
+        """
+        total = self._executions + self._coalesced
+        return {
+            "executions": self._executions,
+            "coalesced": self._coalesced,
+            "cancelled": self._cancelled,
+            "in_flight": len(self._flights),
+            "coalesce_rate": self._coalesced / total if total else 0.0,
+        }
+
+    def _forget(self, key: Hashable, flight: _Flight[T]) -> None:
+        """Remove the key if it still points to this flight."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -0,0 +1,5 @@
+"""Shared pytest setup."""
+
+# business_backend.services and business_backend.llm.tools import each other:
+# load them in the application's order (services first) whatever a test imports
+import business_backend.services  # noqa: F401
@@ -0,0 +1,65 @@
+"""AgentExecutor streaming: tokens are forwarded as the model writes them."""
+
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessageChunk, ToolMessage
+from langchain_core.tools import tool
+
+from business_backend.llm.agent_executor import AgentExecutor
+from business_backend.llm.provider import LLMProvider
+from business_backend.llm.tools.executor import ToolExecutor
+
+
+@tool
+async def lookup(term: str) -> str:
+    """Return stock for ``term``."""
+    return f"{term}: 3 in stock"
+
+
+class StreamingModel:
+    """Writes a preamble then a tool call, then streams the answer; logs every chunk it sends."""
+
+    def __init__(self, log: list[str]) -> None:
+        self.log = log
+
+    def bind_tools(self, tools: list, **kwargs: Any) -> "StreamingModel":
+        return self
+
+    async def astream(self, messages: list[Any]) -> AsyncIterator[AIMessageChunk]:
+        if isinstance(messages[-1], ToolMessage):
+            chunks = [AIMessageChunk(content=text) for text in ["We ", "have ", "3."]]
+        else:
+            call = {"name": "lookup", "args": json.dumps({"term": "x1"}), "id": "call_0", "index": 0}
+            chunks = [
+                AIMessageChunk(content="Checking "),
+                AIMessageChunk(content="", tool_call_chunks=[call]),
+                AIMessageChunk(content="after the call"),
+            ]
+        for chunk in chunks:
+            self.log.append(f"sent {chunk.content!r}")
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_answer_tokens_are_yielded_as_generated() -> None:
+    log: list[str] = []
+    executor = AgentExecutor(LLMProvider(StreamingModel(log)), ToolExecutor([lookup]))  # type: ignore[arg-type]
+
+    texts = []
+    run = None
+    async for event in executor.astream([{"role": "user", "content": "x1?"}]):
+        if event.text:
+            texts.append(event.text)
+            log.append(f"got {event.text!r}")
+        elif event.run is not None:
+            run = event.run
+
+    # Text before the tool call streams; text after it in the same call is dropped
+    assert texts == ["Checking ", "We ", "have ", "3."]
+    # Each token reaches the consumer before the model writes the next one
+    assert log.index("got 'We '") < log.index("sent 'have '")
+    assert run is not None and run.response.content == "We have 3."
+    assert [call["name"] for call in run.tool_calls] == ["lookup"]
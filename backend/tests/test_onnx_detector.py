@@ -0,0 +1,74 @@
+"""The ONNX Runtime export detects what the .pt weights detect.
+
+Needs the trained weights (PRODUCT_CLASSIFIER_PATH), ultralytics and
+onnxruntime; skipped otherwise.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from business_backend.config import get_business_settings
+
+pytest.importorskip("ultralytics")
+pytest.importorskip("onnxruntime")
+
+from business_backend.ml.models.image_classifier import _load_model, _parse_result  # noqa: E402
+from business_backend.ml.training.export import export_onnx  # noqa: E402
+
+# Detections kept for the comparison, and how far from it a top detection must be to count
+CONF = 0.05
+CLEAR_CONF = 0.15
+# Confidence difference allowed between runtimes (kernels differ, outputs are not bit-identical)
+CONF_TOLERANCE = 0.03
+
+
+@pytest.fixture(scope="module")
+def weights() -> Path:
+    path = Path(get_business_settings().product_classifier_path)
+    if path.suffix != ".pt" or not path.exists():
+        pytest.skip(f"no .pt weights at {path}")
+    return path
+
+
+@pytest.fixture(scope="module")
+def models(weights: Path, tmp_path_factory: pytest.TempPathFactory) -> tuple:
+    onnx_path = export_onnx(weights, tmp_path_factory.mktemp("onnx") / "best.onnx")
+    return _load_model(str(weights)), _load_model(str(onnx_path))
+
+
+def _images() -> list[np.ndarray]:
+    import cv2
+    from ultralytics.utils import ASSETS
+
+    images = [cv2.imread(str(path)) for path in sorted(ASSETS.glob("*.jpg"))]
+    rng = np.random.default_rng(0)
+    # Non-square shapes exercise the minimal letterbox rectangle
+    images += [rng.integers(0, 256, size=shape, dtype=np.uint8) for shape in [(480, 640, 3), (720, 405, 3)]]
+    return images
+
+
+def _assert_close(pt: dict, onnx: dict) -> None:
+    if pt["confidence"] >= CLEAR_CONF:
+        assert onnx["prediction"] == pt["prediction"]
+        assert onnx["confidence"] == pytest.approx(pt["confidence"], abs=CONF_TOLERANCE)
+    else:
+        assert onnx["confidence"] < CLEAR_CONF + CONF_TOLERANCE
+
+
+def test_onnx_top_detection_matches_pt(models: tuple) -> None:
+    pt_model, onnx_model = models
+    for image in _images():
+        pt = _parse_result(pt_model(image, verbose=False, conf=CONF)[0])
+        onnx = _parse_result(onnx_model(image, verbose=False, conf=CONF)[0])
+        _assert_close(pt, onnx)
+
+
+def test_onnx_batch_matches_pt_batch(models: tuple) -> None:
+    pt_model, onnx_model = models
+    images = _images()[-1:] * 3
+    pt = [_parse_result(result) for result in pt_model(images, verbose=False, conf=CONF)]
+    onnx = [_parse_result(result) for result in onnx_model(images, verbose=False, conf=CONF)]
+    for pt_prediction, onnx_prediction in zip(pt, onnx, strict=True):
+        _assert_close(pt_prediction, onnx_prediction)
@@ -0,0 +1,72 @@
+"""ResilientInvoker: a half-open probe that ends without an outcome gives its slot back."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from business_backend.llm.resilience import CircuitState, ResilienceConfig, ResilientInvoker
+
+
+def _half_open_invoker() -> ResilientInvoker:
+    """Invoker whose circuit is open and ready to let one probe through."""
+    invoker = ResilientInvoker(
+        ResilienceConfig(max_concurrency=1, breaker_failure_threshold=1, breaker_reset_seconds=0.0)
+    )
+    invoker.breaker.record_failure()
+    assert invoker.breaker.state == CircuitState.OPEN
+    return invoker
+
+
+async def _tokens(fail_after: int | None = None) -> AsyncIterator[str]:
+    for i in range(3):
+        if i == fail_after:
+            raise ConnectionError("upstream reset")
+        yield f"token-{i}"
+
+
+@pytest.mark.asyncio
+async def test_probe_closed_after_first_chunk_frees_the_slot() -> None:
+    invoker = _half_open_invoker()
+
+    stream = invoker.stream(_tokens)
+    assert await anext(stream) == "token-0"
+    await stream.aclose()
+
+    assert invoker.breaker.state == CircuitState.HALF_OPEN
+    assert invoker.breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_probe_failing_mid_stream_reopens_the_circuit() -> None:
+    invoker = _half_open_invoker()
+
+    with pytest.raises(ConnectionError):
+        async for _ in invoker.stream(lambda: _tokens(fail_after=1)):
+            pass
+
+    assert invoker.breaker.state == CircuitState.OPEN
+    assert invoker.get_stats()["failures"] == 1
+    # Reset timeout is 0: the next probe is let through
+    assert invoker.breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_probe_cancelled_while_queued_frees_the_slot() -> None:
+    invoker = _half_open_invoker()
+    model = RunnableLambda(lambda messages: AIMessage(content="ok"))
+
+    # Another call holds the only concurrency slot
+    await invoker._semaphore.acquire()
+    probe = asyncio.ensure_future(invoker.invoke(model, []))
+    await asyncio.sleep(0.01)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    invoker._semaphore.release()
+
+    # The next probe goes through and closes the circuit
+    assert (await invoker.invoke(model, [])).content == "ok"
+    assert invoker.breaker.state == CircuitState.CLOSED
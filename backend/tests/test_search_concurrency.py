@@ -0,0 +1,126 @@
+"""
+Result isolation of concurrent semantic searches.
+
+Many searches run at once through a single SearchService (as the DI
+singleton is used in production), with a scripted LLM and an in-memory
+product service; every response must only hold the products of its own
+query. Same check as ``benchmarks/search_concurrency.py``, smaller.
+"""
+
+import asyncio
+import json
+import random
+import uuid
+from collections.abc import AsyncIterator
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+
+from business_backend.llm.provider import LLMProvider
+from business_backend.services.search_service import SearchService
+
+REQUESTS = 300
+CONCURRENCY = 50
+
+
+class ScriptedModel:
+    """Chat model stand-in: asks for product_search with the user's text, then answers."""
+
+    def bind_tools(self, tools: list, **kwargs: Any) -> "ScriptedModel":
+        return self
+
+    async def ainvoke(self, messages: list[Any]) -> AIMessage:
+        await asyncio.sleep(random.uniform(0.001, 0.01))
+        if isinstance(messages[-1], ToolMessage):
+            return AIMessage(content="done")
+
+        return AIMessage(
+            content="",
+            tool_calls=[
+                {
+                    "name": "product_search",
+                    "args": {"search_term": messages[-1]["content"]},
+                    "id": f"call_{uuid.uuid4().hex[:8]}",
+                }
+            ],
+        )
+
+    async def astream(self, messages: list[Any]) -> AsyncIterator[AIMessageChunk]:
+        response = await self.ainvoke(messages)
+        yield AIMessageChunk(
+            content=response.content,
+            tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+                for i, call in enumerate(response.tool_calls)
+            ],
+        )
+
+
+class InMemoryProductService:
+    """Returns rows named after the search term, with random DB latency."""
+
+    async def get_inventory_version(self) -> str:
+        return "test"
+
+    async def search_by_name(self, name: str, limit: int = 20, active_only: bool = True) -> list:
+        await asyncio.sleep(random.uniform(0.001, 0.01))
+        return [
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                product_name=f"{name} unit {i}",
+                product_sku=None,
+                quantity_available=i,
+                stock_status=1,
+                unit_cost=Decimal("10.00"),
+                supplier_name="Test",
+                warehouse_location="MAIN",
+            )
+            for i in range(3)
+        ]
+
+
+def _service() -> SearchService:
+    return SearchService(
+        llm_provider=LLMProvider(ScriptedModel()),  # type: ignore[arg-type]
+        product_service=InMemoryProductService(),  # type: ignore[arg-type]
+    )
+
+
+def _leaked(term: str, products: list[Any] | None) -> bool:
+    return not products or any(not p.product_name.startswith(term) for p in products)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_do_not_share_results() -> None:
+    service = _service()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(i: int) -> bool:
+        term = f"sku-{i:06d}"
+        async with semaphore:
+            result = await service.semantic_search(term)
+        return _leaked(term, result.products_found)
+
+    leaks = await asyncio.gather(*(one(i) for i in range(REQUESTS)))
+    assert sum(leaks) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_streamed_searches_do_not_share_results() -> None:
+    service = _service()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(i: int) -> bool:
+        term = f"sku-{i:06d}"
+        products = None
+        async with semaphore:
+            async for event in service.semantic_search_stream(term):
+                if event.products_found is not None:
+                    products = event.products_found
+        return _leaked(term, products)
+
+    leaks = await asyncio.gather(*(one(i) for i in range(REQUESTS)))
+    assert sum(leaks) == 0
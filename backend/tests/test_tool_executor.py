@@ -0,0 +1,74 @@
+"""ToolExecutor: concurrent tool calls, results in call order."""
+
+import asyncio
+
+import pytest
+from langchain_core.tools import tool
+
+from business_backend.llm.tools.executor import ToolExecutor
+
+
+@tool
+async def echo(text: str, delay: float) -> str:
+    """Return ``text`` after ``delay`` seconds."""
+    await asyncio.sleep(delay)
+    return text
+
+
+def _calls(delays: list[float]) -> list[dict]:
+    return [
+        {"name": "echo", "args": {"text": f"result-{i}", "delay": delay}, "id": f"call_{i}"}
+        for i, delay in enumerate(delays)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_tool_messages_follow_call_order() -> None:
+    executor = ToolExecutor([echo], max_concurrency=4)
+    # Later calls finish first
+    calls = _calls([0.05, 0.03, 0.01, 0.0])
+
+    messages = await executor.execute(calls)
+
+    assert [m.tool_call_id for m in messages] == [c["id"] for c in calls]
+    assert [m.content for m in messages] == [f"result-{i}" for i in range(len(calls))]
+
+
+@pytest.mark.asyncio
+async def test_errors_and_unknown_tools_keep_their_slot() -> None:
+    executor = ToolExecutor([echo], timeout=0.05)
+    calls = [
+        *_calls([0.0]),
+        {"name": "missing", "args": {}, "id": "call_missing"},
+        {"name": "echo", "args": {"text": "slow", "delay": 1.0}, "id": "call_slow"},
+    ]
+
+    messages = await executor.execute(calls)
+
+    assert [m.tool_call_id for m in messages] == ["call_0", "call_missing", "call_slow"]
+    assert messages[0].content == "result-0"
+    assert "Unknown tool" in messages[1].content
+    assert "timed out" in messages[2].content
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_is_per_execute_call() -> None:
+    executor = ToolExecutor([echo], max_concurrency=2)
+    running = 0
+    peak = 0
+
+    async def resolver(tool_call: dict) -> str | None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return None
+
+    # Two requests at once: each may run max_concurrency calls
+    await asyncio.gather(
+        executor.execute(_calls([0.0] * 4), resolver=resolver),
+        executor.execute(_calls([0.0] * 4), resolver=resolver),
+    )
+
+    assert peak == 4